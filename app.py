@@ -1,7 +1,16 @@
 import streamlit as st
+from src.tools.chart_cache import cleanup_orphans
 from src.ui.layout import render_main_layout
 
 
+@st.cache_resource
+def run_startup_cleanup():
+    """
+    Runs once per server process: clears chart images orphaned by earlier runs
+    """
+    return cleanup_orphans()
+
+
 def main():
     """
     Main application entry point with enhanced configuration
@@ -32,6 +41,8 @@ def main():
         }
     )
     
+    run_startup_cleanup()
+
     # Initialize session state variables
     initialize_session_state()
     
@@ -0,0 +1,54 @@
+"""
+Cold start: import time of the Streamlit app, from python -X importtime.
+
+    python benchmarks/bench_cold_start.py --module app --top 15 --repeat 3
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+# Must stay out of the import path of a cold start
+HEAVY_MODULES = ["langchain_openai", "matplotlib", "seaborn", "sklearn", "reportlab"]
+
+
+def import_times(module: str) -> dict:
+    """Cumulative import time in microseconds per module, from a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Best of several runs; the first one also pays for a cold disk cache
+    runs = [import_times(args.module) for _ in range(args.repeat)]
+    times = min(runs, key=lambda t: t[args.module])
+    print(f"import {args.module}: {times[args.module] / 1e6:.2f}s (best of {args.repeat})")
+
+    top_level = {name: us for name, us in times.items() if "." not in name and name != args.module}
+    print("\nSlowest top-level imports:")
+    for name, us in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<30} {us / 1e3:8.1f}ms")
+
+    loaded = [name for name in HEAVY_MODULES if name in times]
+    print(f"\nHeavy modules loaded at start: {', '.join(loaded) if loaded else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Column-parallel profiling: wall time versus worker count on a wide table.
+
+    python benchmarks/bench_parallel_profile.py --rows 20000 --cols 3000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline.profiler import profile_dataset
+
+
+def make_wide_frame(rows: int, cols: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(rows, cols)), columns=[f"feature_{i}" for i in range(cols)])
+    df = df.mask(rng.random((rows, cols)) < 0.02)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--cols", type=int, default=3_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_wide_frame(args.rows, args.cols)
+    print(f"{args.rows:,} rows x {args.cols:,} columns, {os.cpu_count()} CPUs")
+
+    baseline = None
+    for workers in args.workers:
+        profile_dataset(df, workers=workers)  # warm the pool
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            profile_dataset(df, workers=workers)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        baseline = baseline or best
+        print(f"workers={workers:<3} {best:6.2f}s  speedup {baseline / best:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Report chart rendering: wall time versus worker count.
+
+    python benchmarks/bench_parallel_report.py --rows 2000000 --workers 1 2 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline.profiler import profile_dataset
+from src.pipeline.report_builder import generate_report_charts
+from src.tools.chart_cache import evict_charts
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=rows)
+    return pd.DataFrame({
+        "x": x,
+        "y": 2 * x + rng.normal(size=rows),
+        "z": rng.exponential(size=rows),
+        "segment": rng.choice(["a", "b", "c", "d"], rows),
+        "day": pd.date_range("2000-01-01", periods=rows, freq="min"),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    # Profiled once up front, as the app does, so only chart work is timed
+    profile = profile_dataset(df)
+    print(f"{args.rows:,} rows, {os.cpu_count()} CPUs")
+
+    baseline = None
+    for workers in args.workers:
+        evict_charts(max_bytes=0)
+        generate_report_charts(df, workers=workers, profile=profile)  # warm the pool
+        timings = []
+        for _ in range(args.repeat):
+            # Empty the render cache so every run draws all charts
+            evict_charts(max_bytes=0)
+            start = time.perf_counter()
+            generate_report_charts(df, workers=workers, profile=profile)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        baseline = baseline or best
+        print(f"workers={workers:<3} {best:6.2f}s  speedup {baseline / best:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
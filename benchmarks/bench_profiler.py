@@ -0,0 +1,97 @@
+"""
+Before/after timing for dataset profiling.
+
+"before" replays the scattered scans the app used to run for one upload:
+profile_dataset's isnull/dtypes/describe, the layout's missing % and
+memory metrics, suggest_imputation's per-column isnull loop and the
+export tab's missingness. "after" is one fused profile_dataset pass whose
+result every consumer reads.
+
+    python benchmarks/bench_profiler.py --rows 10000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline.cleaner import suggest_imputation
+from src.pipeline.profiler import profile_dataset
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "price": rng.normal(100, 20, rows),
+        "quantity": rng.integers(0, 1_000, rows).astype("float64"),
+        "discount": rng.random(rows),
+        "score": rng.normal(0, 1, rows).astype("float32"),
+        "store_id": rng.integers(0, 500, rows),
+        "units": rng.integers(0, 100, rows).astype("int16"),
+        "region": pd.Categorical(rng.choice(["North", "South", "East", "West"], rows)),
+        "channel": pd.Categorical(rng.choice(["web", "store", "phone"], rows)),
+    })
+    for col in ["price", "quantity", "discount"]:
+        df.loc[rng.random(rows) < 0.05, col] = np.nan
+    return df
+
+
+def before(df: pd.DataFrame):
+    # profile_dataset
+    missing = df.isnull().sum().to_frame("Missing Count")
+    missing["Percentage"] = missing["Missing Count"] / len(df) * 100
+    types = df.dtypes.to_frame("Type")
+    numeric = df.select_dtypes(include="number")
+    stats = numeric.describe().T
+    # layout metrics
+    missing_pct = df.isnull().sum().sum() / (df.shape[0] * df.shape[1]) * 100
+    memory_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+    # suggest_imputation
+    suggestions = {}
+    for col in df.columns:
+        if df[col].isnull().sum() > 0:
+            suggestions[col] = "Median" if pd.api.types.is_numeric_dtype(df[col]) else "Most Frequent"
+    # export tab
+    quality = (1 - df.isnull().sum().sum() / (df.shape[0] * df.shape[1])) * 100
+    prompt_missing = df.isnull().sum().to_dict()
+    return missing, types, stats, missing_pct, memory_mb, suggestions, quality, prompt_missing
+
+
+def after(df: pd.DataFrame):
+    profile = profile_dataset(df)
+    suggestions = suggest_imputation(df, profile)
+    return (profile, profile.missing_pct, profile.memory_mb, suggestions,
+            100 - profile.missing_pct, profile.missing_counts.to_dict())
+
+
+def best_of(fn, df, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    print(f"{args.rows:,} rows x {df.shape[1]} columns")
+
+    t_before = best_of(before, df, args.repeat)
+    t_after = best_of(after, df, args.repeat)
+    print(f"before: {t_before:.2f}s")
+    print(f"after:  {t_after:.2f}s  ({t_before / t_after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
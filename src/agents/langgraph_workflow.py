@@ -13,14 +13,14 @@ class ChatState(dict):
 def chatbot_node(state: ChatState):
     user_text = state["user_input"]
 
-    response_text, chart_path = handle_user_query(user_text)
+    response_text, chart_png = handle_user_query(user_text)
 
     memory.add_message("user", user_text)
     memory.add_message("assistant", response_text)
 
     return {
         "response_text": response_text,
-        "chart_path": chart_path
+        "chart_png": chart_png
     }
 
 graph = StateGraph(ChatState)
@@ -1,12 +1,14 @@
 # src/agents/llm_client.py
 
 import os
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 
-load_dotenv()  # load .env config
 
 def get_llm():
+    # Deferred: langchain_openai takes seconds to import and only chat needs it
+    from dotenv import load_dotenv
+    from langchain_openai import ChatOpenAI
+
+    load_dotenv()  # load .env config
     api_key = os.getenv("OPENROUTER_API_KEY")
     base_url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 
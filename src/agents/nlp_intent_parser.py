@@ -6,6 +6,8 @@ import re
 from typing import List, Tuple
 import pandas as pd
 
+from src.pipeline.backend import get_backend
+
 # --- Detect Intent ---
 def detect_intent(user_input: str) -> str:
     text = user_input.lower()
@@ -27,9 +29,10 @@ def detect_intent(user_input: str) -> str:
 
 # --- Smart chart type inference ---
 def infer_best_chart(df, user_text: str) -> Tuple[List[str], str]:
-    numeric_cols = df.select_dtypes(include=["int", "float"]).columns.tolist()
-    cat_cols = df.select_dtypes(include=["object"]).columns.tolist()
-    date_cols = df.select_dtypes(include=["datetime", "datetime64[ns]"]).columns.tolist()
+    backend = get_backend(df)
+    numeric_cols = backend.numeric_columns()
+    cat_cols = backend.categorical_columns()
+    date_cols = backend.datetime_columns()
 
     # Trend intent
     if "trend" in user_text or "time" in user_text:
@@ -64,7 +67,7 @@ def infer_best_chart(df, user_text: str) -> Tuple[List[str], str]:
 
 
 # --- Parse chart request (uses inference if needed) ---
-def parse_chart_request(user_input: str, df_columns: List[str], df: pd.DataFrame = None) -> Tuple[List[str], str]:
+def parse_chart_request(user_input: str, df_columns: List[str], df=None) -> Tuple[List[str], str]:
     user_lower = user_input.lower()
     detected_cols = []
 
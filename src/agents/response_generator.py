@@ -1,25 +1,35 @@
 # src/agents/response_generator.py
 
 import streamlit as st
-from src.agents.llm_client import get_llm
 from src.agents.nlp_intent_parser import detect_intent, parse_chart_request
-from src.tools.chart_generator import generate_chart
+from src.pipeline.backend import get_backend
+from src.pipeline.profiler import profile_dataset
 import pandas as pd
 
 
+def _cleaned_profile(backend):
+    """Profile of the cleaned dataset, computed at most once per cleaning run."""
+    profile = st.session_state.get("cleaned_profile")
+    if profile is None:
+        profile = profile_dataset(backend)
+        st.session_state["cleaned_profile"] = profile
+    return profile
+
+
 def handle_user_query(user_input: str):
     df = st.session_state.get("cleaned_dataset")
 
     if df is None:
         return ("⚠️ No dataset found. Please upload and clean data first.", None)
 
+    backend = get_backend(df)
     intent = detect_intent(user_input)
-    df_columns = df.columns.tolist()
+    df_columns = backend.columns.tolist()
 
     # --- Intent: Describe Dataset ---
     if intent == "describe":
         return (
-            f"The dataset has **{df.shape[0]} rows** and **{df.shape[1]} columns**.\n\n"
+            f"The dataset has **{backend.shape[0]} rows** and **{backend.shape[1]} columns**.\n\n"
             "Column names:\n- " + "\n- ".join(df_columns),
             None
         )
@@ -33,32 +43,36 @@ def handle_user_query(user_input: str):
 
     # --- Intent: Missing Values ---
     if intent == "missing":
-        missing = df.isnull().sum()
+        missing = _cleaned_profile(backend).missing_counts
         msg = "Missing values per column:\n" + missing.to_string()
         return (msg, None)
 
     # --- Intent: Stats ---
     if intent == "stats":
-        stats = df.describe().transpose()
+        stats = _cleaned_profile(backend).stats
         msg = "📊 Basic Statistics:\n\n" + stats.to_string()
         return (msg, None)
 
     # --- Intent: Chart ---
     if intent == "chart":
-        detected_cols, chart_type = parse_chart_request(user_input, df_columns, df)
+        # matplotlib loads on the first chart request, not at app start
+        from src.tools.chart_generator import generate_chart
+
+        detected_cols, chart_type = parse_chart_request(user_input, df_columns, backend)
 
         if len(detected_cols) == 0:
             return ("Please mention a valid column name to visualize.", None)
 
         if len(detected_cols) == 1:
-            img = generate_chart(df, detected_cols[0], chart_type=chart_type)
+            img = generate_chart(backend, detected_cols[0], chart_type=chart_type)
             return (f"📈 Showing {chart_type} chart for **{detected_cols[0]}**", img)
 
         if len(detected_cols) >= 2:
-            img = generate_chart(df, detected_cols[0], detected_cols[1], chart_type="scatter")
+            img = generate_chart(backend, detected_cols[0], detected_cols[1], chart_type="scatter")
             return (f"📈 Scatter plot: **{detected_cols[0]} vs {detected_cols[1]}**", img)
 
     # --- Fallback: LLM handles unknown ---
+    from src.agents.llm_client import get_llm
     llm = get_llm()
     try:
         ai_msg = llm.invoke(
@@ -0,0 +1,691 @@
+# src/pipeline/backend.py
+
+"""
+Dataset backends.
+
+Every pipeline step talks to a dataset through a small set of aggregate
+queries (missing counts, numeric summary, histograms, value counts, ...).
+PandasBackend answers them from an in-memory DataFrame; DuckDBBackend
+pushes them down to an embedded DuckDB engine reading a local CSV or
+Parquet file, so files larger than RAM never have to be materialized.
+"""
+
+import datetime
+import decimal
+import os
+import hashlib
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from src.tools.utils import evict_lru_files, touch_file
+
+OUT_OF_CORE_DIR = "src/data/cache/out_of_core"
+# Cleaned files and spooled uploads are removed least recently used first past this
+OUT_OF_CORE_MAX_MB = float(os.getenv("EDA_OUT_OF_CORE_MAX_MB", "32768"))
+# Uploads larger than this are explored out-of-core instead of loaded into pandas
+OUT_OF_CORE_THRESHOLD_MB = int(os.getenv("EDA_OUT_OF_CORE_MB", "1024"))
+# Optional cap on DuckDB's working memory (e.g. "4GB"); DuckDB spills beyond it
+DUCKDB_MEMORY_LIMIT = os.getenv("EDA_DUCKDB_MEMORY_LIMIT")
+
+# Rows pulled back for row-level plots (scatter, line) and outlier markers
+SAMPLE_ROWS = 100_000
+MAX_FLIERS = 1_000
+
+DESCRIBE_COLUMNS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+
+class DatasetBackend:
+    """Common interface for the engines a dataset can live in."""
+
+    kind = "base"
+
+    @property
+    def shape(self):
+        raise NotImplementedError
+
+    @property
+    def columns(self):
+        return self.dtypes.index
+
+    @property
+    def dtypes(self) -> pd.Series:
+        raise NotImplementedError
+
+    def numeric_columns(self) -> list:
+        return [c for c, t in self.dtypes.items()
+                if pd.api.types.is_numeric_dtype(t) and not pd.api.types.is_bool_dtype(t)]
+
+    def categorical_columns(self) -> list:
+        return [c for c, t in self.dtypes.items()
+                if isinstance(t, pd.CategoricalDtype)
+                or pd.api.types.is_object_dtype(t)
+                or pd.api.types.is_string_dtype(t)]
+
+    def datetime_columns(self) -> list:
+        return [c for c, t in self.dtypes.items() if pd.api.types.is_datetime64_any_dtype(t)]
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def missing_counts(self) -> pd.Series:
+        raise NotImplementedError
+
+    def describe(self) -> pd.DataFrame:
+        """Numeric summary shaped like DataFrame.describe().T."""
+        raise NotImplementedError
+
+    def summarize(self):
+        """
+        Missing counts, numeric summary and memory footprint in one go.
+        Returns:
+            (missing counts Series, describe-style DataFrame, memory bytes)
+        """
+        return self.missing_counts(), self.describe(), 0
+
+    def value_counts(self, col: str, limit: int = None) -> pd.Series:
+        raise NotImplementedError
+
+    def histogram(self, col: str, bins: int = 30):
+        """Returns (counts, edges) like numpy.histogram."""
+        raise NotImplementedError
+
+    def histogram2d(self, x: str, y: str, bins: int = 100):
+        """Returns (counts, x edges, y edges) like numpy.histogram2d, over rows where both are set."""
+        raise NotImplementedError
+
+    def box_stats(self, col: str) -> dict:
+        """Returns a stats dict accepted by matplotlib's Axes.bxp."""
+        raise NotImplementedError
+
+    def corr(self, cols: list) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def sample(self, cols: list, n: int = SAMPLE_ROWS) -> pd.DataFrame:
+        """Up to n rows of the given columns, in dataset order."""
+        raise NotImplementedError
+
+    def duplicate_count(self, subset: list = None) -> int:
+        """Rows that repeat an earlier row (over all columns or a subset)."""
+        raise NotImplementedError
+
+    def fill_values(self, strategies: dict, dedup: list = None) -> dict:
+        """Fill values over the rows that survive deduplication and the Drop strategies."""
+        raise NotImplementedError
+
+    def impute(self, strategies: dict, fills: dict = None, dedup: list = None) -> "DatasetBackend":
+        """Cleans the dataset; fills are computed with fill_values unless given."""
+        raise NotImplementedError
+
+    def fingerprint(self) -> str:
+        """Identifies the dataset's current contents, for caching derived artifacts."""
+        raise NotImplementedError
+
+
+def _numeric_summary(values: np.ndarray) -> list:
+    """describe()-style row for a float64 array that has no NaNs."""
+    n = len(values)
+    if n == 0:
+        return [0.0] + [np.nan] * (len(DESCRIBE_COLUMNS) - 1)
+    # A single partition yields min, quartiles and max together
+    lo, q1, med, q3, hi = np.percentile(values, [0, 25, 50, 75, 100])
+    std = values.std(ddof=1) if n > 1 else np.nan
+    return [float(n), values.mean(), std, lo, q1, med, q3, hi]
+
+
+def _box_stats_from_values(values: np.ndarray, label: str) -> dict:
+    q1, med, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    low, high = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    inside = values[(values >= low) & (values <= high)]
+    fliers = values[(values < low) | (values > high)]
+    if len(fliers) > MAX_FLIERS:
+        fliers = np.random.default_rng(0).choice(fliers, MAX_FLIERS, replace=False)
+    return {
+        "label": label,
+        "q1": q1, "med": med, "q3": q3,
+        "whislo": inside.min() if len(inside) else q1,
+        "whishi": inside.max() if len(inside) else q3,
+        "fliers": fliers,
+    }
+
+
+class PandasBackend(DatasetBackend):
+    """Answers dataset queries from an in-memory DataFrame."""
+
+    kind = "pandas"
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+    @property
+    def shape(self):
+        return self.df.shape
+
+    @property
+    def columns(self):
+        return self.df.columns
+
+    @property
+    def dtypes(self) -> pd.Series:
+        return self.df.dtypes
+
+    def numeric_columns(self) -> list:
+        return self.df.select_dtypes(include="number").columns.tolist()
+
+    def categorical_columns(self) -> list:
+        return self.df.select_dtypes(include=["object", "category"]).columns.tolist()
+
+    def datetime_columns(self) -> list:
+        return self.df.select_dtypes(include=["datetime", "datetimetz"]).columns.tolist()
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        return self.df.head(n)
+
+    def missing_counts(self) -> pd.Series:
+        return self.df.isnull().sum()
+
+    def describe(self) -> pd.DataFrame:
+        numeric_df = self.df.select_dtypes(include="number")
+        return numeric_df.describe().T if not numeric_df.empty else pd.DataFrame()
+
+    def summarize(self):
+        """
+        Fused single pass: each column is visited once and yields its missing
+        count, numeric summary and memory footprint together.
+        """
+        df = self.df
+        missing = {}
+        rows = {}
+        memory = int(df.index.memory_usage(deep=True))
+
+        for col in df.columns:
+            series = df[col]
+            memory += int(series.memory_usage(deep=True, index=False))
+
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                values = series.to_numpy(dtype="float64", na_value=np.nan)
+                nan_mask = np.isnan(values)
+                n_missing = int(nan_mask.sum())
+                if n_missing:
+                    values = values[~nan_mask]
+                missing[col] = n_missing
+                rows[col] = _numeric_summary(values)
+            else:
+                missing[col] = int(series.isna().sum())
+
+        missing_counts = pd.Series(missing, index=df.columns, dtype="int64")
+        if rows:
+            stats = pd.DataFrame.from_dict(rows, orient="index", columns=DESCRIBE_COLUMNS)
+        else:
+            stats = pd.DataFrame()
+        return missing_counts, stats, memory
+
+    def value_counts(self, col: str, limit: int = None) -> pd.Series:
+        counts = self.df[col].value_counts()
+        return counts.head(limit) if limit else counts
+
+    def histogram(self, col: str, bins: int = 30):
+        values = self.df[col].dropna().to_numpy(dtype="float64")
+        return np.histogram(values, bins=bins)
+
+    def histogram2d(self, x: str, y: str, bins: int = 100):
+        xs = self.df[x].to_numpy(dtype="float64", na_value=np.nan)
+        ys = self.df[y].to_numpy(dtype="float64", na_value=np.nan)
+        both = ~(np.isnan(xs) | np.isnan(ys))
+        xs, ys = xs[both], ys[both]
+        if not len(xs):
+            edges = np.linspace(0, 1, bins + 1)
+            return np.zeros((bins, bins)), edges, edges
+
+        # Equal-width bins as flat indices: one bincount instead of numpy.histogram2d's searches
+        flat = np.zeros(len(xs), dtype=np.int64)
+        edges = []
+        for values, stride in ((xs, bins), (ys, 1)):
+            lo, hi = _bin_range(values.min(), values.max())
+            index = np.minimum(((values - lo) * (bins / (hi - lo))).astype(np.int64), bins - 1)
+            flat += index * stride
+            edges.append(np.linspace(lo, hi, bins + 1))
+        counts = np.bincount(flat, minlength=bins * bins).reshape(bins, bins).astype("float64")
+        return counts, edges[0], edges[1]
+
+    def box_stats(self, col: str) -> dict:
+        values = self.df[col].dropna().to_numpy(dtype="float64")
+        return _box_stats_from_values(values, col)
+
+    def corr(self, cols: list) -> pd.DataFrame:
+        return self.df[cols].corr()
+
+    def sample(self, cols: list, n: int = SAMPLE_ROWS) -> pd.DataFrame:
+        frame = self.df[cols]
+        if len(frame) <= n:
+            return frame
+        step = -(-len(frame) // n)
+        return frame.iloc[::step]
+
+    def duplicate_count(self, subset: list = None) -> int:
+        from src.pipeline.cleaner import count_duplicates
+        return count_duplicates(self.df, subset)
+
+    def fill_values(self, strategies: dict, dedup: list = None) -> dict:
+        """All medians and means in one vectorized call each; modes from value counts."""
+        from src.pipeline.cleaner import removed_rows
+        df = self.df
+        removed = removed_rows(df, strategies, dedup)
+        if removed is not None and removed.any():
+            df = df[~removed]
+
+        by_method = {}
+        for col, method in strategies.items():
+            by_method.setdefault(method, []).append(col)
+
+        values = {}
+        if "Median" in by_method:
+            values.update(df[by_method["Median"]].median().to_dict())
+        if "Mean" in by_method:
+            values.update(df[by_method["Mean"]].mean().to_dict())
+        for col in by_method.get("Most Frequent", []):
+            values[col] = _most_frequent(df[col])
+        # Columns with nothing to fill from (all missing) are left as they are
+        return {col: values[col] for col in strategies if col in values and not pd.isna(values[col])}
+
+    def impute(self, strategies: dict, fills: dict = None, dedup: list = None) -> "PandasBackend":
+        from src.pipeline.cleaner import CleaningPlan
+        if fills is None:
+            plan = CleaningPlan.fit(self.df, strategies, dedup)
+        else:
+            plan = CleaningPlan(strategies, fills, dedup)
+        return PandasBackend(plan.apply(self.df)[0])
+
+    def fingerprint(self) -> str:
+        """
+        Hash of the frame's values, index and schema, computed once per frame
+        object (frames are not modified in place once loaded or cleaned).
+        """
+        return _frame_fingerprint(self.df)
+
+
+# Fingerprints of in-memory frames by object id; an entry goes with its frame
+_frame_fingerprints = {}
+
+
+def _frame_fingerprint(df: pd.DataFrame) -> str:
+    entry = _frame_fingerprints.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    fingerprint = digest.hexdigest()
+
+    key = id(df)
+    ref = weakref.ref(df, lambda _, key=key: _frame_fingerprints.pop(key, None))
+    _frame_fingerprints[key] = (ref, fingerprint)
+    return fingerprint
+
+
+def _most_frequent(series: pd.Series):
+    """Most frequent value via hashing; ties go to the smallest value, as with mode()."""
+    counts = series.value_counts()
+    if counts.empty:
+        return np.nan
+    tied = counts.index[counts.to_numpy() == counts.iloc[0]]
+    try:
+        return sorted(tied)[0]
+    except TypeError:
+        return tied[0]
+
+
+def _bin_range(lo, hi):
+    """Float bounds for equal-width bins; a single value gets a unit-wide range."""
+    lo, hi = float(lo), float(hi)
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return lo, hi
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _literal(value) -> str:
+    """
+    SQL literal for a path, option or fill value, as DuckDB returns them:
+    strings, numbers, booleans, Decimals and date/time values.
+    """
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    # datetime (and pd.Timestamp) before date: datetime is a date subclass
+    if isinstance(value, datetime.datetime):
+        kind = "TIMESTAMPTZ" if value.tzinfo is not None else "TIMESTAMP"
+        return f"{kind} '{value.isoformat(sep=' ')}'"
+    if isinstance(value, datetime.date):
+        return f"DATE '{value.isoformat()}'"
+    if isinstance(value, datetime.time):
+        return f"TIME '{value.isoformat()}'"
+    if isinstance(value, (bool, np.bool_)):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (float, np.floating)):
+        return repr(float(value))
+    if isinstance(value, (int, np.integer, decimal.Decimal)):
+        return str(value)
+    raise TypeError(f"No SQL literal for {type(value).__name__} values")
+
+
+class DuckDBBackend(DatasetBackend):
+    """
+    Pushes dataset queries down to an embedded DuckDB engine over a local
+    CSV or Parquet file. Only aggregates and bounded samples come back
+    into Python.
+    """
+
+    kind = "duckdb"
+
+    def __init__(self, path: str):
+        import duckdb
+
+        self.path = os.path.abspath(path)
+        self.con = duckdb.connect()
+        os.makedirs(OUT_OF_CORE_DIR, exist_ok=True)
+        self.con.execute(f"SET temp_directory = {_literal(os.path.abspath(OUT_OF_CORE_DIR))}")
+        if DUCKDB_MEMORY_LIMIT:
+            self.con.execute(f"SET memory_limit = {_literal(DUCKDB_MEMORY_LIMIT)}")
+
+        if self.path.endswith(".parquet"):
+            source = f"read_parquet({_literal(self.path)})"
+        else:
+            source = f"read_csv_auto({_literal(self.path)})"
+        self.con.execute(f"CREATE VIEW dataset AS SELECT * FROM {source}")
+
+        self._dtypes = self.con.execute("SELECT * FROM dataset LIMIT 0").df().dtypes
+        self._rows = None
+
+    def _scalar_row(self, sql: str):
+        return self.con.execute(sql).fetchone()
+
+    @property
+    def shape(self):
+        if self._rows is None:
+            self._rows = self._scalar_row("SELECT count(*) FROM dataset")[0]
+        return (self._rows, len(self._dtypes))
+
+    @property
+    def dtypes(self) -> pd.Series:
+        return self._dtypes
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        return self.con.execute(f"SELECT * FROM dataset LIMIT {int(n)}").df()
+
+    def missing_counts(self) -> pd.Series:
+        cols = list(self._dtypes.index)
+        if not cols:
+            return pd.Series(dtype="int64")
+        exprs = ", ".join(f"count(*) - count({_quote(c)})" for c in cols)
+        row = self._scalar_row(f"SELECT {exprs} FROM dataset")
+        return pd.Series(row, index=cols, dtype="int64")
+
+    @staticmethod
+    def _describe_exprs(cols: list) -> list:
+        exprs = []
+        for c in cols:
+            q = _quote(c)
+            exprs += [
+                f"count({q})", f"avg({q})", f"stddev_samp({q})", f"min({q})",
+                f"approx_quantile({q}, 0.25)", f"approx_quantile({q}, 0.5)",
+                f"approx_quantile({q}, 0.75)", f"max({q})",
+            ]
+        return exprs
+
+    @staticmethod
+    def _describe_frame(values, cols: list) -> pd.DataFrame:
+        if not cols:
+            return pd.DataFrame()
+        width = len(DESCRIBE_COLUMNS)
+        data = [values[i * width:(i + 1) * width] for i in range(len(cols))]
+        return pd.DataFrame(data, index=cols, columns=DESCRIBE_COLUMNS, dtype="float64")
+
+    def describe(self) -> pd.DataFrame:
+        cols = self.numeric_columns()
+        if not cols:
+            return pd.DataFrame()
+        row = self._scalar_row(f"SELECT {', '.join(self._describe_exprs(cols))} FROM dataset")
+        return self._describe_frame(row, cols)
+
+    def summarize(self):
+        """Missing counts and the numeric summary from a single scan."""
+        cols = list(self._dtypes.index)
+        numeric = self.numeric_columns()
+        exprs = ["count(*)"] + [f"count({_quote(c)})" for c in cols] + self._describe_exprs(numeric)
+        row = self._scalar_row(f"SELECT {', '.join(exprs)} FROM dataset")
+
+        self._rows = row[0]
+        missing_counts = pd.Series([row[0] - n for n in row[1:len(cols) + 1]], index=cols, dtype="int64")
+        stats = self._describe_frame(row[len(cols) + 1:], numeric)
+        return missing_counts, stats, 0
+
+    def value_counts(self, col: str, limit: int = None) -> pd.Series:
+        q = _quote(col)
+        sql = f"SELECT {q}, count(*) AS _n FROM dataset WHERE {q} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        result = self.con.execute(sql).df()
+        return pd.Series(result["_n"].to_numpy(), index=result[col].to_numpy(), name="count")
+
+    def histogram(self, col: str, bins: int = 30):
+        q = _quote(col)
+        lo, hi = self._scalar_row(f"SELECT min({q}), max({q}) FROM dataset")
+        if lo is None:
+            return np.zeros(bins, dtype="int64"), np.linspace(0, 1, bins + 1)
+        lo, hi = _bin_range(lo, hi)
+        width = (hi - lo) / bins
+
+        result = self.con.execute(
+            f"SELECT least(floor(({q} - {lo!r}) / {width!r}), {bins - 1})::INTEGER AS _bin, count(*) "
+            f"FROM dataset WHERE {q} IS NOT NULL GROUP BY 1"
+        ).fetchall()
+        counts = np.zeros(bins, dtype="int64")
+        for b, n in result:
+            counts[b] = n
+        return counts, np.linspace(lo, hi, bins + 1)
+
+    def histogram2d(self, x: str, y: str, bins: int = 100):
+        qx, qy = _quote(x), _quote(y)
+        both = f"{qx} IS NOT NULL AND {qy} IS NOT NULL"
+        x_lo, x_hi, y_lo, y_hi = self._scalar_row(
+            f"SELECT min({qx}), max({qx}), min({qy}), max({qy}) FROM dataset WHERE {both}"
+        )
+        if x_lo is None:
+            edges = np.linspace(0, 1, bins + 1)
+            return np.zeros((bins, bins)), edges, edges
+        x_lo, x_hi = _bin_range(x_lo, x_hi)
+        y_lo, y_hi = _bin_range(y_lo, y_hi)
+        x_width, y_width = (x_hi - x_lo) / bins, (y_hi - y_lo) / bins
+
+        result = self.con.execute(
+            f"SELECT least(floor(({qx} - {x_lo!r}) / {x_width!r}), {bins - 1})::INTEGER AS _bx, "
+            f"least(floor(({qy} - {y_lo!r}) / {y_width!r}), {bins - 1})::INTEGER AS _by, count(*) AS _n "
+            f"FROM dataset WHERE {both} GROUP BY 1, 2"
+        ).fetchnumpy()
+        counts = np.zeros((bins, bins))
+        counts[result["_bx"], result["_by"]] = result["_n"]
+        return counts, np.linspace(x_lo, x_hi, bins + 1), np.linspace(y_lo, y_hi, bins + 1)
+
+    def box_stats(self, col: str) -> dict:
+        q = _quote(col)
+        q1, med, q3 = self._scalar_row(
+            f"SELECT approx_quantile({q}, 0.25), approx_quantile({q}, 0.5), "
+            f"approx_quantile({q}, 0.75) FROM dataset"
+        )
+        iqr = q3 - q1
+        low, high = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+        whislo, whishi = self._scalar_row(
+            f"SELECT min({q}), max({q}) FROM dataset WHERE {q} BETWEEN {low!r} AND {high!r}"
+        )
+        fliers = self.con.execute(
+            f"SELECT {q} FROM dataset WHERE {q} < {low!r} OR {q} > {high!r} "
+            f"USING SAMPLE {MAX_FLIERS} ROWS"
+        ).fetchnumpy()[col]
+        return {
+            "label": col,
+            "q1": q1, "med": med, "q3": q3,
+            "whislo": q1 if whislo is None else whislo,
+            "whishi": q3 if whishi is None else whishi,
+            "fliers": np.asarray(fliers, dtype="float64"),
+        }
+
+    def corr(self, cols: list) -> pd.DataFrame:
+        pairs = [(a, b) for i, a in enumerate(cols) for b in cols[i + 1:]]
+        matrix = pd.DataFrame(np.eye(len(cols)), index=cols, columns=cols)
+        if not pairs:
+            return matrix
+        exprs = ", ".join(f"corr({_quote(a)}, {_quote(b)})" for a, b in pairs)
+        row = self._scalar_row(f"SELECT {exprs} FROM dataset")
+        for (a, b), value in zip(pairs, row):
+            matrix.loc[a, b] = matrix.loc[b, a] = np.nan if value is None else value
+        return matrix
+
+    def sample(self, cols: list, n: int = SAMPLE_ROWS) -> pd.DataFrame:
+        select = ", ".join(_quote(c) for c in cols)
+        step = max(1, -(-self.shape[0] // n))
+        if step == 1:
+            return self.con.execute(f"SELECT {select} FROM dataset").df()
+        # Systematic sample keeps dataset order, which line charts depend on
+        return self.con.execute(
+            f"SELECT {select} FROM (SELECT {select}, row_number() OVER () AS _rn FROM dataset) "
+            f"WHERE _rn % {step} = 0"
+        ).df()
+
+    def duplicate_count(self, subset: list = None) -> int:
+        keys = ", ".join(_quote(c) for c in subset) if subset else "*"
+        (total,) = self._scalar_row("SELECT count(*) FROM dataset")
+        # DISTINCT treats NULLs as equal, like pandas' duplicated()
+        (distinct,) = self._scalar_row(f"SELECT count(*) FROM (SELECT DISTINCT {keys} FROM dataset)")
+        return int(total - distinct)
+
+    def _source(self, strategies: dict, dedup: list = None) -> str:
+        """
+        FROM/WHERE clause over the rows that survive deduplication (first
+        occurrence kept, file order preserved) and the Drop strategies.
+        """
+        source = "dataset"
+        if dedup is not None:
+            keys = ", ".join(_quote(c) for c in (dedup or self.columns))
+            source = (
+                "(SELECT * EXCLUDE (_rn) FROM ("
+                "SELECT * FROM (SELECT *, row_number() OVER () AS _rn FROM dataset) "
+                f"QUALIFY row_number() OVER (PARTITION BY {keys} ORDER BY _rn) = 1 ORDER BY _rn))"
+            )
+        drops = [col for col, method in strategies.items() if method == "Drop"]
+        if drops:
+            source += " WHERE " + " AND ".join(f"{_quote(col)} IS NOT NULL" for col in drops)
+        return source
+
+    def fill_values(self, strategies: dict, dedup: list = None) -> dict:
+        exprs, targets = [], []
+        for col, method in strategies.items():
+            q = _quote(col)
+            if method == "Median":
+                exprs.append(f"approx_quantile({q}, 0.5)")
+            elif method == "Mean":
+                exprs.append(f"avg({q})")
+            elif method == "Most Frequent":
+                exprs.append(f"mode({q})")
+            else:
+                continue
+            targets.append(col)
+        if not exprs:
+            return {}
+        row = self._scalar_row(f"SELECT {', '.join(exprs)} FROM {self._source(strategies, dedup)}")
+        return {col: value for col, value in zip(targets, row) if value is not None}
+
+    def impute(self, strategies: dict, fills: dict = None, dedup: list = None) -> "DuckDBBackend":
+        """
+        Writes the cleaned dataset to a Parquet file in OUT_OF_CORE_DIR and
+        returns a backend over it. Nothing is materialized in pandas.
+        The file is named by the source's fingerprint and the cleaning plan,
+        so a changed source or a same-named file elsewhere is never served
+        another file's cleaned rows. Past OUT_OF_CORE_MAX_MB the least
+        recently used cleaned files and spooled uploads are removed.
+        """
+        if fills is None:
+            fills = self.fill_values(strategies, dedup)
+
+        replace = ", ".join(
+            f"coalesce({_quote(col)}, {_literal(value)}) AS {_quote(col)}"
+            for col, value in fills.items()
+        )
+        source = self._source(strategies, dedup)
+        select = f"SELECT * REPLACE ({replace}) FROM {source}" if replace else f"SELECT * FROM {source}"
+
+        plan_key = hashlib.blake2b(
+            repr((self.fingerprint(), sorted(strategies.items()), sorted(fills.items()), dedup)).encode(),
+            digest_size=8,
+        ).hexdigest()
+        stem = os.path.splitext(os.path.basename(self.path))[0]
+        out_path = os.path.join(os.path.abspath(OUT_OF_CORE_DIR), f"{stem}.clean-{plan_key}.parquet")
+
+        if os.path.exists(out_path):
+            touch_file(out_path)
+        else:
+            tmp_path = f"{out_path}.{os.getpid()}.tmp"
+            self.con.execute(f"COPY ({select}) TO {_literal(tmp_path)} (FORMAT parquet)")
+            os.replace(tmp_path, out_path)
+            _evict_out_of_core(keep=[out_path, self.path])
+
+        return DuckDBBackend(out_path)
+
+    def fingerprint(self) -> str:
+        """The file's path, size and modification time; cleaned files are named by plan."""
+        info = os.stat(self.path)
+        ident = f"{self.path}|{info.st_size}|{info.st_mtime_ns}"
+        return hashlib.blake2b(ident.encode(), digest_size=16).hexdigest()
+
+    def write_csv(self, path: str, compression: str = None):
+        options = "FORMAT csv, HEADER"
+        if compression:
+            options += f", COMPRESSION {compression}"
+        self.con.execute(f"COPY dataset TO {_literal(path)} ({options})")
+
+    def write_parquet(self, path: str):
+        self.con.execute(f"COPY dataset TO {_literal(path)} (FORMAT parquet)")
+
+
+def get_backend(data) -> DatasetBackend:
+    """Wraps a DataFrame in a PandasBackend; backends are returned as-is."""
+    if isinstance(data, DatasetBackend):
+        return data
+    return PandasBackend(data)
+
+
+def _evict_out_of_core(keep: list):
+    """Applies OUT_OF_CORE_MAX_MB to cleaned files and spooled uploads, best effort."""
+    try:
+        evict_lru_files(OUT_OF_CORE_DIR, (".parquet", ".csv"), OUT_OF_CORE_MAX_MB, keep=keep)
+    except OSError:
+        pass
+
+
+def spool_upload(uploaded_file, key: str) -> str:
+    """Copies an upload to the out-of-core directory so DuckDB can scan it."""
+    os.makedirs(OUT_OF_CORE_DIR, exist_ok=True)
+    ext = os.path.splitext(uploaded_file.name)[1].lower() or ".csv"
+    path = os.path.join(OUT_OF_CORE_DIR, f"{key}{ext}")
+    if os.path.exists(path):
+        touch_file(path)
+    else:
+        uploaded_file.seek(0)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as out:
+            while True:
+                block = uploaded_file.read(8 * 1024 * 1024)
+                if not block:
+                    break
+                out.write(block)
+        os.replace(tmp_path, path)
+        uploaded_file.seek(0)
+        _evict_out_of_core(keep=[path])
+    return path
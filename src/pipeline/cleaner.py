@@ -1,37 +1,390 @@
 # src/pipeline/cleaner.py
 
+import json
+import os
+import shutil
+import tempfile
+import weakref
+from dataclasses import dataclass, field
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.pipeline.backend import DatasetBackend, PandasBackend, get_backend
+from src.pipeline.model_imputation import MODEL_STRATEGIES, fallback_strategy, impute_with_models
+from src.pipeline.profiler import ChangeSet, profile_dataset
+from src.tools.utils import CHUNK_ROWS, iter_file_chunks
+
+# Bump when the plan format changes
+PLAN_VERSION = 1
+STRATEGIES = ["Median", "Mean", "Most Frequent", "Drop", *MODEL_STRATEGIES]
+# Row hashes DuplicateFilter keeps in memory before spilling to disk
+DEDUP_MAX_MB = float(os.getenv("EDA_DEDUP_MAX_MB", "256"))
+
 
-def suggest_imputation(df: pd.DataFrame) -> dict:
+def suggest_imputation(df, profile=None) -> dict:
     """
     Suggests a default imputation strategy per column with missing values:
     - Numerical: median
     - Categorical: most frequent
+    Reads missingness from the dataset profile; one is computed if not given.
     """
+    if profile is None:
+        profile = profile_dataset(df)
+
     suggestions = {}
-    for col in df.columns:
-        if df[col].isnull().sum() > 0:
-            if pd.api.types.is_numeric_dtype(df[col]):
-                suggestions[col] = "Median"
-            else:
-                suggestions[col] = "Most Frequent"
+    for col in profile.missing_columns:
+        if profile.is_numeric(col):
+            suggestions[col] = "Median"
+        else:
+            suggestions[col] = "Most Frequent"
     return suggestions
 
 
-def apply_imputation(df: pd.DataFrame, strategies: dict) -> pd.DataFrame:
+class DuplicateFilter:
     """
-    Applies selected imputation strategies per column.
+    Flags rows whose values were already seen, chunk after chunk, by 64-bit
+    row hash (optionally over a column subset). The first occurrence of a row
+    is kept, as with DataFrame.duplicated().
+
+    Seen hashes are kept as sorted uint64 runs, 8 bytes per distinct row:
+    - each chunk adds one run, and runs of similar size are merged, so every
+      hash is re-merged O(log n) times rather than once per chunk
+    - beyond max_bytes (EDA_DEDUP_MAX_MB) of runs in memory, the largest
+      in-memory run is spilled to a memory-mapped file in a temporary folder,
+      removed with the filter; lookups only page in what binary search touches
+
+    Rows are compared by hash, not value: two different rows with the same
+    64-bit hash count as duplicates and the later one is dropped. The odds of
+    any collision are about n^2 / 2^65 for n distinct rows (3e-8 at a million
+    rows, 3e-2 at a billion).
+    """
+
+    def __init__(self, subset: list = None, max_bytes: int = None):
+        self.subset = subset or None
+        self.duplicates = 0
+        self.max_bytes = int(DEDUP_MAX_MB * 1024 * 1024) if max_bytes is None else max_bytes
+        # Sorted runs: spilled (memory-mapped) ones first, then in-memory ones
+        self._spilled = []
+        self._runs = []
+        self._spill_dir = None
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(run.nbytes for run in self._runs)
+
+    def _contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._spilled + self._runs:
+            positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[positions] == hashes
+        return found
+
+    def _add(self, hashes: np.ndarray):
+        self._runs.append(hashes)
+        # Both runs are sorted, so the stable sort is a linear merge
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            newest = self._runs.pop()
+            self._runs[-1] = np.sort(np.concatenate([self._runs[-1], newest]), kind="stable")
+        while self._runs and self.memory_bytes > self.max_bytes:
+            self._spill(max(range(len(self._runs)), key=lambda i: len(self._runs[i])))
+
+    def _spill(self, index: int):
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="eda-dedup-")
+            weakref.finalize(self, shutil.rmtree, self._spill_dir, ignore_errors=True)
+        path = os.path.join(self._spill_dir, f"run-{len(self._spilled)}.npy")
+        np.save(path, self._runs.pop(index))
+        self._spilled.append(np.load(path, mmap_mode="r"))
+
+    def mask(self, chunk: pd.DataFrame) -> np.ndarray:
+        """Boolean array, True for rows that duplicate an earlier row."""
+        rows = chunk if self.subset is None else chunk[self.subset]
+        hashes = pd.util.hash_pandas_object(rows, index=False).to_numpy()
+
+        unique, first = np.unique(hashes, return_index=True)
+        duplicate = np.ones(len(hashes), dtype=bool)
+        duplicate[first] = False
+        if len(unique) and (self._runs or self._spilled):
+            seen = self._contains(unique)
+            duplicate[first[seen]] = True
+            unique = unique[~seen]
+
+        if len(unique):
+            self._add(unique)
+        self.duplicates += int(duplicate.sum())
+        return duplicate
+
+
+def duplicate_mask(df: pd.DataFrame, subset: list = None, chunk_rows: int = CHUNK_ROWS) -> np.ndarray:
+    """Rows that duplicate an earlier row, hashed chunk by chunk."""
+    dedup = DuplicateFilter(subset)
+    if df.empty:
+        return np.zeros(0, dtype=bool)
+    return np.concatenate([
+        dedup.mask(df.iloc[start:start + chunk_rows]) for start in range(0, len(df), chunk_rows)
+    ])
+
+
+def count_duplicates(df: pd.DataFrame, subset: list = None) -> int:
+    return int(duplicate_mask(df, subset).sum())
+
+
+def removed_rows(df: pd.DataFrame, strategies: dict, dedup: list = None, duplicates: DuplicateFilter = None):
+    """
+    Rows removed by deduplication and the Drop strategies, as one combined
+    mask (None if neither applies).
+    """
+    removed = None
+    if dedup is not None:
+        removed = duplicates.mask(df) if duplicates is not None else duplicate_mask(df, dedup)
+    drop_cols = [col for col, method in strategies.items() if method == "Drop"]
+    if drop_cols:
+        dropped = df[drop_cols].isna().any(axis=1).to_numpy()
+        removed = dropped if removed is None else removed | dropped
+    return removed
+
+
+def _json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _source_columns(path: str) -> list:
+    if path.endswith(".parquet"):
+        return pq.read_schema(path).names
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def _write_csv_chunks(chunks, path: str, columns: list) -> int:
+    rows = 0
+    for chunk in chunks:
+        chunk.to_csv(path, mode="a" if rows else "w", header=not rows, index=False)
+        rows += len(chunk)
+    if not rows:
+        pd.DataFrame(columns=columns).to_csv(path, index=False)
+    return rows
+
+
+def _write_parquet_chunks(chunks, path: str, schema: pa.Schema) -> int:
+    rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, preserve_index=False).cast(schema))
+            rows += len(chunk)
+    return rows
+
+
+def _promote(types: list) -> pa.DataType:
+    """One type for a column that parsed differently across chunks."""
+    if len(set(types)) == 1:
+        return types[0]
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        return pa.float64()
+    return pa.string()
+
+
+def _write_staged_parquet(chunks, path: str, columns: list) -> int:
+    parts_dir = f"{path}.parts"
+    os.makedirs(parts_dir, exist_ok=True)
+    try:
+        parts, rows = [], 0
+        # Types seen per column, from the chunks where it holds values
+        seen = {col: [] for col in columns}
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            part = os.path.join(parts_dir, f"part-{len(parts)}.parquet")
+            pq.write_table(table, part)
+            parts.append(part)
+            rows += len(chunk)
+            for col, column in zip(table.column_names, table.columns):
+                if column.null_count < len(column):
+                    seen[col].append(column.type)
+
+        schema = pa.schema([(col, _promote(types) if types else pa.string()) for col, types in seen.items()])
+        with pq.ParquetWriter(path, schema) as writer:
+            for part in parts:
+                table = pq.read_table(part)
+                arrays = [
+                    column.cast(field.type) if column.null_count < len(column) else pa.nulls(len(column), field.type)
+                    for column, field in zip(table.columns, schema)
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                os.remove(part)
+        return rows
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
+
+@dataclass
+class CleaningPlan:
+    """
+    Imputation strategies with their fill values computed once (fit), so the
+    same cleaning can be replayed on new data or streamed over large files.
+    Duplicate rows (dedup: None = keep, [] = all columns, or a column subset)
+    and Drop rules are removed before fill values are computed. KNN and
+    Iterative models are refitted on the data each time the plan is applied
+    (per chunk when streaming); out-of-core backends use the fallback values.
+    """
+    strategies: dict
+    fill_values: dict = field(default_factory=dict)
+    dedup: list = None
+    version: int = PLAN_VERSION
+
+    @property
+    def model_columns(self) -> list:
+        """Columns whose strategy is KNN or Iterative."""
+        return [col for col, method in self.strategies.items() if method in MODEL_STRATEGIES]
+
+    @classmethod
+    def fit(cls, df, strategies: dict, dedup: list = None) -> "CleaningPlan":
+        """
+        Computes fill values from a DataFrame or any DatasetBackend.
+        KNN / Iterative columns get the value of their fallback strategy;
+        their models are fitted when the plan is applied.
+        """
+        backend = get_backend(df)
+        numeric = set(backend.numeric_columns())
+        simple = {col: fallback_strategy(method, col in numeric) for col, method in strategies.items()}
+        return cls(dict(strategies), backend.fill_values(simple, dedup), dedup)
+
+    def apply(self, df, duplicates: DuplicateFilter = None):
+        """
+        Cleans a DataFrame and records what changed. Pass a DuplicateFilter to
+        deduplicate against rows seen in earlier chunks.
+        Out-of-core backends run the cleaning inside their engine.
+        Returns:
+            (cleaned data, ChangeSet or None for out-of-core backends)
+        """
+        if isinstance(df, DatasetBackend):
+            if not isinstance(df, PandasBackend):
+                return df.impute(self.strategies, self.fill_values, self.dedup), None
+            df = df.df
+
+        changes = ChangeSet(deduplicated=self.dedup == [])
+        kept = df
+
+        removed = removed_rows(df, self.strategies, self.dedup, duplicates)
+        if removed is not None:
+            changes.dropped_rows = int(removed.sum())
+            if changes.dropped_rows:
+                changes.dropped_missing = df[removed].isna().sum()
+                kept = df[~removed]
+
+        model_strategies = {col: m for col, m in self.strategies.items() if m in MODEL_STRATEGIES}
+        fills = {col: value for col, value in self.fill_values.items() if col not in model_strategies}
+        imputed = kept
+        if model_strategies:
+            imputed, fallbacks = impute_with_models(kept, model_strategies)
+            fills.update({col: self.fill_values[col] for col in fallbacks if col in self.fill_values})
+            changes.fallback_columns = fallbacks
+
+        # One fillna over all columns; copy-on-write (always on since pandas 3) shares untouched columns
+        df_clean = imputed.fillna(fills) if fills else imputed.copy(deep=False)
+
+        modelled = [col for col in model_strategies if col not in changes.fallback_columns]
+        changes.filled_columns = modelled + list(fills)
+        changes.memory_delta = sum(
+            int(df_clean[col].memory_usage(deep=True, index=False)) - int(kept[col].memory_usage(deep=True, index=False))
+            for col in changes.filled_columns
+        )
+        return df_clean, changes
+
+    def transform(self, df: pd.DataFrame, duplicates: DuplicateFilter = None) -> pd.DataFrame:
+        missing = [col for col in [*self.strategies, *(self.dedup or [])] if col not in df.columns]
+        if missing:
+            raise ValueError(f"Columns in the cleaning plan are missing from the data: {missing}")
+        # Fractional fills would otherwise make integer columns change type from chunk to chunk
+        fractional = [
+            col for col, value in self.fill_values.items()
+            if pd.api.types.is_integer_dtype(df[col]) and isinstance(value, float) and not value.is_integer()
+        ]
+        if fractional:
+            df = df.astype({col: "float64" for col in fractional})
+        return self.apply(df, duplicates)[0]
+
+    def transform_file(self, src_path: str, out_path: str, chunk_rows: int = CHUNK_ROWS) -> int:
+        """
+        Cleans a CSV or Parquet file chunk by chunk into a .parquet or .csv file,
+        never holding more than one chunk in memory.
+        Parquet output follows a Parquet source's schema. A CSV chunk's types
+        depend on its values (a column empty so far parses as float), so CSV
+        chunks are staged as separate Parquet parts and merged under one
+        schema promoted across all of them.
+        Returns:
+            number of rows written
+        """
+        if not out_path.endswith((".parquet", ".csv")):
+            raise ValueError("Cleaned output must be a .parquet or .csv file")
+
+        tmp_path = f"{out_path}.{os.getpid()}.tmp"
+        # One filter across all chunks, so duplicates in different chunks are caught
+        duplicates = DuplicateFilter(self.dedup) if self.dedup is not None else None
+        chunks = (self.transform(chunk, duplicates) for chunk in iter_file_chunks(src_path, chunk_rows))
+        try:
+            if out_path.endswith(".csv"):
+                rows = _write_csv_chunks(chunks, tmp_path, _source_columns(src_path))
+            elif src_path.endswith(".parquet"):
+                rows = _write_parquet_chunks(chunks, tmp_path, self._parquet_schema(src_path))
+            else:
+                rows = _write_staged_parquet(chunks, tmp_path, _source_columns(src_path))
+            os.replace(tmp_path, out_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return rows
+
+    def _parquet_schema(self, src_path: str) -> pa.Schema:
+        """A Parquet source's schema, with integers filled by Mean or Median widened to float."""
+        schema = pq.read_schema(src_path).remove_metadata()
+        for col, method in self.strategies.items():
+            index = schema.get_field_index(col)
+            if method in ("Mean", "Median") and index >= 0 and pa.types.is_integer(schema.field(index).type):
+                schema = schema.set(index, schema.field(index).with_type(pa.float64()))
+        return schema
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "version": self.version,
+            "strategies": self.strategies,
+            "fill_values": {col: _json_value(value) for col, value in self.fill_values.items()},
+            "dedup": self.dedup,
+        }, indent=2)
+
+    @classmethod
+    def from_json(cls, text) -> "CleaningPlan":
+        payload = json.loads(text)
+        if payload.get("version") != PLAN_VERSION:
+            raise ValueError(f"Unsupported cleaning plan version: {payload.get('version')}")
+        unknown = set(payload["strategies"].values()) - set(STRATEGIES)
+        if unknown:
+            raise ValueError(f"Unknown imputation strategies: {sorted(unknown)}")
+        return cls(payload["strategies"], payload["fill_values"], payload.get("dedup"))
+
+
+def apply_imputation_with_changes(df, strategies: dict, dedup: list = None):
     """
-    df_clean = df.copy()
+    Applies selected imputation strategies per column and records what changed.
+    dedup removes duplicate rows first: [] compares all columns, a list a subset.
+    Out-of-core backends run the cleaning inside their engine and return
+    a backend over the cleaned data.
+    Returns:
+        (cleaned data, ChangeSet or None for out-of-core backends)
+    """
+    return CleaningPlan.fit(df, strategies, dedup).apply(df)
 
-    for col, method in strategies.items():
-        if method == "Median":
-            df_clean[col].fillna(df_clean[col].median(), inplace=True)
-        elif method == "Mean":
-            df_clean[col].fillna(df_clean[col].mean(), inplace=True)
-        elif method == "Most Frequent":
-            df_clean[col].fillna(df_clean[col].mode()[0], inplace=True)
-        elif method == "Drop":
-            df_clean.dropna(subset=[col], inplace=True)
 
+def apply_imputation(df, strategies: dict, dedup: list = None):
+    """
+    Applies selected imputation strategies per column.
+    Out-of-core backends run the cleaning inside their engine and return
+    a backend over the cleaned data.
+    """
+    df_clean, _ = apply_imputation_with_changes(df, strategies, dedup)
     return df_clean
@@ -0,0 +1,125 @@
+# src/pipeline/column_scores.py
+
+"""
+Ranks columns by how much a chart of them is likely to show.
+
+Scores come from one vectorized pass over the dataset profile, plus a
+bounded row sample for correlations (and cardinality when the profile has
+no distinct counts), so ranking costs the same on a million rows as on a
+thousand. Without a profile, sample_profile stands in for one. Every
+component lies in [0, 1]:
+- spread: coefficient of variation, squashed as cv / (1 + cv)
+- skew: quartile (Bowley) skewness, absolute
+- missing: peaks at half the values missing; none or all missing scores 0
+- correlation: strongest absolute correlation with another numeric column
+- cardinality: categorical columns with 2 to MAX_CHART_LEVELS levels score
+  highest; near-unique (ID-like) or single-valued ones score 0
+Constant and all-missing columns are never ranked.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline.backend import get_backend
+from src.pipeline.profiler import profile_dataset
+
+# Rows sampled for correlations and cardinality
+SCORE_SAMPLE_ROWS = int(os.getenv("EDA_SCORE_SAMPLE_ROWS", "20000"))
+# Categorical columns with more levels than this make crowded bar charts
+MAX_CHART_LEVELS = 20
+# Columns with a distinct value for at least this share of rows are treated as IDs
+ID_LIKE_FRACTION = 0.5
+
+
+def _missing_score(missing_fraction: pd.Series) -> pd.Series:
+    return 4 * missing_fraction * (1 - missing_fraction)
+
+
+def _strongest_correlations(sample: pd.DataFrame) -> pd.DataFrame:
+    """
+    Each column's max absolute Pearson correlation with any other column and
+    that column, from one matrix product over the sample.
+    """
+    if sample.shape[1] < 2:
+        return pd.DataFrame({"correlation": 0.0, "partner": None}, index=sample.columns)
+    values = sample.to_numpy(dtype="float64", na_value=np.nan)
+    std = np.nanstd(values, axis=0)
+    std[std == 0] = np.nan
+    z = (values - np.nanmean(values, axis=0)) / std
+    # Missing values sit at the mean, which only weakens their column's correlations
+    z = np.nan_to_num(z)
+    corr = np.abs(z.T @ z) / len(z)
+    np.fill_diagonal(corr, -1)
+    best = corr.argmax(axis=0)
+    return pd.DataFrame(
+        {"correlation": corr[best, np.arange(len(best))].clip(min=0.0), "partner": sample.columns[best]},
+        index=sample.columns,
+    )
+
+
+def sample_profile(df):
+    """
+    Profile of a bounded row sample (SCORE_SAMPLE_ROWS), for ranking
+    columns when no full profile is at hand. Statistics and missingness are
+    estimates from the sample.
+    """
+    backend = get_backend(df)
+    return profile_dataset(backend.sample(list(backend.columns), n=SCORE_SAMPLE_ROWS), workers=1)
+
+
+def score_numeric(df, profile) -> pd.DataFrame:
+    """
+    Scores the profile's numeric columns.
+    Returns:
+        DataFrame of components, total score and each column's most
+        correlated partner, best first
+    """
+    stats = profile.stats
+    if stats.empty:
+        return pd.DataFrame(columns=["spread", "skew", "missing", "correlation", "partner", "score"])
+    stats = stats[(stats["count"] > 1) & (stats["std"] > 0)]
+
+    cv = stats["std"] / stats["mean"].abs().replace(0, np.nan)
+    spread = (cv / (1 + cv)).fillna(1.0)
+    iqr = (stats["75%"] - stats["25%"]).replace(0, np.nan)
+    skew = ((stats["75%"] + stats["25%"] - 2 * stats["50%"]) / iqr).abs().fillna(0.0).clip(upper=1.0)
+    missing = _missing_score(profile.missing_values["Percentage"].reindex(stats.index) / 100)
+
+    sample = get_backend(df).sample(stats.index.tolist(), n=SCORE_SAMPLE_ROWS)
+    correlations = _strongest_correlations(sample)
+
+    scores = pd.DataFrame({
+        "spread": spread, "skew": skew, "missing": missing, "correlation": correlations["correlation"],
+    })
+    scores["score"] = scores.sum(axis=1)
+    scores["partner"] = correlations["partner"]
+    return scores.sort_values("score", ascending=False, kind="stable")
+
+
+def score_categorical(df, profile, columns: list) -> pd.DataFrame:
+    """
+    Scores categorical columns by cardinality and missingness.
+    Distinct counts come from the profile when it has them (streaming
+    profiles), otherwise from a bounded sample.
+    """
+    if not columns:
+        return pd.DataFrame(columns=["cardinality", "missing", "score"])
+    if profile.distinct_counts is not None:
+        levels = profile.distinct_counts.reindex(columns).astype("float64")
+        rows = profile.n_rows
+    else:
+        sample = get_backend(df).sample(columns, n=SCORE_SAMPLE_ROWS)
+        levels = sample.nunique().astype("float64")
+        rows = len(sample)
+
+    missing_fraction = profile.missing_values["Percentage"].reindex(columns) / 100
+    observed = (1 - missing_fraction) * rows
+    # Full marks from 2 up to MAX_CHART_LEVELS levels, fading as levels crowd the chart
+    cardinality = (MAX_CHART_LEVELS / levels).clip(upper=1.0).fillna(0.0)
+    cardinality[(levels < 2) | (levels >= ID_LIKE_FRACTION * observed)] = 0.0
+
+    scores = pd.DataFrame({"cardinality": cardinality, "missing": _missing_score(missing_fraction)})
+    scores["score"] = scores.sum(axis=1).where(cardinality > 0, 0.0)
+    return scores.sort_values("score", ascending=False, kind="stable")
@@ -0,0 +1,146 @@
+# src/pipeline/model_imputation.py
+
+"""
+Model-based imputation (KNN / iterative) that stays usable on large frames.
+
+- Models are fitted on a row sample, never on the whole frame
+- Only rows with a missing target are imputed, in batches on a thread pool;
+  the heavy work (KNN distances, regressions) runs in NumPy/BLAS, which
+  releases the GIL, so batches overlap across cores without copying the
+  frame to worker processes. KNN searches neighbours among the fitted
+  sample only (approximate)
+- A time budget and a memory estimate guard every run; when either is
+  exceeded the columns fall back to the simple strategies
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+MODEL_STRATEGIES = ["KNN", "Iterative"]
+# Simple strategy used when a model cannot run within its budget
+FALLBACK_STRATEGY = "Median"
+
+KNN_NEIGHBORS = 5
+KNN_FIT_ROWS = 10_000
+ITERATIVE_FIT_ROWS = 20_000
+# Widest feature set a model sees (targets first, then the most complete columns)
+MODEL_MAX_FEATURES = 32
+IMPUTE_BATCH_ROWS = 2_000
+IMPUTE_WORKERS = int(os.getenv("EDA_IMPUTE_WORKERS", str(os.cpu_count() or 1)))
+IMPUTE_TIME_LIMIT_S = float(os.getenv("EDA_IMPUTE_TIME_LIMIT_S", "60"))
+IMPUTE_MEMORY_LIMIT_MB = float(os.getenv("EDA_IMPUTE_MEMORY_MB", "1024"))
+
+
+class BudgetExceeded(Exception):
+    """A model run would exceed its time or memory budget."""
+
+
+def _is_numeric(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def fallback_strategy(method: str, numeric: bool) -> str:
+    """The simple strategy standing in for a model strategy."""
+    if method not in MODEL_STRATEGIES:
+        return method
+    return FALLBACK_STRATEGY if numeric else "Most Frequent"
+
+
+def _features(df: pd.DataFrame, targets: list) -> list:
+    numeric = [c for c in df.columns if _is_numeric(df[c])]
+    others = [c for c in numeric if c not in targets]
+    completeness = df[others].notna().sum().sort_values(ascending=False, kind="stable")
+    return targets + completeness.index[:max(0, MODEL_MAX_FEATURES - len(targets))].tolist()
+
+
+def _make_model(method: str):
+    if method == "KNN":
+        from sklearn.impute import KNNImputer
+        return KNNImputer(n_neighbors=KNN_NEIGHBORS, keep_empty_features=True)
+    from sklearn.experimental import enable_iterative_imputer  # noqa: F401
+    from sklearn.impute import IterativeImputer
+    return IterativeImputer(max_iter=10, random_state=0, keep_empty_features=True)
+
+
+def _impute_columns(df: pd.DataFrame, method: str, targets: list, deadline: float, workers: int) -> dict:
+    target_values = df[targets].to_numpy(dtype="float64", na_value=np.nan, copy=True)
+    rows = np.flatnonzero(np.isnan(target_values).any(axis=1))
+    if not len(rows):
+        # Nothing to impute (this includes empty frames): no model to fit
+        return {col: target_values[:, i] for i, col in enumerate(targets)}
+
+    features = _features(df, targets)
+    fit_rows = KNN_FIT_ROWS if method == "KNN" else ITERATIVE_FIT_ROWS
+
+    # Peak per batch: the batch's feature block plus, for KNN, its distances to the fitted sample
+    sample_size = min(len(df), fit_rows)
+    per_batch = IMPUTE_BATCH_ROWS * len(features) * 8
+    if method == "KNN":
+        per_batch += IMPUTE_BATCH_ROWS * sample_size * 8
+    needed_mb = (sample_size * len(features) * 8 * 3 + per_batch * workers) / 1024 / 1024
+    if needed_mb > IMPUTE_MEMORY_LIMIT_MB:
+        raise BudgetExceeded(f"{method} needs ~{needed_mb:.0f}MB")
+
+    frame = df[features]
+    rng = np.random.default_rng(0)
+    sample = np.sort(rng.choice(len(df), sample_size, replace=False))
+    model = _make_model(method)
+    model.fit(frame.iloc[sample].to_numpy(dtype="float64", na_value=np.nan, copy=True))
+    if time.monotonic() > deadline:
+        raise BudgetExceeded(f"fitting {method} ran out of time")
+
+    batches = [rows[i:i + IMPUTE_BATCH_ROWS] for i in range(0, len(rows), IMPUTE_BATCH_ROWS)]
+
+    def run(batch):
+        if time.monotonic() > deadline:
+            raise BudgetExceeded(f"{method} ran out of time")
+        block = frame.iloc[batch].to_numpy(dtype="float64", na_value=np.nan, copy=True)
+        return model.transform(block)[:, :len(targets)]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run, batch) for batch in batches]
+        try:
+            for batch, future in zip(batches, futures):
+                target_values[batch] = future.result()
+        except BudgetExceeded:
+            for future in futures:
+                future.cancel()
+            raise
+
+    return {col: target_values[:, i] for i, col in enumerate(targets)}
+
+
+def impute_with_models(df: pd.DataFrame, strategies: dict, time_limit: float = None, workers: int = None):
+    """
+    Fills the columns whose strategy is KNN or Iterative.
+    Non-numeric columns and columns whose model would exceed the time or
+    memory budget are left untouched and reported as fallbacks.
+    Returns:
+        (DataFrame with model-imputed columns, list of fallback columns)
+    """
+    time_limit = IMPUTE_TIME_LIMIT_S if time_limit is None else time_limit
+    workers = IMPUTE_WORKERS if workers is None else workers
+    deadline = time.monotonic() + time_limit
+
+    fallbacks = []
+    result = df
+    for method in MODEL_STRATEGIES:
+        cols = [c for c, m in strategies.items() if m == method]
+        targets = [c for c in cols if _is_numeric(df[c])]
+        fallbacks += [c for c in cols if c not in targets]
+        if not targets:
+            continue
+        try:
+            filled = _impute_columns(df, method, targets, deadline, workers)
+        except BudgetExceeded:
+            fallbacks += targets
+            continue
+        # Copy-on-write: only the imputed columns are new
+        result = result.copy(deep=False)
+        for col, values in filled.items():
+            result[col] = pd.Series(values, index=df.index)
+    return result, fallbacks
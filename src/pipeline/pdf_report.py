@@ -1,6 +1,6 @@
 # src/pipeline/pdf_report.py
 
-import os
+import io
 from datetime import datetime
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak
@@ -9,19 +9,43 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 
+from src.pipeline.backend import get_backend
 from src.pipeline.report_builder import generate_report_charts
+from src.pipeline.report_store import load_report, save_report
 
 
-def generate_pdf_report(df, ai_insights, output_path="EDA_Report.pdf"):
+def report_fingerprint(df, appendix: bool = False) -> str:
+    """Report store key for a dataset; reports with an appendix are stored apart."""
+    fingerprint = get_backend(df).fingerprint()
+    return f"{fingerprint}+appendix" if appendix else fingerprint
+
+
+def generate_pdf_report(df, ai_insights, charts=None, prompt: str = None, profile=None, appendix: bool = False) -> bytes:
     """
     Generates a clean multi-page EDA report with charts and AI text insights.
     Automatically wraps text properly to prevent overflow.
+    charts: (images, captions) from generate_report_charts, rendered here if omitted.
+    prompt: the LLM prompt the insights answer, stored so repeats can skip the LLM.
+    profile: the dataset profile, used to rank charted columns and for the
+    appendix (computed here if needed and omitted).
+    appendix: add one page per column with a mini chart and its profile stats.
+    The PDF is built in memory and returned as bytes, so concurrent sessions
+    never share an output file. A report already built for the same data,
+    insights and template comes from the report store.
     """
+    fingerprint = report_fingerprint(df, appendix)
+    stored = load_report(fingerprint, ai_insights)
+    if stored is not None:
+        return stored
 
-    chart_paths, captions = generate_report_charts(df)
+    if profile is None and (charts is None or appendix):
+        from src.pipeline.profiler import profile_dataset
+        profile = profile_dataset(df)
+    charts, captions = charts if charts is not None else generate_report_charts(df, profile=profile)
 
+    buffer = io.BytesIO()
     pdf = SimpleDocTemplate(
-        output_path,
+        buffer,
         pagesize=A4,
         rightMargin=40,
         leftMargin=40,
@@ -78,16 +102,23 @@ def generate_pdf_report(df, ai_insights, output_path="EDA_Report.pdf"):
     content.append(Paragraph("📈 Visual Analysis", styles['Heading2']))
     content.append(Spacer(1, 15))
 
-    for i, img_path in enumerate(chart_paths):
-        if os.path.exists(img_path):
-            content.append(Image(img_path, width=450, height=250))
+    # Charts are embedded from memory, never through shared files
+    for i, png in enumerate(charts):
+        content.append(Image(io.BytesIO(png), width=450, height=250))
 
         content.append(Spacer(1, 10))
         content.append(Paragraph(captions[i], styles['Normal']))
         content.append(PageBreak())
 
+    if appendix:
+        from src.pipeline.report_appendix import appendix_flowables
+
+        content.extend(appendix_flowables(df, profile, styles))
+
     pdf.build(content)
-    return output_path
+    pdf_bytes = buffer.getvalue()
+    save_report(fingerprint, ai_insights, pdf_bytes, prompt)
+    return pdf_bytes
 
 
 
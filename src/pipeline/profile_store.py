@@ -0,0 +1,195 @@
+# src/pipeline/profile_store.py
+
+"""
+Persistent profile store.
+
+Profiles are kept in a local SQLite database keyed by dataset fingerprint
+and profiler version, so a dataset that has been profiled once (by anyone
+on this server) loads its profile in milliseconds. Entries are evicted by
+age and by total payload size.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline import sqlite_lru
+from src.pipeline.backend import get_backend
+from src.pipeline.profiler import PROFILER_VERSION, DatasetProfile, count_duplicate_rows, profile_dataset
+
+PROFILE_STORE_PATH = "src/data/cache/profiles.sqlite"
+PROFILE_MAX_AGE_DAYS = float(os.getenv("EDA_PROFILE_MAX_AGE_DAYS", "30"))
+PROFILE_STORE_MAX_MB = float(os.getenv("EDA_PROFILE_STORE_MAX_MB", "256"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    fingerprint TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (fingerprint, version)
+)
+"""
+
+
+def _connect() -> sqlite3.Connection:
+    return sqlite_lru.connect(PROFILE_STORE_PATH, _SCHEMA)
+
+
+def _frame_to_json(df: pd.DataFrame) -> dict:
+    return {
+        "index": df.index.tolist(),
+        "columns": df.columns.tolist(),
+        "data": df.to_numpy(dtype=object).tolist(),
+    }
+
+
+def _frame_from_json(payload: dict) -> pd.DataFrame:
+    if not payload["columns"]:
+        return pd.DataFrame()
+    return pd.DataFrame(payload["data"], index=payload["index"], columns=payload["columns"])
+
+
+def _restore_dtype(name: str):
+    try:
+        return pd.api.types.pandas_dtype(name)
+    except TypeError:
+        return np.dtype(object)
+
+
+def _encode(profile: DatasetProfile) -> bytes:
+    types = profile.column_types["Type"]
+    payload = {
+        "n_rows": int(profile.n_rows),
+        "n_cols": int(profile.n_cols),
+        "memory_bytes": int(profile.memory_bytes),
+        "duplicate_rows": None if profile.duplicate_rows is None else int(profile.duplicate_rows),
+        "missing_values": _frame_to_json(profile.missing_values),
+        "column_types": [[col, str(dtype)] for col, dtype in types.items()],
+        "stats": _frame_to_json(profile.stats),
+        "distinct_counts": (
+            None if profile.distinct_counts is None
+            else [[col, int(n)] for col, n in profile.distinct_counts.items()]
+        ),
+        "top_values": (
+            None if profile.top_values is None
+            else [[col, [[str(v), int(n)] for v, n in top.items()]] for col, top in profile.top_values.items()]
+        ),
+    }
+    # Python's json round-trips floats (and NaN) exactly
+    return zlib.compress(json.dumps(payload).encode("utf-8"))
+
+
+def _decode(blob: bytes) -> DatasetProfile:
+    payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    missing_values = _frame_from_json(payload["missing_values"])
+    if not missing_values.empty:
+        missing_values = missing_values.astype({"Missing Count": "int64", "Percentage": "float64"})
+    stats = _frame_from_json(payload["stats"])
+    if not stats.empty:
+        stats = stats.astype("float64")
+
+    cols = [col for col, _ in payload["column_types"]]
+    column_types = pd.Series(
+        [_restore_dtype(name) for _, name in payload["column_types"]], index=cols, dtype=object
+    ).to_frame("Type")
+
+    distinct_counts = None
+    if payload["distinct_counts"] is not None:
+        distinct_counts = pd.Series(dict(payload["distinct_counts"]), dtype="int64")
+    top_values = None
+    if payload["top_values"] is not None:
+        top_values = {
+            col: pd.Series(dict(pairs), dtype="int64")
+            for col, pairs in payload["top_values"]
+        }
+
+    return DatasetProfile(
+        n_rows=payload["n_rows"],
+        n_cols=payload["n_cols"],
+        missing_values=missing_values,
+        column_types=column_types,
+        stats=stats,
+        memory_bytes=payload["memory_bytes"],
+        duplicate_rows=payload["duplicate_rows"],
+        distinct_counts=distinct_counts,
+        top_values=top_values,
+    )
+
+
+def load_profile(fingerprint: str):
+    """Returns the stored profile for a dataset fingerprint, or None."""
+    try:
+        with _connect() as con:
+            row = con.execute(
+                "SELECT payload FROM profiles WHERE fingerprint = ? AND version = ?",
+                (fingerprint, PROFILER_VERSION),
+            ).fetchone()
+            if row is None:
+                return None
+            con.execute(
+                "UPDATE profiles SET accessed = ? WHERE fingerprint = ? AND version = ?",
+                (time.time(), fingerprint, PROFILER_VERSION),
+            )
+        return _decode(row[0])
+    except (sqlite3.Error, ValueError, zlib.error):
+        # A broken store must never block profiling
+        return None
+
+
+def save_profile(fingerprint: str, profile: DatasetProfile):
+    """Stores a profile under its dataset fingerprint, then applies eviction."""
+    now = time.time()
+    try:
+        blob = _encode(profile)
+        with _connect() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?, ?, ?)",
+                (fingerprint, PROFILER_VERSION, blob, len(blob), now, now),
+            )
+            _evict(con)
+    except (sqlite3.Error, TypeError, ValueError):
+        # Storing is best effort, like loading
+        pass
+
+
+def _evict(con: sqlite3.Connection):
+    sqlite_lru.evict(con, "profiles", PROFILER_VERSION, PROFILE_STORE_MAX_MB, PROFILE_MAX_AGE_DAYS)
+
+
+def evict_profiles():
+    """Applies age and size eviction without storing anything."""
+    try:
+        with _connect() as con:
+            _evict(con)
+    except sqlite3.Error:
+        pass
+
+
+def get_or_create_profile(df, fingerprint: str, duplicates: bool = False):
+    """
+    Loads the stored profile for a fingerprint, profiling and storing it on a miss.
+    Profiles are stored per backend kind: a file profiled in pandas and
+    out-of-core gets two entries, as their profiles differ.
+    duplicates: also count duplicate rows (see count_duplicate_rows) and
+    store them with the profile.
+    Returns:
+        (DatasetProfile, True if it came from the store)
+    """
+    key = f"{type(get_backend(df)).__name__}:{fingerprint}"
+    profile = load_profile(key)
+    if profile is not None and (profile.duplicate_rows is not None or not duplicates):
+        return profile, True
+    profile = profile if profile is not None else profile_dataset(df)
+    if duplicates:
+        count_duplicate_rows(profile, df)
+    save_profile(key, profile)
+    return profile, False
@@ -1,35 +1,403 @@
 # src/pipeline/profiler.py
 
+import copy
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
 import pandas as pd
+from pyarrow import ArrowException
+
+from src.pipeline.backend import DESCRIBE_COLUMNS, PandasBackend, get_backend
+from src.pipeline.sketches import HyperLogLog, KLLSketch, MisraGries, Moments
+from src.tools.shared_frames import SharedFrame, get_worker_pool, map_shared_columns
+from src.tools.utils import iter_file_chunks
+
+# Rows per chunk when profiling a file in streaming mode
+STREAM_CHUNK_ROWS = 250_000
+# Worker processes for column-parallel profiling (1 = profile in-process)
+PROFILE_WORKERS = int(os.getenv("EDA_PROFILE_WORKERS", "1"))
+# Narrower frames are not worth the cost of sharing them with workers
+PARALLEL_MIN_COLUMNS = 64
+# Bump when profile contents change so stored profiles are not served stale
+PROFILER_VERSION = 2
+
+
+@dataclass
+class DatasetProfile:
+    """
+    Everything the UI, cleaner and report need to know about a dataset,
+    computed once by profile_dataset.
+    - missing_values: missing count & percentage per column
+    - column_types: dtype per column
+    - stats: basic statistics for numeric columns (describe().T layout)
+    - duplicate_rows: rows repeating an earlier row (None until counted, see
+      count_duplicate_rows)
+    """
+    n_rows: int
+    n_cols: int
+    missing_values: pd.DataFrame
+    column_types: pd.DataFrame
+    stats: pd.DataFrame
+    memory_bytes: int = 0
+    duplicate_rows: int = None
+    # Only filled by streaming profiles (approximate)
+    distinct_counts: pd.Series = None
+    top_values: dict = None
+
+    def __getitem__(self, key):
+        # Dict-style access, as the profile used to be a plain dict
+        return getattr(self, key)
+
+    @property
+    def missing_counts(self) -> pd.Series:
+        return self.missing_values["Missing Count"]
 
-def profile_dataset(df: pd.DataFrame) -> dict:
+    @property
+    def total_missing(self) -> int:
+        return int(self.missing_counts.sum())
+
+    @property
+    def missing_columns(self) -> list:
+        return self.missing_counts[self.missing_counts > 0].index.tolist()
+
+    @property
+    def missing_pct(self) -> float:
+        cells = self.n_rows * self.n_cols
+        return self.total_missing / cells * 100 if cells else 0.0
+
+    @property
+    def memory_mb(self) -> float:
+        return self.memory_bytes / 1024 / 1024
+
+    def is_numeric(self, col) -> bool:
+        dtype = self.column_types.loc[col, "Type"]
+        return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+@dataclass
+class ChangeSet:
+    """
+    What a cleaning pass changed, so the profile can be brought up to date
+    without rescanning the whole frame.
+    - filled_columns: columns whose missing values were filled
+    - dropped_rows: number of rows removed
+    - dropped_missing: missing count per column within the removed rows
+    - memory_delta: change in bytes of the filled columns
+    - deduplicated: duplicate rows (over all columns) were removed
+    - fallback_columns: model-imputed columns that fell back to a simple fill
     """
-    Performs lightweight EDA profiling.
+    filled_columns: list = field(default_factory=list)
+    dropped_rows: int = 0
+    dropped_missing: pd.Series = None
+    memory_delta: int = 0
+    deduplicated: bool = False
+    fallback_columns: list = field(default_factory=list)
+
+
+def _profile_shard(handle, columns: list):
+    """Worker entry point: summarizes one shard of columns from shared memory."""
+    return map_shared_columns(handle, columns, lambda df: PandasBackend(df).summarize())
+
+
+def _shard_columns(df: pd.DataFrame, shards: int) -> list:
+    """Splits columns into shards of roughly equal byte size (largest first, greedy)."""
+    sizes = df.memory_usage(deep=False, index=False).sort_values(ascending=False)
+    buckets = [[] for _ in range(shards)]
+    loads = [0] * shards
+    for col, size in sizes.items():
+        target = loads.index(min(loads))
+        buckets[target].append(col)
+        loads[target] += size
+    return [bucket for bucket in buckets if bucket]
+
+
+def _summarize_parallel(df: pd.DataFrame, workers: int):
+    """
+    backend.summarize() with columns sharded across a process pool.
+    The frame travels once, as an Arrow file in shared memory.
+    """
+    pool = get_worker_pool(workers)
+    shards = _shard_columns(df, min(len(df.columns), workers * 4))
+
+    with SharedFrame(df) as shared:
+        futures = [pool.submit(_profile_shard, shared.handle, cols) for cols in shards]
+        results = [future.result() for future in futures]
+
+    missing_counts = pd.concat([missing for missing, _, _ in results]).reindex(df.columns)
+    stat_frames = [stats for _, stats, _ in results if not stats.empty]
+    stats = pd.DataFrame()
+    if stat_frames:
+        numeric = [c for c in df.columns if any(c in frame.index for frame in stat_frames)]
+        stats = pd.concat(stat_frames).reindex(numeric)
+    memory_bytes = int(df.index.memory_usage(deep=True)) + sum(memory for _, _, memory in results)
+    return missing_counts, stats, memory_bytes
+
+
+def profile_dataset(df, workers: int = None) -> DatasetProfile:
+    """
+    Performs lightweight EDA profiling in a single fused pass.
+    Accepts a DataFrame or any DatasetBackend; the work runs in that engine.
+    Wide DataFrames are profiled column-parallel when workers > 1
+    (defaults to EDA_PROFILE_WORKERS).
     Returns:
-        A dictionary containing:
-        - missing_values: missing count & percentage
-        - column_types: dtype classification
-        - stats: basic statistics for numeric columns
+        A DatasetProfile holding missing values, column types, numeric
+        stats and memory footprint (duplicates: count_duplicate_rows).
     """
+    backend = get_backend(df)
+    workers = PROFILE_WORKERS if workers is None else workers
+
+    summary = None
+    if (
+        isinstance(backend, PandasBackend)
+        and workers > 1
+        and backend.shape[1] >= PARALLEL_MIN_COLUMNS
+    ):
+        try:
+            summary = _summarize_parallel(backend.df, workers)
+        except ArrowException:
+            # Mixed-type object columns cannot be shared as Arrow; profile in-process
+            summary = None
+    if summary is None:
+        summary = backend.summarize()
+    missing_counts, stats, memory_bytes = summary
+    n_rows, n_cols = backend.shape
+
     # Missing values info
     missing_values = (
-        df.isnull().sum()
+        missing_counts
         .to_frame("Missing Count")
-        .assign(Percentage=lambda x: (x["Missing Count"] / len(df)) * 100)
+        .assign(Percentage=lambda x: (x["Missing Count"] / n_rows) * 100)
     )
 
     # Column type info
-    column_types = df.dtypes.to_frame("Type")
+    column_types = backend.dtypes.to_frame("Type")
+
+    return DatasetProfile(
+        n_rows=n_rows,
+        n_cols=n_cols,
+        missing_values=missing_values,
+        column_types=column_types,
+        stats=stats,
+        memory_bytes=memory_bytes,
+    )
+
+
+def count_duplicate_rows(profile: DatasetProfile, df) -> int:
+    """
+    The dataset's duplicate row count, counted on first request and kept on
+    the profile. Counting needs its own pass over every row (a DISTINCT scan
+    out-of-core), so profile_dataset leaves it to the callers that show it.
+    """
+    if profile.duplicate_rows is None:
+        profile.duplicate_rows = get_backend(df).duplicate_count()
+    return profile.duplicate_rows
+
+
+def update_profile(profile: DatasetProfile, df: pd.DataFrame, changes: ChangeSet) -> DatasetProfile:
+    """
+    Updates a profile after cleaning, given the cleaned frame and its change set.
+    Only filled columns are re-summarized. Dropped rows are subtracted from the
+    missing counts; numeric columns re-summarize only if the dropped rows held
+    values for them.
+    """
+    n_rows = profile.n_rows - changes.dropped_rows
+    missing_counts = profile.missing_counts.copy()
+
+    stale = set(changes.filled_columns)
+    if changes.dropped_rows:
+        dropped_missing = changes.dropped_missing.reindex(missing_counts.index, fill_value=0)
+        missing_counts -= dropped_missing
+        lost_values = changes.dropped_rows - dropped_missing
+        stale.update(col for col in profile.stats.index if lost_values[col] > 0)
+
+    stats = profile.stats
+    column_types = profile.column_types
+    refreshed = [col for col in df.columns if col in stale]
+    if refreshed:
+        sub_missing, sub_stats, _ = PandasBackend(df[refreshed]).summarize()
+        missing_counts[refreshed] = sub_missing
+        numeric = set(stats.index) | set(sub_stats.index)
+        stats = pd.concat(
+            [stats.drop(index=refreshed, errors="ignore"), sub_stats]
+        ).reindex([col for col in df.columns if col in numeric])
+        column_types = column_types.copy()
+        column_types.loc[refreshed, "Type"] = df[refreshed].dtypes
+
+    if changes.dropped_rows:
+        memory_bytes = int(df.memory_usage(deep=True).sum())
+    else:
+        memory_bytes = profile.memory_bytes + changes.memory_delta
+
+    # Filling can make rows equal, so the count is only known without fills
+    duplicate_rows = None
+    if not changes.filled_columns:
+        if changes.deduplicated:
+            duplicate_rows = 0
+        elif not changes.dropped_rows:
+            duplicate_rows = profile.duplicate_rows
+
+    missing_values = (
+        missing_counts
+        .to_frame("Missing Count")
+        .assign(Percentage=lambda x: (x["Missing Count"] / n_rows) * 100)
+    )
+
+    return DatasetProfile(
+        n_rows=n_rows,
+        n_cols=profile.n_cols,
+        missing_values=missing_values,
+        column_types=column_types,
+        stats=stats,
+        memory_bytes=memory_bytes,
+        duplicate_rows=duplicate_rows,
+    )
+
+
+class _ColumnSketch:
+    """Mergeable per-column state for StreamingProfiler."""
 
-    # Basic numeric stats
-    numeric_df = df.select_dtypes(include="number")
-    stats = numeric_df.describe().T if not numeric_df.empty else pd.DataFrame()
+    def __init__(self, dtype, numeric: bool, missing: int, quantile_k: int, hll_precision: int, top_k: int):
+        self.dtype = dtype
+        self.numeric = numeric
+        self.missing = missing
+        self.distinct = HyperLogLog(hll_precision)
+        self.moments = Moments() if numeric else None
+        self.quantiles = KLLSketch(quantile_k) if numeric else None
+        self.heavy_hitters = None if numeric else MisraGries(top_k)
 
-    # Build profile dictionary
-    profile = {
-        "missing_values": missing_values,
-        "column_types": column_types,
-        "stats": stats
-    }
+    def update(self, series: pd.Series):
+        if self.numeric:
+            if not pd.api.types.is_numeric_dtype(series):
+                # A later chunk parsed as text: unparseable values count as missing
+                series = pd.to_numeric(series, errors="coerce")
+            elif series.dtype != self.dtype:
+                self.dtype = np.result_type(self.dtype, series.dtype)
+            values = series.to_numpy(dtype="float64", na_value=np.nan)
+            nan_mask = np.isnan(values)
+            self.missing += int(nan_mask.sum())
+            values = values[~nan_mask]
+            self.moments.update(values)
+            self.quantiles.update(values)
+            self.distinct.update(pd.Series(values))
+        else:
+            self.missing += int(series.isna().sum())
+            self.distinct.update(series)
+            self.heavy_hitters.update(series)
 
-    return profile
+    def merge(self, other: "_ColumnSketch"):
+        self.missing += other.missing
+        self.distinct.merge(other.distinct)
+        if self.numeric:
+            self.moments.merge(other.moments)
+            self.quantiles.merge(other.quantiles)
+        else:
+            self.heavy_hitters.merge(other.heavy_hitters)
+
+    def describe_row(self) -> list:
+        q1, med, q3 = self.quantiles.quantiles([0.25, 0.5, 0.75])
+        m = self.moments
+        if m.count == 0:
+            return [0.0] + [np.nan] * (len(DESCRIBE_COLUMNS) - 1)
+        return [float(m.count), m.mean, m.std, m.min, q1, med, q3, m.max]
+
+
+class StreamingProfiler:
+    """
+    Builds a profile chunk by chunk in bounded memory.
+    - update(chunk) absorbs new rows, so appended data never forces a rescan
+    - merge(other) combines profilers built over separate chunks or workers
+    Counts, missing values, mean, std, min and max are exact; quartiles
+    (KLL), distinct counts (HyperLogLog) and top values (Misra-Gries) are
+    approximate.
+    """
+
+    def __init__(self, quantile_k: int = 200, hll_precision: int = 14, top_k: int = 20):
+        self.quantile_k = quantile_k
+        self.hll_precision = hll_precision
+        self.top_k = top_k
+        self.n_rows = 0
+        self.columns = {}
+
+    def _new_sketch(self, series: pd.Series, rows_before: int) -> _ColumnSketch:
+        numeric = pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+        return _ColumnSketch(
+            series.dtype, numeric, rows_before,
+            self.quantile_k, self.hll_precision, self.top_k,
+        )
+
+    def update(self, chunk: pd.DataFrame) -> "StreamingProfiler":
+        for col in chunk.columns:
+            if col not in self.columns:
+                # Rows seen before the column first appeared count as missing
+                self.columns[col] = self._new_sketch(chunk[col], self.n_rows)
+            self.columns[col].update(chunk[col])
+        for col, sketch in self.columns.items():
+            if col not in chunk.columns:
+                sketch.missing += len(chunk)
+        self.n_rows += len(chunk)
+        return self
+
+    def merge(self, other: "StreamingProfiler") -> "StreamingProfiler":
+        for col, sketch in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(sketch)
+            else:
+                # A copy, so later updates to this profiler never reach other's sketch
+                sketch = copy.deepcopy(sketch)
+                sketch.missing += self.n_rows
+                self.columns[col] = sketch
+        for col, sketch in self.columns.items():
+            if col not in other.columns:
+                sketch.missing += other.n_rows
+        self.n_rows += other.n_rows
+        return self
+
+    def to_profile(self) -> DatasetProfile:
+        cols = list(self.columns)
+        missing_counts = pd.Series({c: self.columns[c].missing for c in cols}, index=cols, dtype="int64")
+        missing_values = (
+            missing_counts
+            .to_frame("Missing Count")
+            .assign(Percentage=lambda x: (x["Missing Count"] / self.n_rows) * 100)
+        )
+        column_types = pd.Series({c: self.columns[c].dtype for c in cols}, index=cols, dtype=object).to_frame("Type")
+
+        numeric = [c for c in cols if self.columns[c].numeric]
+        if numeric:
+            stats = pd.DataFrame(
+                [self.columns[c].describe_row() for c in numeric],
+                index=numeric, columns=DESCRIBE_COLUMNS, dtype="float64",
+            )
+        else:
+            stats = pd.DataFrame()
+
+        return DatasetProfile(
+            n_rows=self.n_rows,
+            n_cols=len(cols),
+            missing_values=missing_values,
+            column_types=column_types,
+            stats=stats,
+            distinct_counts=pd.Series(
+                {c: round(self.columns[c].distinct.estimate()) for c in cols}, index=cols, dtype="int64"
+            ),
+            top_values={
+                c: self.columns[c].heavy_hitters.top(self.top_k)
+                for c in cols if not self.columns[c].numeric
+            },
+        )
+
+
+def profile_file_streaming(path: str, chunk_rows: int = STREAM_CHUNK_ROWS, profiler: StreamingProfiler = None):
+    """
+    Profiles a CSV or Parquet file chunk by chunk without loading it whole.
+    Passing the profiler returned by an earlier call only reads the rows
+    appended to the file since then.
+    Returns:
+        (DatasetProfile, StreamingProfiler)
+    """
+    start_row = profiler.n_rows if profiler is not None else 0
+    profiler = profiler or StreamingProfiler()
+    for chunk in iter_file_chunks(path, chunk_rows, start_row):
+        profiler.update(chunk)
+    return profiler.to_profile(), profiler
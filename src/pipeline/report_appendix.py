@@ -0,0 +1,161 @@
+# src/pipeline/report_appendix.py
+
+"""
+Optional per-column appendix for the PDF report.
+
+Every column gets one compact page: a mini histogram (numeric) or bar chart
+of its most frequent values, and its statistics from the dataset profile.
+Column charts are rendered APPENDIX_WINDOW columns at a time (in a process
+pool when workers > 1) and only while ReportLab draws the pages, so memory
+holds one window of columns and images however wide the dataset is.
+"""
+
+import gc
+import io
+import os
+from xml.sax.saxutils import escape
+
+import pandas as pd
+from pyarrow import ArrowException
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Flowable, PageBreak, Paragraph, Spacer, Table, TableStyle
+
+from src.pipeline.backend import PandasBackend, get_backend
+from src.pipeline.report_builder import PARALLEL_MIN_ROWS, REPORT_WORKERS
+from src.tools.chart_cache import render_png
+from src.tools.chart_generator import RENDERERS
+from src.tools.shared_frames import SharedFrame, get_worker_pool, map_shared_columns
+
+# Columns rendered ahead of the page being drawn
+APPENDIX_WINDOW = int(os.getenv("EDA_APPENDIX_WINDOW", "16"))
+CHART_WIDTH, CHART_HEIGHT = 450, 200
+
+
+def _chart_type(backend, col):
+    """Mini chart for a column, or None when it has nothing to plot."""
+    dtype = backend.dtypes[col]
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return None
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        return "mini_hist"
+    return "mini_bar"
+
+
+def _render_column(backend, col):
+    chart_type = _chart_type(backend, col)
+    if chart_type is None:
+        return None
+    return render_png(RENDERERS[chart_type](backend, col))
+
+
+def _column_worker(handle, col) -> bytes:
+    """Worker entry point: renders one column's mini chart from shared memory."""
+    import matplotlib
+    matplotlib.use("Agg")
+
+    def render(df):
+        png = _render_column(PandasBackend(df), col)
+        gc.collect()
+        return png
+
+    return map_shared_columns(handle, [col], render)
+
+
+def column_charts(df, columns: list, workers: int = None):
+    """
+    Yields (column, PNG bytes or None) in column order, rendering one window
+    of columns at a time. Only the window's columns are shared with workers.
+    """
+    backend = get_backend(df)
+    workers = REPORT_WORKERS if workers is None else workers
+    parallel = (
+        workers > 1
+        and isinstance(backend, PandasBackend)
+        and backend.shape[0] >= PARALLEL_MIN_ROWS
+    )
+
+    for start in range(0, len(columns), APPENDIX_WINDOW):
+        window = columns[start:start + APPENDIX_WINDOW]
+        pngs = None
+        if parallel:
+            try:
+                with SharedFrame(backend.df[window]) as shared:
+                    pool = get_worker_pool(workers)
+                    futures = [pool.submit(_column_worker, shared.handle, col) for col in window]
+                    pngs = [future.result() for future in futures]
+            except ArrowException:
+                # Mixed-type object columns cannot be shared as Arrow; render in-process
+                pngs = None
+        if pngs is None:
+            pngs = [_render_column(backend, col) for col in window]
+        yield from zip(window, pngs)
+
+
+class _ChartStream:
+    """Hands out column charts in order as pages ask for them."""
+
+    def __init__(self, charts):
+        self._charts = iter(charts)
+
+    def get(self, column):
+        for col, png in self._charts:
+            if col == column:
+                return png
+        return None
+
+
+class _ColumnChart(Flowable):
+    """Fixed-size chart slot; the image is fetched only when the page is drawn."""
+
+    def __init__(self, stream: _ChartStream, column):
+        super().__init__()
+        self.stream = stream
+        self.column = column
+
+    def wrap(self, available_width, available_height):
+        return CHART_WIDTH, CHART_HEIGHT
+
+    def draw(self):
+        png = self.stream.get(self.column)
+        if png is None:
+            self.canv.drawString(0, CHART_HEIGHT / 2, "No chart for this column.")
+        else:
+            self.canv.drawImage(ImageReader(io.BytesIO(png)), 0, 0, CHART_WIDTH, CHART_HEIGHT)
+
+
+def _column_stats(profile, col) -> list:
+    missing = profile.missing_values.loc[col]
+    rows = [
+        ["Type", str(profile.column_types.loc[col, "Type"])],
+        ["Missing", f"{int(missing['Missing Count']):,} ({missing['Percentage']:.1f}%)"],
+    ]
+    if profile.distinct_counts is not None and col in profile.distinct_counts.index:
+        rows.append(["Distinct (approx.)", f"{int(profile.distinct_counts[col]):,}"])
+    if col in profile.stats.index:
+        for name, value in profile.stats.loc[col].items():
+            rows.append([name, f"{value:,.4g}"])
+    return rows
+
+
+def appendix_flowables(df, profile, styles, workers: int = None) -> list:
+    """
+    ReportLab flowables for the appendix: one page per column.
+    Charts are rendered lazily while the pages are drawn, see column_charts.
+    """
+    columns = list(get_backend(df).columns)
+    stream = _ChartStream(column_charts(df, columns, workers))
+    table_style = TableStyle([
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("GRID", (0, 0), (-1, -1), 0.25, "#BBBBBB"),
+        ("BACKGROUND", (0, 0), (0, -1), "#F2F2F2"),
+    ])
+
+    content = [Paragraph("📎 Appendix: Column Details", styles['Heading2']), Spacer(1, 10)]
+    for col in columns:
+        content.append(Paragraph(escape(str(col)), styles['Heading3']))
+        content.append(Spacer(1, 6))
+        content.append(_ColumnChart(stream, col))
+        content.append(Spacer(1, 10))
+        content.append(Table(_column_stats(profile, col), colWidths=[120, 200], style=table_style, hAlign="LEFT"))
+        content.append(PageBreak())
+    return content
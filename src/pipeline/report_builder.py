@@ -1,96 +1,130 @@
 # src/pipeline/report_builder.py
 
+import gc
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-REPORT_CHART_DIR = "src/data/report_charts"
+from src.pipeline.backend import PandasBackend, get_backend
+from src.pipeline.column_scores import sample_profile, score_categorical, score_numeric
+from src.tools.chart_cache import chart_key, get_chart, put_chart, render_png
+from src.tools.chart_generator import RENDERERS, render_chart
+from src.tools.shared_frames import SharedFrame, get_worker_pool, map_shared_columns
+
+# Worker processes for rendering report charts (1 = render in-process)
+REPORT_WORKERS = int(os.getenv("EDA_REPORT_WORKERS", "1"))
+# Smaller datasets render faster than they can be shared with workers
+PARALLEL_MIN_ROWS = 200_000
+# Highest-scoring numeric and categorical columns charted in the report
+REPORT_TOP_COLUMNS = int(os.getenv("EDA_REPORT_TOP_COLUMNS", "3"))
+# The heatmap keeps the best-scoring numeric columns up to this many
+HEATMAP_MAX_COLUMNS = 12
+
+
+def _render_worker(handle, chart_type: str, columns: list) -> bytes:
+    """Worker entry point: renders one chart from the columns it needs in shared memory."""
+    import matplotlib
+    matplotlib.use("Agg")
+
+    def render(df):
+        png = render_png(RENDERERS[chart_type](PandasBackend(df), *columns))
+        # Figures hold reference cycles; free their views on the shared block before it closes
+        gc.collect()
+        return png
+
+    return map_shared_columns(handle, list(dict.fromkeys(columns)), render)
+
+
+def _render_parallel(df, specs: list, workers: int) -> list:
+    """
+    Renders (chart type, columns) specs in a process pool. Only the columns
+    the charts use are copied to shared memory, once; results keep spec order.
+    """
+    used = list(dict.fromkeys(col for _, columns in specs for col in columns))
+    pool = get_worker_pool(workers)
+    with SharedFrame(df[used]) as shared:
+        futures = [pool.submit(_render_worker, shared.handle, chart_type, columns) for chart_type, columns in specs]
+        return [future.result() for future in futures]
+
+
+def generate_report_charts(df, workers: int = None, profile=None, top_n: int = None):
+    """
+    Automatically selects and generates the report charts.
+    Accepts a DataFrame or any DatasetBackend; chart data is aggregated by
+    the backend so only bins, counts and bounded samples reach matplotlib.
+    Columns are ranked by column_scores from the dataset profile (or, if not
+    given, a profile of a bounded row sample), and the top_n (defaults to EDA_REPORT_TOP_COLUMNS)
+    numeric and categorical columns are charted.
+    Charts come from the shared render cache, so the ones already drawn in
+    chat (bar, scatter, heatmap) are reused. Charts that still need drawing
+    are rendered in a process pool when workers > 1 (defaults to
+    EDA_REPORT_WORKERS) and the in-memory dataset is large enough.
+    Returns:
+        (list of PNG bytes, list of captions)
+    """
+    backend = get_backend(df)
+    workers = REPORT_WORKERS if workers is None else workers
+    top_n = REPORT_TOP_COLUMNS if top_n is None else top_n
+    profile = sample_profile(backend) if profile is None else profile
+
+    numeric_cols = backend.numeric_columns()
+    date_cols = backend.datetime_columns()
+    numeric_scores = score_numeric(backend, profile)
+    cat_scores = score_categorical(backend, profile, backend.categorical_columns())
+    top_numeric = numeric_scores.index[:top_n].tolist()
+    top_cat = cat_scores.index[cat_scores["score"] > 0][:top_n].tolist()
+
+    # (chart type, columns, caption)
+    specs = []
+
+    # 1️⃣ Histograms of the highest-scoring numeric columns
+    for col in top_numeric:
+        specs.append(("hist_kde", [col], f"Histogram of {col} — distribution of values."))
 
-# Ensure chart directory exists
-os.makedirs(REPORT_CHART_DIR, exist_ok=True)
-
-
-def _save_chart(fig, filename: str) -> str:
-    """Save chart to disk and return its filepath."""
-    path = os.path.join(REPORT_CHART_DIR, filename)
-    fig.savefig(path, bbox_inches="tight")
-    plt.close(fig)
-    return path
-
-
-def _get_numeric_cols(df):
-    return df.select_dtypes(include=["int64", "float64"]).columns.tolist()
-
-
-def _get_cat_cols(df):
-    return df.select_dtypes(include=["object"]).columns.tolist()
-
-
-def _get_date_cols(df):
-    return df.select_dtypes(include=["datetime64[ns]"]).columns.tolist()
-
-
-def generate_report_charts(df):
-    """Automatically selects and generates up to 6 charts."""
-
-    numeric_cols = _get_numeric_cols(df)
-    cat_cols = _get_cat_cols(df)
-    date_cols = _get_date_cols(df)
-
-    chart_paths = []
-    captions = []
+    # 2️⃣ Boxplot
+    if top_numeric:
+        col = top_numeric[0]
+        specs.append(("box", [col], f"Boxplot of {col} — outlier detection."))
 
-    # 1️⃣ Histogram
-    if numeric_cols:
-        col = numeric_cols[0]
-        fig = plt.figure()
-        sns.histplot(df[col], kde=True)
-        plt.title(f"Distribution of {col}")
-        chart_paths.append(_save_chart(fig, "histogram.png"))
-        captions.append(f"Histogram of {col} — distribution of values.")
+    # 3️⃣ Bar charts for the highest-scoring categorical columns
+    for col in top_cat:
+        specs.append(("bar", [col], f"Distribution of {col} — frequency counts."))
 
-    # 2️⃣ Boxplot
-    if numeric_cols:
-        col = numeric_cols[0]
-        fig = plt.figure()
-        sns.boxplot(x=df[col])
-        plt.title(f"Boxplot of {col}")
-        chart_paths.append(_save_chart(fig, "boxplot.png"))
-        captions.append(f"Boxplot of {col} — outlier detection.")
-
-    # 3️⃣ Bar chart for categorical
-    if cat_cols:
-        col = cat_cols[0]
-        fig = plt.figure()
-        df[col].value_counts().plot(kind="bar")
-        plt.title(f"Distribution of {col}")
-        chart_paths.append(_save_chart(fig, "bar_chart.png"))
-        captions.append(f"Distribution of {col} — frequency counts.")
-
-    # 4️⃣ Scatter plot
-    if len(numeric_cols) >= 2:
-        fig = plt.figure()
-        sns.scatterplot(x=df[numeric_cols[0]], y=df[numeric_cols[1]])
-        plt.title(f"{numeric_cols[0]} vs {numeric_cols[1]}")
-        chart_paths.append(_save_chart(fig, "scatter.png"))
-        captions.append("Scatter plot — correlation between numeric values.")
+    # 4️⃣ Scatter plot of the most strongly correlated pair
+    if len(numeric_scores) >= 2:
+        col = numeric_scores["correlation"].idxmax()
+        pair = [c for c in numeric_cols if c in (col, numeric_scores.loc[col, "partner"])]
+        specs.append(("scatter", pair, f"Scatter plot — {pair[0]} vs {pair[1]}, the most correlated pair."))
 
     # 5️⃣ Line chart (trend)
-    if date_cols and numeric_cols:
-        fig = plt.figure()
-        sns.lineplot(x=df[date_cols[0]], y=df[numeric_cols[0]])
-        plt.title(f"Trend of {numeric_cols[0]} over time")
-        chart_paths.append(_save_chart(fig, "line.png"))
-        captions.append("Line chart — numeric trend over dates.")
+    if date_cols and top_numeric:
+        specs.append(("trend", [date_cols[0], top_numeric[0]], "Line chart — numeric trend over dates."))
 
     # 6️⃣ Correlation Heatmap
-    if len(numeric_cols) >= 2:
-        corr = df[numeric_cols].corr()
-        fig = plt.figure(figsize=(6, 5))
-        sns.heatmap(corr, annot=True, cmap="coolwarm")
-        plt.title("Correlation Heatmap")
-        chart_paths.append(_save_chart(fig, "heatmap.png"))
-        captions.append("Heatmap — strength of numeric relationships.")
-
-    return chart_paths, captions
+    if len(numeric_scores) >= 2:
+        best = set(numeric_scores.index[:HEATMAP_MAX_COLUMNS])
+        specs.append((
+            "heatmap", [col for col in numeric_cols if col in best], "Heatmap — strength of numeric relationships."
+        ))
+
+    captions = [caption for _, _, caption in specs]
+
+    fingerprint = backend.fingerprint()
+    keys = [chart_key(fingerprint, columns, chart_type) for chart_type, columns, _ in specs]
+    charts = [get_chart(key) for key in keys]
+    pending = [i for i, png in enumerate(charts) if png is None]
+
+    if (
+        len(pending) > 1
+        and workers > 1
+        and isinstance(backend, PandasBackend)
+        and backend.shape[0] >= PARALLEL_MIN_ROWS
+    ):
+        rendered = _render_parallel(backend.df, [specs[i][:2] for i in pending], workers)
+        for i, png in zip(pending, rendered):
+            put_chart(keys[i], png)
+            charts[i] = png
+    else:
+        for i in pending:
+            chart_type, columns, _ = specs[i]
+            charts[i] = render_chart(backend, chart_type, columns)
+
+    return charts, captions
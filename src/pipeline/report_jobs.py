@@ -0,0 +1,199 @@
+# src/pipeline/report_jobs.py
+
+"""
+Background report generation.
+
+Report jobs run on a small thread pool outside the Streamlit script run, so
+the report tab stays responsive while the LLM, the charts and ReportLab work.
+Jobs live in an in-memory table:
+- each job records its current stage and progress
+- submitting a job identical to one still queued or running (same dataset,
+  same prompt) joins that job instead of starting a duplicate
+- cancellation is cooperative: a job stops at its next stage boundary once
+  every session waiting on it has cancelled, so a cancel during the last
+  stage still ends with the job done
+- finished jobs, and the PDFs they hold, are dropped after REPORT_JOB_TTL_S
+A report already in the report store is served without running the stages,
+unless the request asks for fresh insights.
+"""
+
+import hashlib
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from src.pipeline.backend import get_backend
+
+REPORT_JOB_WORKERS = int(os.getenv("EDA_REPORT_JOB_WORKERS", "2"))
+REPORT_JOB_TTL_S = float(os.getenv("EDA_REPORT_JOB_TTL_S", "3600"))
+STAGES = ["Writing insights", "Rendering charts", "Building PDF"]
+
+_lock = threading.Lock()
+_jobs = {}
+_executor = None
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it reaches a stage boundary after cancellation."""
+
+
+@dataclass
+class ReportJob:
+    """
+    One report generation run.
+    - status: queued, running, done, failed or cancelled
+    - result: the PDF bytes once done
+    - from_store: the PDF was a stored report for the same data and prompt
+    - subscribers: ids of the sessions waiting on the job
+    """
+    job_id: str
+    key: str
+    status: str = "queued"
+    stage: str = None
+    progress: float = 0.0
+    result: bytes = None
+    error: str = None
+    created: float = field(default_factory=time.time)
+    finished: float = None
+    subscribers: set = field(default_factory=set)
+    from_store: bool = False
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    _future: Future = field(default=None, repr=False)
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    @property
+    def cancelling(self) -> bool:
+        """Cancelled, but still running until its next stage boundary."""
+        return self.active and self._cancel.is_set()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=REPORT_JOB_WORKERS, thread_name_prefix="report-job")
+    return _executor
+
+
+def report_prompt(df, profile) -> str:
+    """The LLM prompt asking for the report's insights."""
+    return (
+        "Provide 4-6 key insights about this dataset:\n"
+        f"Columns: {list(df.columns)}\n"
+        f"Missing Values: {profile.missing_counts.to_dict()}\n"
+        f"Statistics: {profile.stats.to_string()}"
+    )
+
+
+def _write_insights(prompt: str) -> str:
+    from src.agents.llm_client import get_llm
+    return get_llm().invoke(prompt).content
+
+
+def _enter_stage(job: ReportJob, index: int):
+    if job._cancel.is_set():
+        raise JobCancelled()
+    job.stage = STAGES[index]
+    job.progress = index / len(STAGES)
+
+
+def _run(job: ReportJob, backend, prompt: str, profile, appendix: bool, regenerate: bool):
+    from src.pipeline.pdf_report import generate_pdf_report, report_fingerprint
+    from src.pipeline.report_builder import generate_report_charts
+    from src.pipeline.report_store import load_latest_report, load_report
+
+    job.status = "running"
+    try:
+        _enter_stage(job, 0)
+        fingerprint = report_fingerprint(backend, appendix)
+        # Same dataset and prompt as a stored report: serve it without the LLM
+        stored = None if regenerate else load_latest_report(fingerprint, prompt)
+        if stored is not None:
+            job.result = stored[1]
+            job.from_store = True
+        else:
+            insights = _write_insights(prompt)
+            charts = None
+            if load_report(fingerprint, insights) is None:
+                _enter_stage(job, 1)
+                charts = generate_report_charts(backend, profile=profile)
+            _enter_stage(job, 2)
+            job.result = generate_pdf_report(backend, insights, charts, prompt, profile, appendix)
+        job.progress = 1.0
+        job.status = "done"
+    except JobCancelled:
+        job.status = "cancelled"
+    except Exception as exc:
+        job.error = str(exc)
+        job.status = "failed"
+    finally:
+        job.finished = time.time()
+
+
+def _prune():
+    cutoff = time.time() - REPORT_JOB_TTL_S
+    for job_id in [j for j, job in _jobs.items() if job.finished is not None and job.finished < cutoff]:
+        del _jobs[job_id]
+
+
+def submit_report(df, profile, appendix: bool = False, regenerate: bool = False, session_id: str = None) -> ReportJob:
+    """
+    Queues a report for a DataFrame or backend and its profile, or joins an
+    identical job that is still queued or running.
+    appendix: add the per-column appendix to the report.
+    regenerate: ask the LLM for fresh insights even if a report for the same
+    data and prompt is stored.
+    session_id: the requesting session; a session joins a job at most once.
+    Without one, every call counts as a separate session.
+    """
+    session_id = session_id or uuid.uuid4().hex
+    backend = get_backend(df)
+    prompt = report_prompt(backend, profile)
+    key = hashlib.blake2b(f"{backend.fingerprint()}|{appendix}|{regenerate}|{prompt}".encode(), digest_size=16).hexdigest()
+
+    with _lock:
+        _prune()
+        for job in _jobs.values():
+            if job.key == key and job.active and not job._cancel.is_set():
+                job.subscribers.add(session_id)
+                return job
+        job = ReportJob(uuid.uuid4().hex, key, subscribers={session_id})
+        _jobs[job.job_id] = job
+        job._future = _get_executor().submit(_run, job, backend, prompt, profile, appendix, regenerate)
+    return job
+
+
+def get_job(job_id: str):
+    """The job with this id, or None once it has expired."""
+    with _lock:
+        return _jobs.get(job_id)
+
+
+def cancel_job(job_id: str, session_id: str):
+    """
+    Withdraws a session from a job; the job is cancelled once no session is
+    waiting on it. A running job only stops at its next stage boundary and
+    finishes as done if it is already past the last one, so callers should
+    follow the returned job's status (see ReportJob.cancelling) rather than
+    assume it was cancelled.
+    Returns:
+        the job, or None once it has expired
+    """
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None or not job.active:
+            return job
+        job.subscribers.discard(session_id)
+        if job.subscribers:
+            return job
+        job._cancel.set()
+        if job._future.cancel():
+            # Never started
+            job.status = "cancelled"
+            job.finished = time.time()
+    return job
@@ -0,0 +1,127 @@
+# src/pipeline/report_store.py
+
+"""
+Persistent report store.
+
+Finished PDF reports are kept in a local SQLite database keyed by dataset
+fingerprint, a hash of the insight text and the report template version,
+so regenerating a report that has not changed returns the stored PDF.
+Each report also records the hash of the prompt its insights came from;
+a repeat request for the same dataset and prompt can then skip the LLM
+(unless fresh insights are asked for).
+Entries are evicted least recently used first beyond a total size budget.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+from src.pipeline import sqlite_lru
+
+REPORT_STORE_PATH = "src/data/cache/reports.sqlite"
+REPORT_STORE_MAX_MB = float(os.getenv("EDA_REPORT_STORE_MAX_MB", "256"))
+# Bump when the report layout changes so stored PDFs are not served stale
+REPORT_TEMPLATE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    fingerprint TEXT NOT NULL,
+    insights_hash TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    prompt_hash TEXT,
+    insights TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (fingerprint, insights_hash, version)
+)
+"""
+
+
+def _connect() -> sqlite3.Connection:
+    return sqlite_lru.connect(REPORT_STORE_PATH, _SCHEMA)
+
+
+def _text_hash(text) -> str:
+    if not isinstance(text, str):
+        text = "\n".join(text)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def load_report(fingerprint: str, insights):
+    """Returns the stored PDF for a dataset and insight text, or None."""
+    key = (fingerprint, _text_hash(insights), REPORT_TEMPLATE_VERSION)
+    try:
+        with _connect() as con:
+            row = con.execute(
+                "SELECT payload FROM reports WHERE fingerprint = ? AND insights_hash = ? AND version = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            con.execute(
+                "UPDATE reports SET accessed = ? WHERE fingerprint = ? AND insights_hash = ? AND version = ?",
+                (time.time(), *key),
+            )
+        return bytes(row[0])
+    except sqlite3.Error:
+        # A broken store must never block reporting
+        return None
+
+
+def load_latest_report(fingerprint: str, prompt: str):
+    """
+    The most recent report built for this dataset from the same prompt.
+    Returns:
+        (insight text, PDF bytes), or None
+    """
+    try:
+        with _connect() as con:
+            row = con.execute(
+                "SELECT insights_hash, insights, payload FROM reports "
+                "WHERE fingerprint = ? AND prompt_hash = ? AND version = ? ORDER BY created DESC LIMIT 1",
+                (fingerprint, _text_hash(prompt), REPORT_TEMPLATE_VERSION),
+            ).fetchone()
+            if row is None:
+                return None
+            con.execute(
+                "UPDATE reports SET accessed = ? WHERE fingerprint = ? AND insights_hash = ? AND version = ?",
+                (time.time(), fingerprint, row[0], REPORT_TEMPLATE_VERSION),
+            )
+        return row[1], bytes(row[2])
+    except sqlite3.Error:
+        return None
+
+
+def save_report(fingerprint: str, insights, pdf: bytes, prompt: str = None):
+    """Stores a PDF under its dataset and insight text, then applies eviction."""
+    if not isinstance(insights, str):
+        insights = "\n".join(insights)
+    now = time.time()
+    try:
+        with _connect() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    fingerprint, _text_hash(insights), REPORT_TEMPLATE_VERSION,
+                    _text_hash(prompt) if prompt is not None else None,
+                    insights, pdf, len(pdf), now, now,
+                ),
+            )
+            _evict(con)
+    except sqlite3.Error:
+        pass
+
+
+def _evict(con: sqlite3.Connection):
+    sqlite_lru.evict(con, "reports", REPORT_TEMPLATE_VERSION, REPORT_STORE_MAX_MB)
+
+
+def evict_reports():
+    """Applies size eviction without storing anything."""
+    try:
+        with _connect() as con:
+            _evict(con)
+    except sqlite3.Error:
+        pass
@@ -0,0 +1,195 @@
+# src/pipeline/sketches.py
+
+"""
+Mergeable summaries for streaming profiles.
+
+Each sketch absorbs data a chunk at a time in bounded memory and can be
+merged with a sketch built from other chunks (or another worker):
+- Moments: count / mean / variance / min / max (Welford, Chan et al. merge), exact
+- KLLSketch: approximate quantiles
+- HyperLogLog: approximate distinct counts
+- MisraGries: heavy hitters (top-k values with bounded undercount)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class Moments:
+    """Exact count, mean, variance, min and max; merges without loss."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _combine(self, count, mean, m2, lo, hi):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, lo)
+        self.max = max(self.max, hi)
+
+    def update(self, values: np.ndarray):
+        """Absorbs a float64 array that contains no NaNs."""
+        if len(values) == 0:
+            return
+        mean = values.mean()
+        centered = values - mean
+        self._combine(len(values), mean, float(centered @ centered), values.min(), values.max())
+
+    def merge(self, other: "Moments"):
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch. Items at level h stand for 2**h original values;
+    a full level is sorted and every other item is promoted, so memory stays
+    around 3k items however many values are absorbed.
+    """
+
+    def __init__(self, k: int = 200, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind so weights remain exact
+                keep, items = (items[-1:], items[:-1]) if len(items) % 2 else (items[:0], items)
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values: np.ndarray):
+        """Absorbs a float64 array that contains no NaNs."""
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantiles(self, qs) -> list:
+        if self.n == 0:
+            return [np.nan for _ in qs]
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lv), 2 ** h, dtype="float64") for h, lv in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cum = items[order], np.cumsum(weights[order])
+        positions = np.searchsorted(cum, np.asarray(qs) * cum[-1], side="left")
+        return items[np.minimum(positions, len(items) - 1)].tolist()
+
+
+class HyperLogLog:
+    """Distinct-count estimator over 64-bit hashes; 2**p one-byte registers."""
+
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    @staticmethod
+    def hash_values(series: pd.Series) -> np.ndarray:
+        """Hashes non-null values; numerics are hashed as float64 so 1 and 1.0 agree."""
+        values = series.dropna()
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            values = values.astype("float64")
+        return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+    def update_hashes(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+        shift = np.uint64(64 - self.p)
+        index = (hashes >> shift).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # frexp's exponent is the bit length; rest < 2**53 converts to float exactly
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (64 - self.p - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def update(self, series: pd.Series):
+        self.update_hashes(self.hash_values(series))
+
+    def merge(self, other: "HyperLogLog"):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction: linear counting
+            estimate = m * np.log(m / zeros)
+        return float(estimate)
+
+
+class MisraGries:
+    """
+    Heavy hitters with at most k counters. Each reported count undercounts
+    the true count by at most n / (k + 1).
+    """
+
+    def __init__(self, k: int = 64):
+        self.k = k
+        self.n = 0
+        self.counts = pd.Series(dtype="int64")
+
+    def _absorb(self, counts: pd.Series):
+        combined = self.counts.add(counts, fill_value=0)
+        if len(combined) > self.k:
+            threshold = combined.nlargest(self.k + 1).iloc[-1]
+            combined = combined - threshold
+            combined = combined[combined > 0]
+        self.counts = combined.astype("int64")
+
+    def update(self, series: pd.Series):
+        counts = series.value_counts(dropna=True)
+        counts.index = counts.index.astype(object)
+        self.n += int(counts.sum())
+        self._absorb(counts)
+
+    def merge(self, other: "MisraGries"):
+        self.n += other.n
+        self._absorb(other.counts)
+        return self
+
+    def top(self, n: int = 10) -> pd.Series:
+        return self.counts.nlargest(n)
@@ -0,0 +1,45 @@
+# src/pipeline/sqlite_lru.py
+
+"""
+Shared plumbing for the SQLite-backed stores (profiles, reports).
+
+Each store keeps one table of versioned payloads with `version`, `size` and
+`accessed` columns. Stores differ in their keys and payloads; opening the
+database and evicting from it work the same for all of them.
+"""
+
+import os
+import sqlite3
+import time
+
+
+def connect(path: str, schema: str) -> sqlite3.Connection:
+    """Opens a store database in WAL mode, creating it and its table if needed."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    con = sqlite3.connect(path, timeout=10)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute(schema)
+    return con
+
+
+def evict(con: sqlite3.Connection, table: str, version: int, max_mb: float, max_age_days: float = None):
+    """
+    Evicts from a store table:
+    - rows written by another version, which can never be served again
+    - rows not accessed within max_age_days, when given
+    - least recently accessed rows until the payloads fit max_mb
+    """
+    con.execute(f"DELETE FROM {table} WHERE version != ?", (version,))
+    if max_age_days is not None:
+        con.execute(f"DELETE FROM {table} WHERE accessed < ?", (time.time() - max_age_days * 86400,))
+
+    budget = max_mb * 1024 * 1024
+    total = con.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+    if total <= budget:
+        return
+    # Least recently accessed first
+    for rowid, size in con.execute(f"SELECT rowid, size FROM {table} ORDER BY accessed ASC").fetchall():
+        if total <= budget:
+            break
+        con.execute(f"DELETE FROM {table} WHERE rowid = ?", (rowid,))
+        total -= size
@@ -0,0 +1,117 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import numpy as np
+import pandas as pd
+from src.pipeline import backend as backend_module
+from src.pipeline.backend import DuckDBBackend, PandasBackend
+from src.pipeline.cleaner import apply_imputation, suggest_imputation
+from src.pipeline.profiler import profile_dataset
+
+
+def _frame():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "Sales": rng.normal(100, 15, 500).round(2),
+        "Units": rng.integers(1, 20, 500).astype("float64"),
+        "Region": rng.choice(["West", "East", "North"], 500),
+    })
+    df.loc[::7, "Sales"] = np.nan
+    df.loc[::11, "Region"] = None
+    return df
+
+
+def _backends(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend_module, "OUT_OF_CORE_DIR", str(tmp_path / "ooc"))
+    df = _frame()
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+    return PandasBackend(df), DuckDBBackend(str(path))
+
+
+def test_duckdb_profile_matches_pandas(tmp_path, monkeypatch):
+    pandas_backend, duck = _backends(tmp_path, monkeypatch)
+
+    assert duck.shape == pandas_backend.shape
+    pd.testing.assert_series_equal(duck.missing_counts(), pandas_backend.missing_counts(), check_names=False)
+
+    expected = pandas_backend.describe()
+    actual = duck.describe()
+    for col in ["count", "mean", "std", "min", "max"]:
+        np.testing.assert_allclose(actual[col], expected[col], rtol=1e-9)
+    np.testing.assert_allclose(actual["50%"], expected["50%"], rtol=0.05)
+
+    profile = profile_dataset(duck)
+    assert profile["missing_values"].loc["Sales", "Missing Count"] == 72
+    assert suggest_imputation(duck) == {"Sales": "Median", "Region": "Most Frequent"}
+
+
+def test_duckdb_histogram_and_counts_match_pandas(tmp_path, monkeypatch):
+    pandas_backend, duck = _backends(tmp_path, monkeypatch)
+
+    counts, edges = duck.histogram("Units", bins=10)
+    expected_counts, expected_edges = pandas_backend.histogram("Units", bins=10)
+    np.testing.assert_allclose(edges, expected_edges)
+    assert counts.sum() == expected_counts.sum()
+
+    assert duck.value_counts("Region").to_dict() == pandas_backend.value_counts("Region").to_dict()
+
+
+def test_duckdb_imputation_writes_cleaned_parquet(tmp_path, monkeypatch):
+    _, duck = _backends(tmp_path, monkeypatch)
+
+    cleaned = apply_imputation(duck, {"Sales": "Mean", "Region": "Drop"})
+
+    assert isinstance(cleaned, DuckDBBackend)
+    assert cleaned.path.endswith(".parquet")
+    missing = cleaned.missing_counts()
+    assert missing["Sales"] == 0 and missing["Region"] == 0
+    assert cleaned.shape[0] == 500 - len(range(0, 500, 11))
+
+
+def test_duckdb_imputation_output_is_keyed_by_source(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend_module, "OUT_OF_CORE_DIR", str(tmp_path / "ooc"))
+    plan = {"a": "Drop"}
+    outputs = []
+    for folder, values in (("a", "1,\n,\n3"), ("c", "7\n8\n9")):
+        os.makedirs(tmp_path / folder)
+        path = tmp_path / folder / "data.csv"
+        path.write_text(f"a\n{values}\n")
+        outputs.append(apply_imputation(DuckDBBackend(str(path)), plan))
+
+    assert outputs[0].path != outputs[1].path
+    assert outputs[1].con.execute("SELECT a FROM dataset").fetchall() == [(7,), (8,), (9,)]
+
+
+def test_duckdb_imputation_fills_date_and_time_columns(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend_module, "OUT_OF_CORE_DIR", str(tmp_path / "ooc"))
+    df = pd.DataFrame({
+        "t": pd.to_datetime(["2020-01-01 08:30", None, "2020-01-01 08:30", "2021-05-05 00:00"]),
+        "d": pd.to_datetime(["2020-01-01", "2020-01-01", None, "2021-01-01"]).date,
+        "price": [1.5, None, 1.5, 2.0],
+    })
+    path = tmp_path / "dates.parquet"
+    df.to_parquet(path, index=False)
+
+    cleaned = apply_imputation(DuckDBBackend(str(path)), {"t": "Most Frequent", "d": "Most Frequent", "price": "Mean"})
+
+    out = cleaned.con.execute("SELECT * FROM dataset").df()
+    assert out["t"].tolist()[1] == pd.Timestamp("2020-01-01 08:30")
+    assert pd.Timestamp(out["d"].tolist()[2]) == pd.Timestamp("2020-01-01")
+    assert out["price"].isna().sum() == 0
+
+
+def test_out_of_core_files_are_evicted_least_recently_used_first(tmp_path, monkeypatch):
+    ooc = tmp_path / "ooc"
+    monkeypatch.setattr(backend_module, "OUT_OF_CORE_DIR", str(ooc))
+    path = tmp_path / "data.csv"
+    _frame().to_csv(path, index=False)
+    duck = DuckDBBackend(str(path))
+
+    first = apply_imputation(duck, {"Sales": "Mean"})
+    # Room for about one cleaned file
+    monkeypatch.setattr(backend_module, "OUT_OF_CORE_MAX_MB", 1.5 * os.path.getsize(first.path) / 1024 / 1024)
+    second = apply_imputation(duck, {"Sales": "Median"})
+
+    assert not os.path.exists(first.path) and os.path.exists(second.path)
+    assert os.path.exists(path)
@@ -0,0 +1,208 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import numpy as np
+import pandas as pd
+from src.pipeline.cleaner import CleaningPlan, apply_imputation, apply_imputation_with_changes
+
+
+def _frame():
+    rng = np.random.default_rng(6)
+    df = pd.DataFrame({
+        "age": rng.normal(40, 12, 400),
+        "income": rng.normal(5e4, 1e4, 400),
+        "city": rng.choice(["Pune", "Delhi", "Goa"], 400, p=[0.5, 0.3, 0.2]),
+        "untouched": rng.normal(size=400),
+    })
+    df.loc[::5, "age"] = np.nan
+    df.loc[::7, "income"] = np.nan
+    df.loc[::11, "city"] = None
+    return df
+
+
+def test_batched_fills_match_per_column_fills():
+    df = _frame()
+    cleaned = apply_imputation(df, {"age": "Median", "income": "Mean", "city": "Most Frequent"})
+
+    assert cleaned["age"].equals(df["age"].fillna(df["age"].median()))
+    assert cleaned["income"].equals(df["income"].fillna(df["income"].mean()))
+    assert cleaned["city"].equals(df["city"].fillna(df["city"].mode()[0]))
+    # Untouched columns are shared with the input rather than copied
+    assert np.shares_memory(cleaned["untouched"].to_numpy(), df["untouched"].to_numpy())
+    assert df["age"].isna().sum() == 80
+
+
+def test_drops_apply_before_fill_values():
+    df = _frame()
+    cleaned, changes = apply_imputation_with_changes(df, {"age": "Median", "city": "Drop", "income": "Drop"})
+
+    kept = df.dropna(subset=["city", "income"])
+    assert changes.dropped_rows == len(df) - len(kept)
+    assert changes.filled_columns == ["age"]
+    assert cleaned["age"].equals(kept["age"].fillna(kept["age"].median()))
+    assert cleaned.isna().sum().sum() == 0
+
+
+def test_plan_round_trips_and_streams_over_files(tmp_path):
+    from src.pipeline.cleaner import CleaningPlan
+
+    df = _frame()
+    df["count"] = np.arange(len(df))
+    df.loc[::13, "count"] = np.nan
+    src = tmp_path / "daily.csv"
+    df.to_csv(src, index=False)
+
+    strategies = {"age": "Median", "income": "Mean", "city": "Most Frequent", "count": "Drop"}
+    plan = CleaningPlan.from_json(CleaningPlan.fit(df, strategies).to_json())
+    expected = apply_imputation(df, strategies).reset_index(drop=True)
+
+    for name in ("clean.parquet", "clean.csv"):
+        out = tmp_path / name
+        rows = plan.transform_file(str(src), str(out), chunk_rows=70)
+        result = pd.read_parquet(out) if name.endswith(".parquet") else pd.read_csv(out)
+        assert rows == len(expected)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+
+def test_streamed_csv_promotes_columns_empty_in_the_first_chunk(tmp_path):
+    from src.pipeline.cleaner import CleaningPlan
+
+    src = tmp_path / "late.csv"
+    src.write_text("id,note,score\n" + "".join(f"{i},,{i}\n" for i in range(10)) + "10,hi,2.5\n")
+    out = tmp_path / "late.parquet"
+
+    rows = CleaningPlan({}, {}).transform_file(str(src), str(out), chunk_rows=4)
+
+    result = pd.read_parquet(out)
+    assert rows == 11 and result["note"].isna().sum() == 10 and result["note"].iloc[-1] == "hi"
+    assert result["score"].tolist() == [*range(10), 2.5]
+
+
+def test_failed_streaming_leaves_no_temp_file(tmp_path, monkeypatch):
+    import pytest
+    from src.pipeline import cleaner
+    from src.pipeline.cleaner import CleaningPlan
+
+    src = tmp_path / "data.csv"
+    _frame().to_csv(src, index=False)
+
+    transform = cleaner.CleaningPlan.transform
+    calls = []
+
+    def broken(self, chunk, duplicates=None):
+        # Fails once the first chunk is on disk
+        calls.append(len(chunk))
+        if len(calls) % 2 == 0:
+            raise RuntimeError("disk full")
+        return transform(self, chunk, duplicates)
+
+    monkeypatch.setattr(cleaner.CleaningPlan, "transform", broken)
+    for name in ("out.parquet", "out.csv"):
+        with pytest.raises(RuntimeError):
+            CleaningPlan({}, {}).transform_file(str(src), str(tmp_path / name), chunk_rows=50)
+    assert sorted(os.listdir(tmp_path)) == ["data.csv"]
+
+
+def test_streaming_an_empty_file_writes_an_empty_file(tmp_path):
+    from src.pipeline.cleaner import CleaningPlan
+
+    src = tmp_path / "empty.parquet"
+    pd.DataFrame({"a": pd.Series([], dtype="int64"), "b": pd.Series([], dtype="str")}).to_parquet(src, index=False)
+    plan = CleaningPlan({"a": "Mean"}, {"a": 1.5})
+
+    for name in ("out.parquet", "out.csv"):
+        out = tmp_path / name
+        assert plan.transform_file(str(src), str(out)) == 0
+        result = pd.read_parquet(out) if name.endswith(".parquet") else pd.read_csv(out)
+        assert result.empty and list(result.columns) == ["a", "b"]
+
+
+def test_chunked_dedup_matches_duplicated(tmp_path, monkeypatch):
+    from src.pipeline import backend as backend_module
+    from src.pipeline.backend import DuckDBBackend
+    from src.pipeline.cleaner import duplicate_mask
+    from src.pipeline.profiler import count_duplicate_rows, profile_dataset
+
+    rng = np.random.default_rng(9)
+    df = pd.DataFrame({
+        "user": rng.integers(0, 50, 3000),
+        "event": rng.choice(["view", "click", None], 3000),
+        "value": rng.integers(0, 3, 3000).astype("float64"),
+    })
+    df.loc[::10, "value"] = np.nan
+
+    for subset in (None, ["user", "event"]):
+        expected = df.duplicated(subset=subset).to_numpy()
+        np.testing.assert_array_equal(duplicate_mask(df, subset, chunk_rows=250), expected)
+
+    profile = profile_dataset(df)
+    assert profile.duplicate_rows is None
+    assert count_duplicate_rows(profile, df) == int(df.duplicated().sum()) == profile.duplicate_rows
+
+    cleaned, changes = apply_imputation_with_changes(df, {"value": "Mean"}, dedup=["user", "event"])
+    kept = df.drop_duplicates(subset=["user", "event"])
+    assert changes.dropped_rows == len(df) - len(kept)
+    assert cleaned["value"].equals(kept["value"].fillna(kept["value"].mean()))
+
+    monkeypatch.setattr(backend_module, "OUT_OF_CORE_DIR", str(tmp_path / "ooc"))
+    path = tmp_path / "events.parquet"
+    df.to_parquet(path, index=False)
+    duck = DuckDBBackend(str(path))
+    assert duck.duplicate_count() == int(df.duplicated().sum())
+    deduped = apply_imputation(duck, {"value": "Mean"}, dedup=["user", "event"])
+    pd.testing.assert_frame_equal(
+        deduped.head(len(df)), cleaned.reset_index(drop=True), check_dtype=False
+    )
+
+    # Streaming a file catches duplicates that sit in different chunks
+    from src.pipeline.cleaner import CleaningPlan
+    plan = CleaningPlan.fit(df, {"value": "Mean"}, dedup=["user", "event"])
+    plan.transform_file(str(path), str(tmp_path / "events.clean.parquet"), chunk_rows=250)
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(tmp_path / "events.clean.parquet"), cleaned.reset_index(drop=True), check_dtype=False
+    )
+
+
+def test_model_imputation_beats_median_and_falls_back():
+    from src.pipeline.model_imputation import impute_with_models
+
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=3000)
+    df = pd.DataFrame({"x": x, "y": 2 * x + rng.normal(scale=0.1, size=3000), "city": rng.choice(["a", "b"], 3000)})
+    truth = df["y"].copy()
+    df.loc[::4, "y"] = np.nan
+    df.loc[::9, "city"] = None
+    holes = df["y"].isna()
+
+    for method in ["KNN", "Iterative"]:
+        cleaned, changes = apply_imputation_with_changes(df, {"y": method, "city": method})
+        assert cleaned["y"].notna().all() and cleaned["city"].notna().all()
+        assert changes.fallback_columns == ["city"]
+        median_error = (truth[holes] - df["y"].median()).abs().mean()
+        assert (truth[holes] - cleaned.loc[holes, "y"]).abs().mean() < median_error / 5
+
+    # No time budget: every column falls back and nothing is imputed by a model
+    untouched, fallbacks = impute_with_models(df, {"y": "KNN"}, time_limit=0)
+    assert fallbacks == ["y"] and untouched["y"].isna().sum() == holes.sum()
+
+    # Empty frames have nothing to fit a model on, nor anything to impute
+    for method in ["KNN", "Iterative"]:
+        empty, fallbacks = impute_with_models(df.iloc[:0], {"y": method})
+        assert empty.empty and fallbacks == []
+    assert CleaningPlan.fit(df, {"y": "KNN", "x": "Median"}).model_columns == ["y"]
+
+
+def test_duplicate_filter_spills_beyond_its_memory_budget():
+    from src.pipeline.cleaner import DuplicateFilter
+
+    rng = np.random.default_rng(11)
+    df = pd.DataFrame({"a": rng.integers(0, 20_000, 40_000), "b": rng.integers(0, 3, 40_000)})
+    dedup = DuplicateFilter(max_bytes=64 * 1024)
+    mask = np.concatenate([dedup.mask(df.iloc[start:start + 1_000]) for start in range(0, len(df), 1_000)])
+
+    np.testing.assert_array_equal(mask, df.duplicated().to_numpy())
+    assert dedup._spilled and dedup.memory_bytes <= 64 * 1024
+    spill_dir = dedup._spill_dir
+    del dedup
+    assert not os.path.exists(spill_dir)
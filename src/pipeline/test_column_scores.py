@@ -0,0 +1,71 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import numpy as np
+import pandas as pd
+from src.pipeline import column_scores
+from src.pipeline.column_scores import score_categorical, score_numeric
+from src.pipeline.profiler import StreamingProfiler, profile_dataset
+from src.pipeline.report_builder import generate_report_charts
+
+
+def _frame():
+    rng = np.random.default_rng(5)
+    n = 2_000
+    skewed = rng.lognormal(0, 1, n)
+    df = pd.DataFrame({
+        "const": np.full(n, 3.0),
+        "flat": rng.normal(100, 1, n),
+        "skewed": skewed,
+        "twin": skewed * 2 + rng.normal(0, 0.01, n),
+        "id": [f"row-{i}" for i in range(n)],
+        "single": ["same"] * n,
+        "city": rng.choice(["Pune", "Delhi", "Goa", "Agra"], n),
+    })
+    df.loc[::2, "flat"] = np.nan
+    return df
+
+
+def test_numeric_scores_rank_informative_columns_first():
+    df = _frame()
+    scores = score_numeric(df, profile_dataset(df))
+
+    assert "const" not in scores.index
+    assert scores.index[-1] == "flat" and scores.loc["flat", "missing"] == 1.0
+    assert scores.loc["skewed", "partner"] == "twin" and scores.loc["skewed", "correlation"] > 0.99
+    assert scores["score"].is_monotonic_decreasing
+
+
+def test_categorical_scores_skip_ids_and_single_values():
+    df = _frame()
+    columns = ["id", "single", "city"]
+    for profile in (profile_dataset(df), StreamingProfiler().update(df).to_profile()):
+        scores = score_categorical(df, profile, columns)
+        assert scores.index[0] == "city" and scores.loc["city", "score"] == 1.0
+        assert scores.loc[["id", "single"], "score"].tolist() == [0.0, 0.0]
+
+
+def test_report_charts_follow_the_ranking():
+    df = _frame()
+    _, captions = generate_report_charts(df, profile=profile_dataset(df), top_n=1)
+    assert captions[0].startswith("Histogram of skewed") or captions[0].startswith("Histogram of twin")
+    assert "Distribution of city — frequency counts." in captions
+    assert not any("id" in caption.split() or "const" in caption for caption in captions)
+    assert any("skewed vs twin" in caption for caption in captions)
+
+
+def test_reports_without_a_profile_rank_from_a_sample(monkeypatch):
+    monkeypatch.setattr(column_scores, "SCORE_SAMPLE_ROWS", 500)
+    profiled = []
+    profile = column_scores.profile_dataset
+
+    def counted(df, *args, **kwargs):
+        profiled.append(len(df))
+        return profile(df, *args, **kwargs)
+
+    monkeypatch.setattr(column_scores, "profile_dataset", counted)
+    df = _frame()
+    _, captions = generate_report_charts(df, top_n=1)
+
+    assert profiled and max(profiled) <= 500
+    assert "Distribution of city — frequency counts." in captions
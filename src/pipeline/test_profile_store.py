@@ -0,0 +1,80 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import time
+
+import numpy as np
+import pandas as pd
+from src.pipeline import profile_store
+from src.pipeline.profiler import StreamingProfiler, profile_dataset
+
+
+def _frame():
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({
+        "price": rng.normal(10, 3, 500),
+        "qty": rng.integers(0, 9, 500).astype("int8"),
+        "city": rng.choice(["Pune", "Delhi", "Goa"], 500),
+        "tier": pd.Categorical(rng.choice(["a", "b"], 500)),
+    })
+    df.loc[::7, "price"] = np.nan
+    return df
+
+
+def test_round_trip_is_exact(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_store, "PROFILE_STORE_PATH", str(tmp_path / "profiles.sqlite"))
+    df = _frame()
+    profile = profile_dataset(df)
+
+    assert profile_store.load_profile("abc") is None
+    profile_store.save_profile("abc", profile)
+    loaded = profile_store.load_profile("abc")
+
+    pd.testing.assert_frame_equal(loaded.stats, profile.stats)
+    pd.testing.assert_frame_equal(loaded.missing_values, profile.missing_values)
+    assert loaded.column_types["Type"].astype(str).tolist() == profile.column_types["Type"].astype(str).tolist()
+    assert [loaded.is_numeric(c) for c in df.columns] == [profile.is_numeric(c) for c in df.columns]
+    assert (loaded.n_rows, loaded.n_cols, loaded.memory_bytes) == (profile.n_rows, profile.n_cols, profile.memory_bytes)
+
+    streamed = StreamingProfiler().update(df).to_profile()
+    profile_store.save_profile("streamed", streamed)
+    loaded = profile_store.load_profile("streamed")
+    pd.testing.assert_series_equal(loaded.distinct_counts, streamed.distinct_counts)
+    assert loaded.top_values["city"].to_dict() == streamed.top_values["city"].to_dict()
+
+
+def test_eviction_by_age_and_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_store, "PROFILE_STORE_PATH", str(tmp_path / "profiles.sqlite"))
+    profile = profile_dataset(_frame())
+
+    profile_store.save_profile("old", profile)
+    with profile_store._connect() as con:
+        con.execute("UPDATE profiles SET accessed = ? WHERE fingerprint = 'old'", (time.time() - 90 * 86400,))
+    profile_store.save_profile("new", profile)
+    assert profile_store.load_profile("old") is None
+
+    # Room for roughly one profile: the least recently used one goes
+    size = len(profile_store._encode(profile))
+    monkeypatch.setattr(profile_store, "PROFILE_STORE_MAX_MB", 1.5 * size / 1024 / 1024)
+    profile_store.save_profile("newer", profile)
+    assert profile_store.load_profile("new") is None
+    assert profile_store.load_profile("newer") is not None
+
+
+def test_profiles_are_stored_per_backend_kind(tmp_path, monkeypatch):
+    from src.pipeline.backend import DuckDBBackend
+
+    monkeypatch.setattr(profile_store, "PROFILE_STORE_PATH", str(tmp_path / "profiles.sqlite"))
+    df = _frame()
+    path = tmp_path / "data.parquet"
+    df.to_parquet(path, index=False)
+
+    profile, hit = profile_store.get_or_create_profile(df, "same-bytes", duplicates=True)
+    assert not hit and profile.duplicate_rows == int(df.duplicated().sum())
+    assert profile_store.get_or_create_profile(df, "same-bytes", duplicates=True)[1]
+    assert not profile_store.get_or_create_profile(DuckDBBackend(str(path)), "same-bytes")[1]
+
+    # A profile that cannot be encoded is simply not stored
+    monkeypatch.setattr(profile_store, "_encode", lambda profile: (_ for _ in ()).throw(TypeError("bad")))
+    profile_store.save_profile("broken", profile)
+    assert profile_store.load_profile("broken") is None
@@ -0,0 +1,79 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import numpy as np
+import pandas as pd
+from src.pipeline.cleaner import suggest_imputation
+from src.pipeline.profiler import profile_dataset
+
+
+def _frame():
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({
+        "math score": rng.integers(0, 100, 300),
+        "reading score": rng.normal(70, 10, 300).astype("float32"),
+        "gender": rng.choice(["female", "male"], 300),
+        "lunch": pd.Categorical(rng.choice(["standard", "free"], 300)),
+    })
+    df["reading score"] = df["reading score"].astype("float64")
+    df.loc[::9, "reading score"] = np.nan
+    df.loc[::13, "gender"] = None
+    return df
+
+
+def test_fused_profile_matches_separate_scans():
+    df = _frame()
+    profile = profile_dataset(df)
+
+    pd.testing.assert_series_equal(profile.missing_counts, df.isnull().sum(), check_names=False)
+    pd.testing.assert_frame_equal(
+        profile.stats, df.select_dtypes(include="number").describe().T, check_dtype=False
+    )
+    assert profile.n_rows == 300 and profile.n_cols == 4
+    assert profile.memory_bytes == df.memory_usage(deep=True).sum()
+    assert profile.missing_pct == df.isnull().sum().sum() / df.size * 100
+    assert profile["missing_values"] is profile.missing_values
+
+
+def test_suggestions_read_from_profile():
+    df = _frame()
+    profile = profile_dataset(df)
+    assert suggest_imputation(df, profile) == {"reading score": "Median", "gender": "Most Frequent"}
+    assert suggest_imputation(df) == suggest_imputation(df, profile)
+
+
+def test_parallel_profile_matches_serial():
+    rng = np.random.default_rng(7)
+    wide = pd.DataFrame(rng.normal(size=(2_000, 80)), columns=[f"f{i}" for i in range(80)])
+    wide["segment"] = rng.choice(["a", "b"], 2_000)
+    wide.loc[::5, "f3"] = np.nan
+
+    serial = profile_dataset(wide, workers=1)
+    parallel = profile_dataset(wide, workers=2)
+
+    pd.testing.assert_frame_equal(parallel.missing_values, serial.missing_values)
+    pd.testing.assert_frame_equal(parallel.stats, serial.stats)
+
+
+def test_update_profile_matches_full_reprofile():
+    from src.pipeline.cleaner import apply_imputation_with_changes
+    from src.pipeline.profiler import update_profile
+
+    df = _frame()
+    df.loc[::17, "math score"] = np.nan
+    profile = profile_dataset(df)
+
+    for strategies in (
+        {"reading score": "Mean", "gender": "Most Frequent"},
+        {"reading score": "Median", "gender": "Drop"},
+        {"math score": "Drop", "gender": "Drop"},
+    ):
+        cleaned, changes = apply_imputation_with_changes(df, strategies)
+        updated = update_profile(profile, cleaned, changes)
+        expected = profile_dataset(cleaned)
+
+        pd.testing.assert_frame_equal(updated.missing_values, expected.missing_values)
+        pd.testing.assert_frame_equal(updated.stats, expected.stats)
+        pd.testing.assert_frame_equal(updated.column_types, expected.column_types)
+        assert updated.n_rows == expected.n_rows
+        assert updated.memory_bytes == expected.memory_bytes
@@ -0,0 +1,73 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from src.pipeline import report_builder
+from src.pipeline.report_builder import generate_report_charts
+from src.tools import chart_cache
+
+
+def test_parallel_report_charts_match_serial(monkeypatch):
+    monkeypatch.setattr(report_builder, "PARALLEL_MIN_ROWS", 0)
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({
+        "x": rng.normal(size=2_000),
+        "y": rng.normal(size=2_000),
+        "segment": rng.choice(["a", "b", "c"], 2_000),
+        "day": pd.date_range("2024-01-01", periods=2_000, freq="h"),
+    })
+
+    monkeypatch.setattr(chart_cache, "_charts", OrderedDict())
+    serial, captions = generate_report_charts(df, workers=1)
+    monkeypatch.setattr(chart_cache, "_charts", OrderedDict())
+    parallel, parallel_captions = generate_report_charts(df, workers=2)
+
+    assert len(serial) == 7 and parallel_captions == captions
+    assert [png[:8] for png in parallel] == [b"\x89PNG\r\n\x1a\n"] * 7
+    assert parallel == serial
+
+
+def test_pdf_report_is_built_in_memory(tmp_path, tmp_path_factory, monkeypatch):
+    from src.pipeline import report_store
+    from src.pipeline.pdf_report import generate_pdf_report
+
+    monkeypatch.setattr(report_store, "REPORT_STORE_PATH", str(tmp_path_factory.mktemp("store") / "reports.sqlite"))
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({"x": rng.normal(size=500), "y": rng.normal(size=500), "segment": rng.choice(["a", "b"], 500)})
+    pdf = generate_pdf_report(df, "First insight\nSecond insight")
+    assert pdf.startswith(b"%PDF") and len(pdf) > 10_000
+    assert os.listdir(tmp_path) == []
+
+
+def test_appendix_adds_one_page_per_column(tmp_path, monkeypatch):
+    import re
+
+    from src.pipeline import report_appendix, report_store
+    from src.pipeline.pdf_report import generate_pdf_report
+
+    monkeypatch.setattr(report_store, "REPORT_STORE_PATH", str(tmp_path / "reports.sqlite"))
+    monkeypatch.setattr(report_appendix, "APPENDIX_WINDOW", 2)
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({
+        "x": rng.normal(size=500),
+        "y": rng.normal(size=500),
+        "segment": rng.choice(["a", "b"], 500),
+        "day": pd.date_range("2024-01-01", periods=500, freq="h"),
+        "<odd & name>": rng.integers(0, 5, 500),
+    })
+
+    def pages(pdf):
+        return len(re.findall(rb"/Type /Page\b(?!s)", pdf))
+
+    plain = generate_pdf_report(df, "Insight")
+    with_appendix = generate_pdf_report(df, "Insight", appendix=True)
+    assert pages(with_appendix) == pages(plain) + df.shape[1]
+
+    monkeypatch.setattr(report_appendix, "PARALLEL_MIN_ROWS", 0)
+    serial = list(report_appendix.column_charts(df, list(df.columns), workers=1))
+    parallel = list(report_appendix.column_charts(df, list(df.columns), workers=2))
+    assert parallel == serial and serial[3] == ("day", None)
@@ -0,0 +1,123 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.pipeline import report_jobs, report_store
+from src.pipeline.profiler import profile_dataset
+from src.pipeline.report_jobs import cancel_job, get_job, submit_report
+
+
+@pytest.fixture(autouse=True)
+def _report_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_store, "REPORT_STORE_PATH", str(tmp_path / "reports.sqlite"))
+
+
+def _wait(job, timeout=60):
+    deadline = time.monotonic() + timeout
+    while job.active and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return job
+
+
+def _frame(seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"x": rng.normal(size=300), "y": rng.normal(size=300), "segment": rng.choice(["a", "b"], 300)})
+
+
+def test_identical_jobs_are_joined_and_finish_with_a_pdf(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(report_jobs, "_write_insights", lambda prompt: release.wait(30) and "Insight")
+    df = _frame(0)
+    profile = profile_dataset(df)
+
+    job = submit_report(df, profile, session_id="s1")
+    assert submit_report(df, profile, session_id="s2") is job
+    # Submitting again from the same session does not add a second subscriber
+    assert submit_report(df, profile, session_id="s2") is job and job.subscribers == {"s1", "s2"}
+    while job.stage is None:
+        time.sleep(0.01)
+    assert job.stage == "Writing insights" and job.active
+
+    release.set()
+    _wait(job)
+    assert job.status == "done" and job.progress == 1.0
+    assert job.result.startswith(b"%PDF") and get_job(job.job_id) is job
+
+
+def test_jobs_cancel_once_every_session_withdraws(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(report_jobs, "_write_insights", lambda prompt: release.wait(30) and "Insight")
+    df = _frame(1)
+    profile = profile_dataset(df)
+
+    job = submit_report(df, profile, session_id="s1")
+    submit_report(df, profile, session_id="s2")
+    submit_report(df, profile, session_id="s2")
+    assert cancel_job(job.job_id, "s1") is job and not job.cancelling
+    assert cancel_job(job.job_id, "s1") is job and not job.cancelling
+    assert cancel_job(job.job_id, "s2") is job and job.cancelling
+    release.set()
+    assert _wait(job).status == "cancelled" and job.result is None
+
+    # A new request after cancellation starts a fresh job
+    fresh = submit_report(df, profile)
+    assert fresh is not job and _wait(fresh).status == "done"
+
+
+def test_failures_are_recorded(monkeypatch):
+    def fail(prompt):
+        raise ValueError("Missing OPENROUTER_API_KEY in .env")
+    monkeypatch.setattr(report_jobs, "_write_insights", fail)
+    job = _wait(submit_report(_frame(2), profile_dataset(_frame(2))))
+    assert job.status == "failed" and "OPENROUTER_API_KEY" in job.error
+
+
+def test_stored_reports_skip_the_llm(monkeypatch):
+    monkeypatch.setattr(report_jobs, "_write_insights", lambda prompt: "Insight")
+    df = _frame(3)
+    profile = profile_dataset(df)
+    first = _wait(submit_report(df, profile))
+    assert first.status == "done"
+
+    def fail(prompt):
+        raise AssertionError("LLM called for a stored report")
+    monkeypatch.setattr(report_jobs, "_write_insights", fail)
+    again = _wait(submit_report(df, profile))
+    assert again is not first and again.status == "done" and again.result == first.result
+    assert again.from_store and not first.from_store
+
+    # Regenerating asks the LLM again and the fresh report becomes the stored one
+    monkeypatch.setattr(report_jobs, "_write_insights", lambda prompt: "Fresh insight")
+    fresh = _wait(submit_report(df, profile, regenerate=True))
+    assert fresh.status == "done" and not fresh.from_store and fresh.result != first.result
+    assert _wait(submit_report(df, profile)).result == fresh.result
+
+
+def test_a_cancel_in_the_last_stage_reports_the_job_as_done(monkeypatch):
+    from src.pipeline import pdf_report
+
+    building = threading.Event()
+    release = threading.Event()
+    build = pdf_report.generate_pdf_report
+
+    def slow_build(*args):
+        building.set()
+        release.wait(30)
+        return build(*args)
+
+    monkeypatch.setattr(report_jobs, "_write_insights", lambda prompt: "Insight")
+    monkeypatch.setattr(pdf_report, "generate_pdf_report", slow_build)
+    df = _frame(4)
+
+    job = submit_report(df, profile_dataset(df), session_id="s1")
+    assert building.wait(30)
+    cancelled = cancel_job(job.job_id, "s1")
+    assert cancelled is job and job.cancelling
+    release.set()
+    assert _wait(job).status == "done" and job.result.startswith(b"%PDF")
+    assert cancel_job(job.job_id, "s1").status == "done"
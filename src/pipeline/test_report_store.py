@@ -0,0 +1,36 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import time
+
+from src.pipeline import report_store
+
+
+def test_reports_are_keyed_by_dataset_and_insights(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_store, "REPORT_STORE_PATH", str(tmp_path / "reports.sqlite"))
+
+    assert report_store.load_report("abc", "Insight") is None
+    report_store.save_report("abc", "Insight", b"%PDF-one", prompt="Describe")
+    assert report_store.load_report("abc", "Insight") == b"%PDF-one"
+    assert report_store.load_report("abc", "Other insight") is None
+    assert report_store.load_report("def", "Insight") is None
+
+    assert report_store.load_latest_report("abc", "Describe") == ("Insight", b"%PDF-one")
+    assert report_store.load_latest_report("abc", "Summarise") is None
+
+
+def test_eviction_drops_old_templates_and_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_store, "REPORT_STORE_PATH", str(tmp_path / "reports.sqlite"))
+    report_store.save_report("old", "Insight", b"x" * 10)
+    with report_store._connect() as con:
+        con.execute("UPDATE reports SET version = ?", (report_store.REPORT_TEMPLATE_VERSION - 1,))
+
+    monkeypatch.setattr(report_store, "REPORT_STORE_MAX_MB", 3500 / (1024 * 1024))
+    for name in ["a", "b", "c"]:
+        report_store.save_report(name, "Insight", b"x" * 1000)
+        time.sleep(0.01)
+    assert report_store.load_report("a", "Insight") is not None
+    report_store.save_report("d", "Insight", b"x" * 1000)
+
+    with report_store._connect() as con:
+        assert sorted(row[0] for row in con.execute("SELECT fingerprint FROM reports")) == ["a", "c", "d"]
@@ -0,0 +1,90 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import numpy as np
+import pandas as pd
+from src.pipeline.profiler import StreamingProfiler, profile_dataset, profile_file_streaming
+from src.pipeline.sketches import HyperLogLog, KLLSketch, MisraGries, Moments
+
+
+def test_moments_merge_is_exact():
+    values = np.random.default_rng(3).normal(50, 5, 10_000)
+    left, right = Moments(), Moments()
+    left.update(values[:3_000])
+    right.update(values[3_000:])
+    merged = left.merge(right)
+    assert merged.count == 10_000
+    assert np.isclose(merged.mean, values.mean())
+    assert np.isclose(merged.std, values.std(ddof=1))
+    assert merged.min == values.min() and merged.max == values.max()
+
+
+def test_kll_quantiles_stay_close_and_bounded():
+    values = np.random.default_rng(4).random(200_000)
+    sketch = KLLSketch(k=200)
+    for chunk in np.array_split(values, 40):
+        sketch.update(chunk)
+    assert sum(len(level) for level in sketch.levels) < 1_000
+    for q, estimate in zip([0.25, 0.5, 0.75], sketch.quantiles([0.25, 0.5, 0.75])):
+        assert abs(estimate - np.quantile(values, q)) < 0.02
+
+
+def test_hll_and_misra_gries_merge():
+    rng = np.random.default_rng(5)
+    a = pd.Series(rng.integers(0, 20_000, 50_000).astype(str))
+    b = pd.Series(rng.integers(10_000, 30_000, 50_000).astype(str))
+    hll_a, hll_b = HyperLogLog(), HyperLogLog()
+    hll_a.update(a)
+    hll_b.update(b)
+    truth = pd.concat([a, b]).nunique()
+    assert abs(hll_a.merge(hll_b).estimate() - truth) / truth < 0.03
+
+    words = pd.Series(["a"] * 500 + ["b"] * 300 + list(map(str, range(200))))
+    left, right = MisraGries(k=10), MisraGries(k=10)
+    left.update(words[:400])
+    right.update(words[400:])
+    assert left.merge(right).top(2).index.tolist() == ["a", "b"]
+
+
+def test_streaming_profile_matches_batch_and_appends(tmp_path):
+    rng = np.random.default_rng(6)
+    df = pd.DataFrame({
+        "Sales": rng.normal(100, 10, 5_000),
+        "Region": rng.choice(["West", "East", "North"], 5_000),
+    })
+    df.loc[::10, "Sales"] = np.nan
+    path = tmp_path / "sales.csv"
+    df.iloc[:3_000].to_csv(path, index=False)
+
+    _, profiler = profile_file_streaming(str(path), chunk_rows=700)
+    df.iloc[3_000:].to_csv(path, mode="a", header=False, index=False)
+    streamed, profiler = profile_file_streaming(str(path), chunk_rows=700, profiler=profiler)
+    batch = profile_dataset(df)
+
+    assert streamed.n_rows == 5_000
+    pd.testing.assert_series_equal(streamed.missing_counts, batch.missing_counts)
+    for col in ["count", "mean", "std", "min", "max"]:
+        assert np.isclose(streamed.stats.loc["Sales", col], batch.stats.loc["Sales", col])
+    assert abs(streamed.stats.loc["Sales", "50%"] - batch.stats.loc["Sales", "50%"]) < 1.0
+    assert streamed.distinct_counts["Region"] == 3
+    assert streamed.top_values["Region"].index[0] == df["Region"].value_counts().index[0]
+
+    halves = StreamingProfiler().update(df.iloc[:2_500]).merge(StreamingProfiler().update(df.iloc[2_500:]))
+    assert halves.to_profile().total_missing == batch.total_missing
+
+
+def test_streaming_merge_leaves_the_other_profiler_unchanged():
+    rng = np.random.default_rng(12)
+    left = StreamingProfiler().update(pd.DataFrame({"a": rng.normal(size=300)}))
+    right = StreamingProfiler().update(pd.DataFrame({"a": rng.normal(size=200), "b": rng.choice(["x", "y"], 200)}))
+    before = right.to_profile()
+
+    left.merge(right)
+    left.update(pd.DataFrame({"a": rng.normal(size=100), "b": ["z"] * 100}))
+    after = right.to_profile()
+
+    assert right.n_rows == 200 and left.n_rows == 600
+    pd.testing.assert_frame_equal(after.missing_values, before.missing_values)
+    pd.testing.assert_frame_equal(after.stats, before.stats)
+    pd.testing.assert_series_equal(after.distinct_counts, before.distinct_counts)
+    assert left.to_profile().missing_counts["b"] == 300
@@ -0,0 +1,33 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import time
+
+from src.pipeline import sqlite_lru
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+def test_evict_drops_stale_versions_old_rows_then_least_recently_used(tmp_path):
+    now = time.time()
+    with sqlite_lru.connect(str(tmp_path / "store" / "items.sqlite"), _SCHEMA) as con:
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        con.executemany("INSERT INTO items VALUES (?, ?, ?, ?)", [
+            ("old-version", 1, 10, now),
+            ("expired", 2, 10, now - 40 * 86400),
+            ("least-recent", 2, 600_000, now - 30),
+            ("recent", 2, 600_000, now - 10),
+            ("newest", 2, 10, now),
+        ])
+
+        sqlite_lru.evict(con, "items", version=2, max_mb=1.0, max_age_days=30)
+
+        names = [name for (name,) in con.execute("SELECT name FROM items ORDER BY name")]
+    assert names == ["newest", "recent"]
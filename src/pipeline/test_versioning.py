@@ -0,0 +1,55 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import numpy as np
+import pandas as pd
+from src.pipeline.cleaner import apply_imputation_with_changes
+from src.pipeline.versioning import VersionedDataset
+
+
+def _frame():
+    rng = np.random.default_rng(8)
+    df = pd.DataFrame(rng.normal(size=(1000, 50)), columns=[f"x{i}" for i in range(50)])
+    df["city"] = pd.Categorical(rng.choice(["Pune", "Delhi"], 1000))
+    df.loc[::4, "x0"] = np.nan
+    df.loc[::6, "x1"] = np.nan
+    df.loc[::9, "city"] = None
+    return df
+
+
+def test_undo_redo_and_materialize():
+    df = _frame()
+    versions = VersionedDataset(df)
+
+    step1, changes1 = apply_imputation_with_changes(versions.current(), {"x0": "Median"})
+    versions.commit(step1, changes1, "Fill x0")
+    step2, changes2 = apply_imputation_with_changes(versions.current(), {"x1": "Mean", "city": "Drop"})
+    versions.commit(step2, changes2, "Fill x1, drop city")
+
+    # Rebuilt versions equal the frames the cleaning steps produced
+    pd.testing.assert_frame_equal(versions.materialize(1), step1)
+    pd.testing.assert_frame_equal(versions.materialize(2), step2)
+    pd.testing.assert_frame_equal(versions.undo(), step1)
+    pd.testing.assert_frame_equal(versions.undo(), df)
+    assert not versions.can_undo
+    pd.testing.assert_frame_equal(versions.redo(), step1)
+
+    # Deltas hold two float columns, one row-position array and nothing else
+    assert versions.memory_bytes() == 1000 * 8 + len(step2) * 8 * 2
+
+    diff = versions.diff(0, 2)
+    assert (diff.rows_before, diff.rows_after) == (1000, len(step2))
+    assert diff.cells_changed.to_dict() == {
+        "x0": int(step2.index.isin(df.index[df["x0"].isna()]).sum()),
+        "x1": int(step2.index.isin(df.index[df["x1"].isna()]).sum()),
+    }
+    assert versions.diff(0, 2) is diff
+
+    # Committing after an undo drops the redo branch
+    step3, changes3 = apply_imputation_with_changes(versions.current(), {"x1": "Median"})
+    versions.commit(step3, changes3, "Fill x1")
+    assert versions.labels == ["Raw data", "Fill x0", "Fill x1"]
+    assert not versions.can_redo
+    # The replaced version's diff is not served for the new one
+    assert versions.diff(0, 2) is not diff
+    assert versions.diff(0, 2).rows_after == len(df)
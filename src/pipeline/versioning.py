@@ -0,0 +1,201 @@
+# src/pipeline/versioning.py
+
+"""
+Versioned datasets for cleaning workflows.
+
+The raw frame is kept once. Each cleaning step is stored as a delta against
+it, never as another full copy:
+- the arrays of the columns the step changed
+- the positions of the raw rows that survive, when the step dropped rows
+Memory therefore grows with the columns a step touches, not with the number
+of versions kept. Any version is materialized on demand; only the current
+one is held as a frame.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline.profiler import ChangeSet
+
+
+@dataclass
+class _Version:
+    label: str
+    # Raw-row positions that survive (None = every raw row), ascending
+    positions: np.ndarray = None
+    # Changed columns as arrays aligned to `positions`
+    columns: dict = field(default_factory=dict)
+    profile: object = None
+
+
+@dataclass
+class VersionDiff:
+    """What changed between two versions: row counts and changed cells per column."""
+    rows_before: int
+    rows_after: int
+    cells_changed: pd.Series
+
+
+class VersionedDataset:
+    """
+    Linear history of cleaning steps with undo and redo. Committing after an
+    undo discards the versions that could have been redone, as in an editor.
+    """
+
+    def __init__(self, df: pd.DataFrame, profile=None):
+        if not df.index.is_unique:
+            df = df.reset_index(drop=True)
+        self._base = df
+        self._versions = [_Version("Raw data", profile=profile)]
+        self._head = 0
+        self._current = df
+        # (a, b) -> (version a, version b, VersionDiff); valid while both versions are kept
+        self._diffs = {}
+
+    @property
+    def head(self) -> int:
+        return self._head
+
+    @property
+    def labels(self) -> list:
+        return [version.label for version in self._versions]
+
+    @property
+    def can_undo(self) -> bool:
+        return self._head > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._head < len(self._versions) - 1
+
+    @property
+    def profile(self):
+        return self._versions[self._head].profile
+
+    def current(self) -> pd.DataFrame:
+        return self._current
+
+    def commit(self, df: pd.DataFrame, changes: ChangeSet, label: str, profile=None) -> int:
+        """
+        Records a cleaning step applied to current(), given the cleaned frame
+        and the ChangeSet describing it. Returns the new version number.
+        """
+        parent = self._versions[self._head]
+        positions = parent.positions
+        if changes.dropped_rows:
+            positions = self._base.index.get_indexer(df.index)
+            if (positions < 0).any():
+                raise ValueError("Cleaned rows must come from the versioned dataset")
+
+        # Own copies of just the changed columns, so the cleaned frame can be released
+        columns = {col: df[col].array.copy() for col in changes.filled_columns}
+        version = _Version(label, positions, columns, profile)
+
+        del self._versions[self._head + 1:]
+        self._versions.append(version)
+        # Drop diffs of discarded versions, so their deltas can be freed
+        self._diffs = {key: entry for key, entry in self._diffs.items() if max(key) <= self._head}
+        self._head += 1
+        self._current = df
+        return self._head
+
+    def undo(self) -> pd.DataFrame:
+        if self.can_undo:
+            self.checkout(self._head - 1)
+        return self._current
+
+    def redo(self) -> pd.DataFrame:
+        if self.can_redo:
+            self.checkout(self._head + 1)
+        return self._current
+
+    def checkout(self, version: int) -> pd.DataFrame:
+        self._current = self.materialize(version)
+        self._head = version
+        return self._current
+
+    def _owner(self, col, version: int):
+        """The latest version at or before `version` that changed col (None = raw)."""
+        for v in range(version, 0, -1):
+            if col in self._versions[v].columns:
+                return self._versions[v]
+        return None
+
+    def _column(self, col, version: int, positions) -> pd.api.extensions.ExtensionArray:
+        owner = self._owner(col, version)
+        if owner is None:
+            values = self._base[col].array
+            return values if positions is None else values.take(positions)
+        values = owner.columns[col]
+        if positions is None or (owner.positions is not None and len(owner.positions) == len(positions)):
+            return values
+        # Rows only ever shrink along the history, so target rows are a subset of the owner's
+        indexer = positions if owner.positions is None else np.searchsorted(owner.positions, positions)
+        return values.take(indexer)
+
+    def materialize(self, version: int) -> pd.DataFrame:
+        """Rebuilds a version from the raw frame and the deltas up to it."""
+        positions = self._versions[version].positions
+        frame = self._base if positions is None else self._base.take(positions)
+
+        changed = {col for v in self._versions[1:version + 1] for col in v.columns}
+        if not changed:
+            return frame
+        frame = frame.copy(deep=False)
+        for col in self._base.columns:
+            if col in changed:
+                frame[col] = pd.Series(self._column(col, version, positions), index=frame.index)
+        return frame
+
+    def diff(self, a: int, b: int) -> VersionDiff:
+        """
+        Compares two versions cell by cell over the rows they share.
+        Versions never change once committed, so results are memoized.
+        """
+        cached = self._diffs.get((a, b))
+        if cached is not None and cached[0] is self._versions[a] and cached[1] is self._versions[b]:
+            return cached[2]
+        result = self._compare(a, b)
+        self._diffs[(a, b)] = (self._versions[a], self._versions[b], result)
+        return result
+
+    def _compare(self, a: int, b: int) -> VersionDiff:
+        pos_a = self._versions[a].positions
+        pos_b = self._versions[b].positions
+        rows_a = len(self._base) if pos_a is None else len(pos_a)
+        rows_b = len(self._base) if pos_b is None else len(pos_b)
+
+        if pos_a is None and pos_b is None:
+            shared = None
+        else:
+            shared = np.intersect1d(
+                np.arange(len(self._base)) if pos_a is None else pos_a,
+                np.arange(len(self._base)) if pos_b is None else pos_b,
+            )
+
+        cells = {}
+        for col in self._base.columns:
+            if self._owner(col, a) is self._owner(col, b):
+                continue
+            left = pd.Series(self._column(col, a, shared))
+            right = pd.Series(self._column(col, b, shared))
+            both_missing = left.isna().to_numpy() & right.isna().to_numpy()
+            if left.dtype == right.dtype and pd.api.types.is_numeric_dtype(left.dtype):
+                differs = (left.to_numpy() != right.to_numpy()) & ~both_missing
+            else:
+                differs = (left.astype(object) != right.astype(object)).to_numpy() & ~both_missing
+            cells[col] = int(differs.sum())
+
+        cells_changed = pd.Series(cells, dtype="int64", name="Cells Changed")
+        return VersionDiff(rows_a, rows_b, cells_changed[cells_changed > 0])
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the stored deltas (the raw frame is not counted)."""
+        total = 0
+        for version in self._versions[1:]:
+            if version.positions is not None:
+                total += version.positions.nbytes
+            total += sum(int(values.nbytes) for values in version.columns.values())
+        return total
@@ -0,0 +1,147 @@
+# src/tools/chart_cache.py
+
+"""
+Render cache for chart images, shared by chat and the PDF report.
+
+A chart is identified by the dataset fingerprint, its columns, its chart
+type and the render style. Asking for a chart that was already drawn returns
+the existing image instead of running matplotlib again.
+
+Charts are rendered straight to PNG bytes in memory, never to a shared file.
+Each session holds the bytes it shows (chat history, report), so concurrent
+users cannot overwrite each other's images and no disk I/O sits on the
+request path. The cache itself is bounded: past its byte budget the least
+recently used images are dropped, while sessions keep the ones they hold.
+What a session holds is bounded too, see trim_session_charts.
+"""
+
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+# Bump when chart rendering changes so stale images are not reused
+CHART_STYLE = "default-v2"
+CHART_STORE_MAX_MB = float(os.getenv("EDA_CHART_STORE_MAX_MB", "64"))
+# Chart bytes one session's chat history may hold; older images are dropped first
+SESSION_CHART_MAX_MB = float(os.getenv("EDA_SESSION_CHART_MAX_MB", "16"))
+# Folders where earlier releases wrote chart images to disk
+LEGACY_CHART_DIRS = ["src/data/temp", "src/data/report_charts", "src/data/cache/charts"]
+
+_lock = threading.Lock()
+# Chart key -> PNG bytes, least recently used first
+_charts = OrderedDict()
+_charts_bytes = 0
+
+
+def chart_key(fingerprint: str, columns, chart_type: str, style: str = CHART_STYLE) -> str:
+    ident = repr((fingerprint, [str(col) for col in columns], chart_type, style))
+    return hashlib.blake2b(ident.encode(), digest_size=16).hexdigest()
+
+
+def render_png(fig) -> bytes:
+    """Renders a matplotlib Figure to PNG bytes and closes it."""
+    import matplotlib.pyplot as plt
+
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format="png", bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+def get_chart(key: str):
+    """The cached PNG bytes for a chart key (marked recently used), or None."""
+    with _lock:
+        png = _charts.get(key)
+        if png is not None:
+            _charts.move_to_end(key)
+        return png
+
+
+def put_chart(key: str, png: bytes):
+    global _charts_bytes
+    with _lock:
+        if key not in _charts:
+            _charts[key] = png
+            _charts_bytes += len(png)
+            _evict(int(CHART_STORE_MAX_MB * 1024 * 1024))
+
+
+def cached_chart(fingerprint: str, columns, chart_type: str, render, style: str = CHART_STYLE) -> bytes:
+    """
+    Returns the PNG bytes of a chart, calling render() for a matplotlib
+    Figure only when the chart is not cached yet.
+    """
+    key = chart_key(fingerprint, columns, chart_type, style)
+    png = get_chart(key)
+    if png is None:
+        png = render_png(render())
+        put_chart(key, png)
+    return png
+
+
+def _evict(max_bytes: int) -> int:
+    global _charts_bytes
+    removed = 0
+    while _charts and _charts_bytes > max_bytes:
+        _, png = _charts.popitem(last=False)
+        _charts_bytes -= len(png)
+        removed += 1
+    return removed
+
+
+def evict_charts(max_bytes: int = None) -> int:
+    """
+    Drops least recently used images until the cache fits its byte budget.
+    Returns:
+        number of images dropped
+    """
+    if max_bytes is None:
+        max_bytes = int(CHART_STORE_MAX_MB * 1024 * 1024)
+    with _lock:
+        return _evict(max_bytes)
+
+
+def trim_session_charts(history: list, max_bytes: int = None) -> int:
+    """
+    Drops the images of the oldest chart messages in a chat history until
+    the rest fit the session's budget. Dropped messages keep their place
+    with None instead of PNG bytes.
+    Returns:
+        number of images dropped
+    """
+    if max_bytes is None:
+        max_bytes = int(SESSION_CHART_MAX_MB * 1024 * 1024)
+    charts = [chat for chat in history if chat["role"] == "chart" and chat["message"] is not None]
+    total = sum(len(chat["message"]) for chat in charts)
+    removed = 0
+    for chat in charts:
+        if total <= max_bytes:
+            break
+        total -= len(chat["message"])
+        chat["message"] = None
+        removed += 1
+    return removed
+
+
+def cleanup_orphans() -> int:
+    """
+    Startup cleanup of chart images earlier releases left on disk.
+    Returns:
+        number of files deleted
+    """
+    removed = 0
+    for folder in LEGACY_CHART_DIRS:
+        if not os.path.isdir(folder):
+            continue
+        for name in os.listdir(folder):
+            if name.endswith((".png", ".tmp")):
+                try:
+                    os.remove(os.path.join(folder, name))
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+    return removed
@@ -1,53 +1,159 @@
 # src/tools/chart_generator.py
 
-import os
+import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
 import pandas as pd
-from datetime import datetime
 
-TEMP_DIR = "src/data/temp"
+from src.pipeline.backend import get_backend
+from src.tools.chart_cache import cached_chart
+from src.tools.plot_data import KDE_SAMPLE_ROWS, SCATTER_BIN_ROWS, SCATTER_BINS, kde_curve, line_points
 
-os.makedirs(TEMP_DIR, exist_ok=True)
+# Bar charts show at most this many of the most frequent categories
+BAR_LIMIT = 50
+FIGSIZE = (8, 4)
+# Compact charts for the per-column report appendix
+MINI_FIGSIZE = (5, 2.2)
+MINI_BAR_LIMIT = 10
 
-def generate_chart(df: pd.DataFrame, col1: str, col2: str = None, chart_type: str = "line"):
-    """
-    Generates chart and saves into temp folder.
-    Returns the image file path.
-    """
 
-    plt.figure(figsize=(8, 4))
+def _render_line(backend, col):
+    fig, ax = plt.subplots(figsize=FIGSIZE)
+    series = backend.sample([col])[col]
+    x, y = line_points(series.index.to_numpy(), series.to_numpy(dtype="float64", na_value=np.nan))
+    ax.plot(x, y)
+    ax.set_title(f"Line Plot of {col}")
+    return fig
 
-    if chart_type == "line":
-        df[col1].plot(kind="line")
-        plt.title(f"Line Plot of {col1}")
 
-    elif chart_type == "bar":
-        df[col1].value_counts().plot(kind="bar")
-        plt.title(f"Bar Chart of {col1}")
+def _render_bar(backend, col):
+    fig, ax = plt.subplots(figsize=FIGSIZE)
+    backend.value_counts(col, limit=BAR_LIMIT).plot(kind="bar", ax=ax)
+    ax.set_title(f"Bar Chart of {col}")
+    return fig
 
-    elif chart_type == "hist":
-        df[col1].plot(kind="hist", bins=30)
-        plt.title(f"Histogram of {col1}")
 
-    elif chart_type == "scatter" and col2:
-        plt.scatter(df[col1], df[col2])
-        plt.xlabel(col1)
-        plt.ylabel(col2)
-        plt.title(f"Scatter Plot: {col1} vs {col2}")
+def _render_hist(backend, col):
+    fig, ax = plt.subplots(figsize=FIGSIZE)
+    counts, edges = backend.histogram(col, bins=30)
+    ax.hist(edges[:-1], bins=edges, weights=counts)
+    ax.set_ylabel("Frequency")
+    ax.set_title(f"Histogram of {col}")
+    return fig
 
-    elif chart_type == "heatmap":
-        corr = df.corr()
-        sns.heatmap(corr, annot=True, cmap="coolwarm")
-        plt.title("Correlation Heatmap")
 
+def _render_scatter(backend, col1, col2):
+    fig, ax = plt.subplots(figsize=FIGSIZE)
+    if backend.shape[0] > SCATTER_BIN_ROWS:
+        # Too many points to draw one by one: show row density per 2-D bin
+        counts, x_edges, y_edges = backend.histogram2d(col1, col2, bins=SCATTER_BINS)
+        mesh = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap="viridis")
+        fig.colorbar(mesh, ax=ax, label="Rows")
     else:
-        return None
+        points = backend.sample([col1, col2])
+        ax.scatter(points[col1], points[col2])
+    ax.set_xlabel(col1)
+    ax.set_ylabel(col2)
+    ax.set_title(f"Scatter Plot: {col1} vs {col2}")
+    return fig
+
+
+def _render_heatmap(backend, *cols):
+    # seaborn (and scipy behind it) is only needed here
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=FIGSIZE)
+    sns.heatmap(backend.corr(list(cols)), annot=True, cmap="coolwarm", ax=ax)
+    ax.set_title("Correlation Heatmap")
+    return fig
+
+
+def _render_hist_kde(backend, col):
+    fig, ax = plt.subplots(figsize=FIGSIZE)
+    counts, edges = backend.histogram(col, bins=30)
+    ax.hist(edges[:-1], bins=edges, weights=counts, alpha=0.6)
+    # The KDE is fitted on a sample and scaled to counts per bin
+    sample = backend.sample([col], n=KDE_SAMPLE_ROWS)[col].to_numpy(dtype="float64", na_value=np.nan)
+    curve = kde_curve(sample, edges[0], edges[-1], scale=counts.sum() * (edges[1] - edges[0]))
+    if curve is not None:
+        ax.plot(*curve)
+    ax.set_ylabel("Count")
+    ax.set_xlabel(col)
+    ax.set_title(f"Distribution of {col}")
+    return fig
+
+
+def _render_box(backend, col):
+    fig, ax = plt.subplots(figsize=FIGSIZE)
+    ax.bxp([backend.box_stats(col)], orientation="horizontal")
+    ax.set_yticks([])
+    ax.set_xlabel(col)
+    ax.set_title(f"Boxplot of {col}")
+    return fig
+
+
+def _render_trend(backend, date_col, value_col):
+    fig, ax = plt.subplots(figsize=FIGSIZE)
+    points = backend.sample([date_col, value_col]).sort_values(date_col)
+    x, y = line_points(points[date_col].to_numpy(), points[value_col].to_numpy(dtype="float64", na_value=np.nan))
+    ax.plot(x, y)
+    ax.set_title(f"Trend of {value_col} over time")
+    return fig
+
 
-    filename = f"chart_{chart_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-    file_path = os.path.join(TEMP_DIR, filename)
-    plt.tight_layout()
-    plt.savefig(file_path)
-    plt.close()
+def _render_mini_hist(backend, col):
+    fig, ax = plt.subplots(figsize=MINI_FIGSIZE)
+    counts, edges = backend.histogram(col, bins=30)
+    ax.hist(edges[:-1], bins=edges, weights=counts)
+    ax.tick_params(labelsize=7)
+    return fig
+
+
+def _render_mini_bar(backend, col):
+    fig, ax = plt.subplots(figsize=MINI_FIGSIZE)
+    counts = backend.value_counts(col, limit=MINI_BAR_LIMIT)
+    ax.barh([str(value)[:30] for value in counts.index[::-1]], counts.to_numpy()[::-1])
+    ax.tick_params(labelsize=7)
+    return fig
+
+
+# Chart type -> renderer taking the backend and the chart's columns
+RENDERERS = {
+    "line": _render_line,
+    "bar": _render_bar,
+    "hist": _render_hist,
+    "scatter": _render_scatter,
+    "heatmap": _render_heatmap,
+    "hist_kde": _render_hist_kde,
+    "box": _render_box,
+    "trend": _render_trend,
+    "mini_hist": _render_mini_hist,
+    "mini_bar": _render_mini_bar,
+}
+
+
+def render_chart(df, chart_type: str, columns: list) -> bytes:
+    """
+    Returns a chart as PNG bytes, drawing it only if this dataset's chart is
+    not in the render cache yet.
+    """
+    backend = get_backend(df)
+    render = RENDERERS[chart_type]
+    return cached_chart(backend.fingerprint(), columns, chart_type, lambda: render(backend, *columns))
+
+
+def generate_chart(df, col1: str, col2: str = None, chart_type: str = "line"):
+    """
+    Generates a chart image, reusing the cached one when the same chart of
+    the same data was drawn before.
+    Accepts a DataFrame or any DatasetBackend; only aggregates are plotted.
+    Returns the PNG bytes (None for an unsupported chart).
+    """
+    backend = get_backend(df)
 
-    return file_path
+    if chart_type in ("line", "bar", "hist"):
+        return render_chart(backend, chart_type, [col1])
+    if chart_type == "scatter" and col2:
+        return render_chart(backend, "scatter", [col1, col2])
+    if chart_type == "heatmap":
+        return render_chart(backend, "heatmap", backend.numeric_columns())
+    return None
@@ -0,0 +1,187 @@
+# src/tools/dataset_store.py
+
+import hashlib
+import os
+import time
+
+import pyarrow as pa
+import pyarrow.ipc
+
+from src.pipeline.backend import OUT_OF_CORE_THRESHOLD_MB, DuckDBBackend, spool_upload
+from src.tools.utils import LoadStats, evict_lru_files, load_dataset_with_stats, touch_file
+
+DATASET_CACHE_DIR = "src/data/cache/datasets"
+# Least recently used parses are removed once the cache grows past this
+DATASET_CACHE_MAX_MB = float(os.getenv("EDA_DATASET_CACHE_MAX_MB", "2048"))
+# Local files may only be opened by path from inside this folder; unset disables opening by path
+DATA_ROOT = os.getenv("EDA_DATA_ROOT")
+# Bump when the loader's output changes so stale parses are not served
+STORE_VERSION = 1
+
+_HASH_BLOCK = 8 * 1024 * 1024
+
+
+def _open_source(uploaded_file):
+    """Returns a readable binary stream for an upload or a local path."""
+    if isinstance(uploaded_file, (str, os.PathLike)):
+        return open(uploaded_file, "rb"), True
+    uploaded_file.seek(0)
+    return uploaded_file, False
+
+
+def content_hash(uploaded_file) -> str:
+    """
+    Hashes the raw bytes of an upload (or local file) in fixed-size blocks.
+    The hash identifies the dataset regardless of its file name.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{STORE_VERSION}".encode())
+
+    source, owned = _open_source(uploaded_file)
+    try:
+        while True:
+            block = source.read(_HASH_BLOCK)
+            if not block:
+                break
+            digest.update(block)
+    finally:
+        if owned:
+            source.close()
+        else:
+            source.seek(0)
+
+    return digest.hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(DATASET_CACHE_DIR, f"{key}.arrow")
+
+
+def _read_cached(path: str):
+    """
+    Reads an Arrow IPC file through a memory map.
+    Closing the map only releases the file handle: the mapping itself lives
+    on while the frame's zero-copy columns reference it.
+    """
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+        # split_blocks lets numeric columns without nulls stay zero-copy views on the map
+        return table.to_pandas(split_blocks=True)
+
+
+def _write_cached(df, path: str):
+    """Writes the parsed frame as an uncompressed Arrow IPC file, atomically."""
+    os.makedirs(DATASET_CACHE_DIR, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_cached_dataset(uploaded_file):
+    """
+    Loads a dataset through the content-hashed cache.
+    The first load of a given file parses it and stores an Arrow copy;
+    later loads of the same bytes read that copy back memory-mapped.
+    Returns:
+        (DataFrame, LoadStats, dataset key, cache hit flag)
+    """
+    key = content_hash(uploaded_file)
+    path = _cache_path(key)
+
+    if os.path.exists(path):
+        start = time.perf_counter()
+        try:
+            df = _read_cached(path)
+        except (OSError, pa.ArrowException):
+            # Corrupt or truncated cache entry: drop it and parse again
+            os.remove(path)
+        else:
+            touch_file(path)
+            memory_mb = float(df.memory_usage(deep=True).sum()) / 1024 / 1024
+            stats = LoadStats(
+                rows=df.shape[0],
+                columns=df.shape[1],
+                seconds=time.perf_counter() - start,
+                peak_estimate_mb=memory_mb,
+                memory_mb=memory_mb,
+            )
+            return df, stats, key, True
+
+    df, stats = load_dataset_with_stats(uploaded_file)
+    try:
+        _write_cached(df, path)
+        evict_lru_files(DATASET_CACHE_DIR, (".arrow",), DATASET_CACHE_MAX_MB, keep=[path])
+    except (OSError, pa.ArrowException):
+        # Caching is best effort; the parsed frame is still usable
+        pass
+
+    return df, stats, key, False
+
+
+def _path_key(path: str) -> str:
+    """Cheap key for a local file: hashing a 20 GB file byte by byte is too slow."""
+    info = os.stat(path)
+    ident = f"v{STORE_VERSION}|{os.path.abspath(path)}|{info.st_size}|{info.st_mtime_ns}"
+    return hashlib.blake2b(ident.encode(), digest_size=16).hexdigest()
+
+
+def _open_out_of_core(path: str, key: str):
+    start = time.perf_counter()
+    backend = DuckDBBackend(path)
+    stats = LoadStats(
+        rows=backend.shape[0],
+        columns=backend.shape[1],
+        seconds=time.perf_counter() - start,
+        peak_estimate_mb=0.0,
+        memory_mb=0.0,
+    )
+    return backend, stats, key, False
+
+
+def resolve_local_path(path: str) -> str:
+    """
+    Resolves a user-supplied path and checks it lies inside DATA_ROOT.
+    Symlinks and ".." are resolved first, so they cannot escape the root.
+    Raises:
+        PermissionError when opening by path is disabled or the file is outside the root
+    """
+    if not DATA_ROOT:
+        raise PermissionError("Opening local files by path is disabled (set EDA_DATA_ROOT to enable it)")
+    root = os.path.realpath(DATA_ROOT)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise PermissionError(f"Only files inside {DATA_ROOT} can be opened by path")
+    return resolved
+
+
+def open_dataset(source):
+    """
+    Opens an upload or a local file path with the right backend.
+    - Local CSV/Parquet paths and uploads above OUT_OF_CORE_THRESHOLD_MB are
+      scanned in place by DuckDB and never loaded into pandas. Paths must
+      lie inside DATA_ROOT (relative paths are taken from it).
+    - Everything else goes through the content-hashed pandas cache.
+    Returns:
+        (DataFrame or DatasetBackend, LoadStats, dataset key, cache hit flag)
+    """
+    if isinstance(source, (str, os.PathLike)):
+        path = resolve_local_path(os.fspath(source))
+        if not path.endswith((".csv", ".parquet")):
+            raise ValueError("Out-of-core mode supports CSV and Parquet files")
+        return _open_out_of_core(path, _path_key(path))
+
+    size_mb = getattr(source, "size", 0) / 1024 / 1024
+    if size_mb > OUT_OF_CORE_THRESHOLD_MB and source.name.endswith(".csv"):
+        key = content_hash(source)
+        return _open_out_of_core(spool_upload(source, key), key)
+
+    return load_cached_dataset(source)
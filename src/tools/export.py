@@ -0,0 +1,123 @@
+# src/tools/export.py
+
+import gzip
+import logging
+import os
+import tempfile
+import time
+import weakref
+from dataclasses import dataclass
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.pipeline.backend import DatasetBackend, PandasBackend
+
+# Label -> (file suffix, MIME type)
+EXPORT_FORMATS = {
+    "CSV (gzip)": (".csv.gz", "application/gzip"),
+    "CSV (zstd)": (".csv.zst", "application/zstd"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+# Rows serialized at a time; bounds the text buffer of CSV exports
+EXPORT_CHUNK_ROWS = 100_000
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExportResult:
+    """
+    An exported file on local disk and what it cost to write.
+    The file is removed when the result is garbage collected (e.g. with the
+    session that held it) or at interpreter exit, if remove() was not called.
+    """
+    path: str
+    file_name: str
+    mime: str
+    rows: int
+    bytes: int
+    seconds: float
+
+    def __post_init__(self):
+        self._cleanup = weakref.finalize(self, _remove_file, self.path)
+
+    @property
+    def mb(self) -> float:
+        return self.bytes / 1024 / 1024
+
+    def remove(self):
+        self._cleanup()
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _write_csv_chunks(df: pd.DataFrame, handle, chunk_rows: int):
+    if df.empty:
+        df.to_csv(handle, index=False)
+        return
+    for start in range(0, len(df), chunk_rows):
+        df.iloc[start:start + chunk_rows].to_csv(handle, header=start == 0, index=False)
+
+
+def _write_parquet_chunks(df: pd.DataFrame, path: str, chunk_rows: int):
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def export_dataset(data, fmt: str, base_name: str = "cleaned_dataset", chunk_rows: int = EXPORT_CHUNK_ROWS) -> ExportResult:
+    """
+    Writes a DataFrame or backend to a temp file chunk by chunk, so the full
+    CSV text never exists in memory. Out-of-core backends export inside their
+    engine. The file lives as long as the returned ExportResult.
+    """
+    suffix, mime = EXPORT_FORMATS[fmt]
+    fd, path = tempfile.mkstemp(prefix="eda-export-", suffix=suffix)
+    os.close(fd)
+
+    start = time.perf_counter()
+    try:
+        if isinstance(data, DatasetBackend) and not isinstance(data, PandasBackend):
+            if suffix == ".parquet":
+                data.write_parquet(path)
+            else:
+                data.write_csv(path, compression="gzip" if suffix == ".csv.gz" else "zstd")
+            rows = data.shape[0]
+        else:
+            df = data.df if isinstance(data, PandasBackend) else data
+            if suffix == ".parquet":
+                _write_parquet_chunks(df, path, chunk_rows)
+            elif suffix == ".csv.gz":
+                with gzip.open(path, "wt", newline="", compresslevel=6) as handle:
+                    _write_csv_chunks(df, handle, chunk_rows)
+            else:
+                import zstandard
+                with zstandard.open(path, "wt", newline="") as handle:
+                    _write_csv_chunks(df, handle, chunk_rows)
+            rows = len(df)
+    except BaseException:
+        os.remove(path)
+        raise
+
+    result = ExportResult(
+        path=path,
+        file_name=base_name + suffix,
+        mime=mime,
+        rows=rows,
+        bytes=os.path.getsize(path),
+        seconds=time.perf_counter() - start,
+    )
+    logger.info(
+        "Exported %d rows as %s: %.1f MB in %.2fs",
+        result.rows, fmt, result.mb, result.seconds,
+    )
+    return result
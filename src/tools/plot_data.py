@@ -0,0 +1,95 @@
+# src/tools/plot_data.py
+
+"""
+Aggregation layer between dataset backends and matplotlib.
+
+Charts never hand every row to matplotlib:
+- histograms are drawn from precomputed bins
+- KDE curves are fitted on a bounded sample
+- scatters over more than SCATTER_BIN_ROWS rows become 2-D histograms
+- line charts are downsampled with LTTB to at most PLOT_MAX_POINTS points
+"""
+
+import os
+
+import numpy as np
+
+# Line charts are downsampled beyond this many points
+PLOT_MAX_POINTS = int(os.getenv("EDA_PLOT_MAX_POINTS", "2000"))
+# Scatters over datasets with more rows are drawn as 2-D histograms
+SCATTER_BIN_ROWS = int(os.getenv("EDA_SCATTER_BIN_ROWS", "20000"))
+SCATTER_BINS = 100
+# Rows a KDE curve is fitted on
+KDE_SAMPLE_ROWS = int(os.getenv("EDA_KDE_SAMPLE_ROWS", "10000"))
+KDE_GRID_POINTS = 200
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling: indices of n points that
+    keep the visual shape of the line (first and last point included).
+    """
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    # Buckets between the fixed first and last points
+    bounds = np.linspace(1, size - 1, n - 1).astype(np.int64)
+    selected = np.empty(n, dtype=np.int64)
+    selected[0], selected[-1] = 0, size - 1
+
+    prev = 0
+    for i in range(n - 2):
+        start, stop = bounds[i], bounds[i + 1]
+        # Next bucket's average is the third triangle vertex
+        next_stop = bounds[i + 2] if i + 2 < len(bounds) else size
+        avg_x = x[stop:next_stop].mean() if next_stop > stop else x[-1]
+        avg_y = y[stop:next_stop].mean() if next_stop > stop else y[-1]
+
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:stop] - y[prev])
+            - (x[prev] - x[start:stop]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        selected[i + 1] = prev
+    return selected
+
+
+def line_points(x: np.ndarray, y: np.ndarray, max_points: int = None):
+    """Drops missing values and downsamples a line to at most max_points points."""
+    max_points = PLOT_MAX_POINTS if max_points is None else max_points
+    x, y = np.asarray(x), np.asarray(y, dtype="float64")
+    keep = ~np.isnan(y)
+    if np.issubdtype(x.dtype, np.datetime64):
+        keep &= ~np.isnat(x)
+        numeric_x = x.astype("datetime64[ns]").astype("int64")
+    else:
+        numeric_x = x.astype("float64")
+        keep &= ~np.isnan(numeric_x)
+    x, y, numeric_x = x[keep], y[keep], numeric_x[keep]
+    index = lttb(numeric_x, y, max_points)
+    return x[index], y[index]
+
+
+def kde_curve(sample: np.ndarray, lo: float, hi: float, scale: float = 1.0):
+    """
+    Gaussian KDE (Scott's bandwidth) fitted on a sample and evaluated on a
+    grid over [lo, hi]; scale turns densities into counts per bin.
+    Returns (grid, values), or None when the sample cannot support a KDE.
+    """
+    sample = np.asarray(sample, dtype="float64")
+    sample = sample[~np.isnan(sample)]
+    if len(sample) < 2 or sample.std() == 0:
+        return None
+    bandwidth = sample.std(ddof=1) * len(sample) ** (-1 / 5)
+    grid = np.linspace(lo, hi, KDE_GRID_POINTS)
+
+    density = np.zeros(len(grid))
+    # Chunked over the sample to bound the grid x sample block
+    for start in range(0, len(sample), 2_000):
+        z = (grid[:, None] - sample[None, start:start + 2_000]) / bandwidth
+        density += np.exp(-0.5 * z * z).sum(axis=1)
+    density /= len(sample) * bandwidth * np.sqrt(2 * np.pi)
+    return grid, density * scale
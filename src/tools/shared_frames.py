@@ -0,0 +1,147 @@
+# src/tools/shared_frames.py
+
+"""
+Hands DataFrames to worker processes through shared memory.
+
+The frame is copied once into a multiprocessing SharedMemory block:
+- plain NumPy numeric columns as column-major arrays, one region per dtype
+- every other column (strings, categoricals, nullable types) as an Arrow
+  IPC file
+Workers attach by name and rebuild only the columns they need as
+zero-copy views on the block, so nothing is pickled on the way in.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc
+
+_ALIGN = 64
+
+_pools = {}
+
+
+def get_worker_pool(workers: int) -> ProcessPoolExecutor:
+    """One long-lived pool per worker count; spawn avoids forking the app's threads."""
+    if workers not in _pools:
+        _pools[workers] = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pools[workers]
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _is_plain_numeric(dtype) -> bool:
+    return isinstance(dtype, np.dtype) and dtype.kind in "biuf"
+
+
+class SharedFrame:
+    """
+    Owns a shared-memory copy of a DataFrame for the lifetime of a
+    with-block. Pass `handle` (a small picklable tuple) to workers.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        rows = len(df)
+
+        groups = {}
+        other = []
+        for col, dtype in df.dtypes.items():
+            if _is_plain_numeric(dtype):
+                groups.setdefault(dtype.str, []).append(col)
+            else:
+                other.append(col)
+
+        # Lay out one column-major region per numeric dtype, then the Arrow file
+        layout = []
+        offset = 0
+        for dtype_str, cols in groups.items():
+            layout.append((dtype_str, cols, offset))
+            offset = _aligned(offset + np.dtype(dtype_str).itemsize * rows * len(cols))
+
+        table = None
+        arrow_region = None
+        if other:
+            table = pa.Table.from_pandas(df[other], preserve_index=False)
+            sink = pa.MockOutputStream()
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            arrow_region = (offset, sink.size())
+            offset += sink.size()
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+
+        for dtype_str, cols, start in layout:
+            block = np.ndarray((rows, len(cols)), dtype=dtype_str, buffer=self._shm.buf, offset=start, order="F")
+            block[:] = df[cols].to_numpy(dtype=dtype_str)
+            del block
+
+        if table is not None:
+            start, size = arrow_region
+            sink = pa.FixedSizeBufferWriter(pa.py_buffer(self._shm.buf[start:start + size]))
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            # Drop every view on the block so it can be closed later
+            del writer, sink
+
+        self.handle = (self._shm.name, rows, layout, arrow_region)
+
+    def close(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _attach_columns(buf, rows: int, layout: list, arrow_region, columns: list) -> pd.DataFrame:
+    wanted = set(columns)
+    data = {}
+
+    for dtype_str, cols, start in layout:
+        if wanted.isdisjoint(cols):
+            continue
+        block = np.ndarray((rows, len(cols)), dtype=dtype_str, buffer=buf, offset=start, order="F")
+        for i, col in enumerate(cols):
+            if col in wanted:
+                data[col] = block[:, i]
+
+    if arrow_region is not None:
+        start, size = arrow_region
+        reader = pa.ipc.open_file(pa.py_buffer(buf[start:start + size]))
+        arrow_cols = [c for c in columns if c in set(reader.schema.names)]
+        if arrow_cols:
+            table = reader.read_all().select(arrow_cols)
+            for col, series in table.to_pandas(split_blocks=True).items():
+                data[col] = series
+
+    return pd.DataFrame({col: data[col] for col in columns}, copy=False)
+
+
+def map_shared_columns(handle, columns: list, func):
+    """
+    Runs func on the given columns of a SharedFrame from inside a worker.
+    Columns are zero-copy views on the shared block wherever possible, so
+    func must return results that do not keep the frame alive.
+    """
+    name, rows, layout, arrow_region = handle
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        df = _attach_columns(shm.buf, rows, layout, arrow_region, columns)
+        result = func(df)
+        del df
+    finally:
+        shm.close()
+    return result
@@ -0,0 +1,75 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from src.tools import chart_cache, chart_generator
+from src.tools.chart_generator import generate_chart
+from src.pipeline.report_builder import generate_report_charts
+
+
+def test_charts_are_rendered_once_per_dataset(monkeypatch):
+    monkeypatch.setattr(chart_cache, "_charts", OrderedDict())
+    monkeypatch.setattr(chart_cache, "_charts_bytes", 0)
+    calls = []
+    for chart_type, render in list(chart_generator.RENDERERS.items()):
+        def counted(*args, render=render, chart_type=chart_type):
+            calls.append(chart_type)
+            return render(*args)
+        monkeypatch.setitem(chart_generator.RENDERERS, chart_type, counted)
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": rng.normal(size=200), "b": rng.normal(size=200), "c": rng.choice(["x", "y"], 200)})
+
+    first = generate_chart(df, "a", chart_type="hist")
+    assert first.startswith(b"\x89PNG") and generate_chart(df, "a", chart_type="hist") is first
+    scatter = generate_chart(df, "a", "b", chart_type="scatter")
+    assert calls == ["hist", "scatter"]
+
+    # The report reuses the scatter drawn in chat and renders the rest once
+    charts, captions = generate_report_charts(df)
+    assert scatter in charts and len(charts) == len(captions) == 6
+    assert calls.count("scatter") == 1
+    generate_report_charts(df)
+    assert len(calls) == 7
+
+    # Different data means a different chart
+    changed = df.assign(a=df["a"] + 1)
+    assert generate_chart(changed, "a", chart_type="hist") != first
+
+
+def test_cache_drops_least_recently_used_charts(tmp_path, monkeypatch):
+    monkeypatch.setattr(chart_cache, "_charts", OrderedDict())
+    monkeypatch.setattr(chart_cache, "_charts_bytes", 0)
+    df = pd.DataFrame({"a": np.arange(100.0), "b": np.arange(100.0) % 7, "c": np.arange(100.0) ** 0.5})
+    charts = [generate_chart(df, col, chart_type="hist") for col in "abc"]
+    # Reusing a chart marks it recently used
+    generate_chart(df, "a", chart_type="hist")
+
+    assert chart_cache.evict_charts(max_bytes=len(charts[0]) + len(charts[2])) == 1
+    assert list(chart_cache._charts.values()) == [charts[2], charts[0]]
+
+    # Startup removes images earlier releases left on disk
+    legacy = tmp_path / "temp"
+    legacy.mkdir()
+    (legacy / "chart_hist_20250101_000000.png").write_bytes(b"old")
+    (legacy / "keep.csv").write_bytes(b"a")
+    monkeypatch.setattr(chart_cache, "LEGACY_CHART_DIRS", [str(legacy), str(tmp_path / "missing")])
+    assert chart_cache.cleanup_orphans() == 1
+    assert os.listdir(legacy) == ["keep.csv"]
+
+
+def test_session_charts_drop_oldest_images_past_the_budget():
+    history = [
+        {"role": "user", "message": "plot a"},
+        {"role": "chart", "message": b"a" * 400},
+        {"role": "chart", "message": b"b" * 400},
+        {"role": "chart", "message": b"c" * 400},
+    ]
+
+    assert chart_cache.trim_session_charts(history, max_bytes=900) == 1
+
+    assert [chat["message"] is None for chat in history] == [False, True, False, False]
+    assert chart_cache.trim_session_charts(history, max_bytes=900) == 0
@@ -0,0 +1,82 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import pandas as pd
+from src.tools import dataset_store
+from src.tools.dataset_store import content_hash, load_cached_dataset
+
+
+def test_same_bytes_hit_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_store, "DATASET_CACHE_DIR", str(tmp_path / "cache"))
+    df = pd.DataFrame({"Sales": [100, 200, 150, None], "Region": ["West", "East", "East", "West"]})
+    first_path = tmp_path / "first.csv"
+    second_path = tmp_path / "renamed.csv"
+    df.to_csv(first_path, index=False)
+    df.to_csv(second_path, index=False)
+
+    assert content_hash(str(first_path)) == content_hash(str(second_path))
+
+    parsed, _, key, hit = load_cached_dataset(str(first_path))
+    cached, stats, cached_key, cached_hit = load_cached_dataset(str(second_path))
+
+    assert not hit and cached_hit and key == cached_key
+    assert stats.rows == 4
+    pd.testing.assert_frame_equal(parsed, cached)
+
+
+def test_paths_are_confined_to_the_data_root(tmp_path, monkeypatch):
+    import pytest
+    from src.tools.dataset_store import open_dataset, resolve_local_path
+
+    root = tmp_path / "data"
+    root.mkdir()
+    pd.DataFrame({"a": [1, 2]}).to_csv(root / "ok.csv", index=False)
+    (tmp_path / "secret.csv").write_text("a\n1\n")
+    os.symlink(tmp_path / "secret.csv", root / "link.csv")
+
+    monkeypatch.setattr(dataset_store, "DATA_ROOT", None)
+    with pytest.raises(PermissionError):
+        open_dataset(str(root / "ok.csv"))
+
+    monkeypatch.setattr(dataset_store, "DATA_ROOT", str(root))
+    assert resolve_local_path("ok.csv") == os.path.realpath(root / "ok.csv")
+    for escape in (str(tmp_path / "secret.csv"), "../secret.csv", "link.csv"):
+        with pytest.raises(PermissionError):
+            open_dataset(escape)
+
+
+def test_cache_evicts_least_recently_used_parses(tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    monkeypatch.setattr(dataset_store, "DATASET_CACHE_DIR", str(cache))
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.csv"
+        pd.DataFrame({name: range(2000)}).to_csv(path, index=False)
+        paths.append(str(path))
+    # Room for two parses but not three
+    load_cached_dataset(paths[0])
+    entry_mb = sum(f.stat().st_size for f in cache.iterdir()) / 1024 / 1024
+    monkeypatch.setattr(dataset_store, "DATASET_CACHE_MAX_MB", 2.5 * entry_mb)
+
+    load_cached_dataset(paths[1])
+    os.utime(cache / f"{content_hash(paths[1])}.arrow", (1, 1))
+    load_cached_dataset(paths[0])  # hit: a is now the most recently used
+    load_cached_dataset(paths[2])
+
+    assert sorted(f.name for f in cache.iterdir()) == sorted(
+        f"{content_hash(path)}.arrow" for path in (paths[0], paths[2])
+    )
+
+
+def test_failed_cache_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    import pytest
+
+    monkeypatch.setattr(dataset_store, "DATASET_CACHE_DIR", str(tmp_path))
+
+    def disk_full(*args, **kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(dataset_store.pa.ipc, "new_file", disk_full)
+    with pytest.raises(OSError):
+        dataset_store._write_cached(pd.DataFrame({"a": [1, 2]}), str(tmp_path / "x.arrow"))
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,44 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import gc
+
+import numpy as np
+import pandas as pd
+from src.pipeline.backend import DuckDBBackend
+from src.tools.export import EXPORT_FORMATS, export_dataset
+
+
+def test_exports_round_trip_in_every_format(tmp_path):
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        "score": rng.normal(size=2500),
+        "grade": rng.choice(["A", "B", None], 2500),
+        "rank": np.arange(2500),
+    })
+    path = tmp_path / "clean.parquet"
+    df.to_parquet(path, index=False)
+
+    for data in (df, DuckDBBackend(str(path))):
+        for fmt in EXPORT_FORMATS:
+            result = export_dataset(data, fmt, chunk_rows=1000)
+            try:
+                if result.path.endswith(".parquet"):
+                    back = pd.read_parquet(result.path)
+                else:
+                    back = pd.read_csv(result.path, compression="gzip" if result.path.endswith(".gz") else "zstd")
+                assert result.rows == len(df) and result.bytes == os.path.getsize(result.path)
+                pd.testing.assert_frame_equal(back, df, check_dtype=False)
+            finally:
+                result.remove()
+            assert not os.path.exists(result.path)
+
+
+def test_export_file_is_removed_with_its_result():
+    result = export_dataset(pd.DataFrame({"a": [1, 2, 3]}), "Parquet")
+    path = result.path
+    assert os.path.exists(path)
+
+    del result
+    gc.collect()
+    assert not os.path.exists(path)
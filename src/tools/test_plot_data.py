@@ -0,0 +1,45 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import numpy as np
+import pandas as pd
+from src.pipeline.backend import DuckDBBackend, PandasBackend
+from src.tools.plot_data import kde_curve, line_points, lttb
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(10_000, dtype="float64")
+    y = np.sin(x / 500)
+    y[4321] = 25.0
+    index = lttb(x, y, 200)
+    assert len(index) == 200 and index[0] == 0 and index[-1] == 9_999
+    assert np.all(np.diff(index) > 0) and 4321 in index
+
+    dates = pd.date_range("2024-01-01", periods=5_000, freq="h").to_numpy()
+    values = np.arange(5_000, dtype="float64")
+    values[::10] = np.nan
+    px, py = line_points(dates, values, max_points=100)
+    assert len(px) == 100 and not np.isnan(py).any() and px.dtype.kind == "M"
+
+
+def test_kde_on_sample_integrates_to_one():
+    sample = np.random.default_rng(0).normal(size=5_000)
+    grid, density = kde_curve(sample, -6, 6)
+    assert abs(np.trapezoid(density, grid) - 1) < 0.01
+    assert kde_curve(np.ones(10), 0, 2) is None
+
+
+def test_histogram2d_matches_between_backends(tmp_path):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"x": rng.normal(size=3_000), "y": rng.exponential(size=3_000)})
+    df.loc[::13, "y"] = np.nan
+    path = str(tmp_path / "points.parquet")
+    df.to_parquet(path)
+
+    counts, x_edges, y_edges = PandasBackend(df).histogram2d("x", "y", bins=20)
+    duck_counts, duck_x, duck_y = DuckDBBackend(path).histogram2d("x", "y", bins=20)
+    assert counts.sum() == duck_counts.sum() == df.dropna().shape[0]
+    np.testing.assert_allclose(x_edges, duck_x)
+    np.testing.assert_allclose(y_edges, duck_y)
+    # Values on a bin edge may land on either side of it in floating point
+    assert np.abs(counts - duck_counts).sum() <= 4
@@ -0,0 +1,61 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import io
+
+import numpy as np
+import pandas as pd
+from src.tools import utils
+from src.tools.utils import load_dataset, load_dataset_with_stats
+
+
+class _Upload(io.BytesIO):
+    """Mimics Streamlit's UploadedFile: a seekable buffer with a name."""
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+
+def _csv_upload(df: pd.DataFrame) -> _Upload:
+    return _Upload(df.to_csv(index=False).encode("utf-8"), "data.csv")
+
+
+def test_streaming_load_matches_plain_read(monkeypatch):
+    monkeypatch.setattr(utils, "SAMPLE_ROWS", 100)
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "id": np.arange(1000),
+        "score": rng.integers(0, 100, 1000),
+        "half": rng.integers(0, 10, 1000) / 2,
+        "region": rng.choice(["North", "South", "East", "West"], 1000),
+    })
+    df.loc[500, "region"] = "Central"  # category first seen after the sample
+
+    loaded, stats = load_dataset_with_stats(_csv_upload(df), chunk_rows=128)
+
+    assert stats.rows == 1000 and stats.columns == 4
+    assert stats.peak_estimate_mb >= stats.memory_mb > 0
+    assert loaded["score"].dtype == np.int8
+    assert loaded["half"].dtype == np.float32
+    assert isinstance(loaded["region"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(
+        loaded.astype({"score": "int64", "half": "float64", "region": object}),
+        df.astype({"region": object}),
+        check_dtype=False,
+    )
+
+
+def test_lossy_floats_are_not_downcast():
+    df = pd.DataFrame({"price": [0.1, 0.2, 12345678.9]})
+    loaded = load_dataset(_csv_upload(df))
+    assert loaded["price"].dtype == np.float64
+
+
+def test_peak_estimate_counts_the_raw_sample(monkeypatch):
+    monkeypatch.setattr(utils, "SAMPLE_ROWS", 100)
+    df = pd.DataFrame({"label": [f"row-{i}" for i in range(1000)]})
+
+    _, stats = load_dataset_with_stats(_csv_upload(df), chunk_rows=1000)
+
+    raw_sample = pd.read_csv(_csv_upload(df), nrows=100)
+    assert stats.peak_estimate_mb >= utils._frame_mb(raw_sample)
@@ -1,17 +1,239 @@
 # src/tools/utils.py
 
+import os
+import time
+from dataclasses import dataclass
+
 import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Rows read up front to infer a compact schema for the rest of the file
+SAMPLE_ROWS = 50_000
+# Rows parsed per chunk once the schema is known
+CHUNK_ROWS = 250_000
+# A string column becomes categorical when unique / non-null values <= this ratio
+CATEGORY_RATIO = 0.5
+
+
+@dataclass
+class LoadStats:
+    """
+    Timing and memory figures for a single dataset load.
+    peak_estimate_mb adds up the frames held at once while loading, from
+    memory_usage; parser buffers are not counted, so it is not a measured peak.
+    """
+    rows: int
+    columns: int
+    seconds: float
+    peak_estimate_mb: float
+    memory_mb: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+
+def _frame_mb(df: pd.DataFrame) -> float:
+    return float(df.memory_usage(deep=True).sum()) / 1024 / 1024
+
+
+def infer_schema(sample: pd.DataFrame) -> dict:
+    """
+    Infers a compact schema from a leading sample.
+    Returns a mapping of column -> "integer" | "float" | "category".
+    Columns that should keep their parsed dtype are left out.
+    """
+    schema = {}
+    for col in sample.columns:
+        series = sample[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            schema[col] = "integer"
+        elif pd.api.types.is_float_dtype(series):
+            schema[col] = "float"
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            non_null = series.count()
+            if non_null and series.nunique(dropna=True) / non_null <= CATEGORY_RATIO:
+                schema[col] = "category"
+    return schema
+
+
+def compact_frame(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """
+    Downcasts numeric columns named in the schema.
+    Integers shrink to the smallest type that fits; floats become float32
+    only when the conversion is lossless.
+    """
+    for col, kind in schema.items():
+        if col not in df.columns:
+            continue
+        series = df[col]
+        if kind == "integer" and pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+        elif kind == "float" and pd.api.types.is_float_dtype(series):
+            small = series.astype("float32")
+            if small.astype("float64").equals(series.astype("float64")):
+                df[col] = small
+        elif kind == "category" and not isinstance(series.dtype, pd.CategoricalDtype):
+            df[col] = series.astype("category")
+    return df
+
+
+def _concat_chunks(chunks: list, schema: dict) -> pd.DataFrame:
+    """Concatenates chunks, unifying categories so categorical columns survive."""
+    if len(chunks) == 1:
+        return chunks[0]
+
+    for col, kind in schema.items():
+        if kind != "category":
+            continue
+        parts = [chunk[col] for chunk in chunks]
+        if not all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            continue
+        categories = union_categoricals(parts, ignore_order=True).categories
+        for chunk in chunks:
+            chunk[col] = chunk[col].cat.set_categories(categories)
+
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _read_csv_streaming(source, chunk_rows: int):
+    """Reads a CSV in chunks against a schema inferred from a leading sample."""
+    sample = pd.read_csv(source, nrows=SAMPLE_ROWS)
+    schema = infer_schema(sample)
+    peak_mb = _frame_mb(sample)
+
+    # Whole file fit in the sample: no need to parse it twice
+    if len(sample) < SAMPLE_ROWS:
+        df = compact_frame(sample, schema)
+        # The raw sample and its compacted copy coexist until the sample is released
+        return df, peak_mb + _frame_mb(df)
+
+    del sample
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+    dtypes = {col: "category" for col, kind in schema.items() if kind == "category"}
+
+    chunks = []
+    held_mb = 0.0
+    for chunk in pd.read_csv(source, dtype=dtypes, chunksize=chunk_rows):
+        chunk = compact_frame(chunk, schema)
+        held_mb += _frame_mb(chunk)
+        peak_mb = max(peak_mb, held_mb)
+        chunks.append(chunk)
+
+    if not chunks:
+        return pd.DataFrame(), peak_mb
+
+    df = _concat_chunks(chunks, schema)
+    # Chunks and the concatenated frame coexist until the chunks are released
+    peak_mb = max(peak_mb, held_mb + _frame_mb(df))
+    return df, peak_mb
+
+
+def load_dataset_with_stats(uploaded_file, chunk_rows: int = CHUNK_ROWS):
+    """
+    Loads CSV or Excel into a compact Pandas DataFrame.
+    CSVs are streamed in chunks against a schema inferred from a sample.
+    Returns:
+        (DataFrame, LoadStats)
+    """
+    name = getattr(uploaded_file, "name", str(uploaded_file))
+    start = time.perf_counter()
+
+    if name.endswith(".csv"):
+        df, peak_mb = _read_csv_streaming(uploaded_file, chunk_rows)
+    elif name.endswith(".xlsx") or name.endswith(".xls"):
+        df = pd.read_excel(uploaded_file)
+        raw_mb = _frame_mb(df)
+        df = compact_frame(df, infer_schema(df))
+        peak_mb = raw_mb + _frame_mb(df)
+    else:
+        raise ValueError("Unsupported file format")
+
+    memory_mb = _frame_mb(df)
+    stats = LoadStats(
+        rows=df.shape[0],
+        columns=df.shape[1],
+        seconds=time.perf_counter() - start,
+        peak_estimate_mb=max(peak_mb, memory_mb),
+        memory_mb=memory_mb,
+    )
+    return df, stats
+
+
+def iter_file_chunks(path: str, chunk_rows: int = CHUNK_ROWS, start_row: int = 0):
+    """Yields DataFrame chunks of a CSV or Parquet file, skipping the first start_row rows."""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            if start_row >= batch.num_rows:
+                start_row -= batch.num_rows
+                continue
+            yield batch.slice(start_row).to_pandas()
+            start_row = 0
+        return
+
+    if not start_row:
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+        return
+
+    columns = pd.read_csv(path, nrows=0).columns
+    with open(path, "rb") as handle:
+        handle.readline()  # header
+        for _ in range(start_row):
+            if not handle.readline():
+                return
+        yield from pd.read_csv(handle, names=columns, header=None, chunksize=chunk_rows)
+
+
+def touch_file(path: str):
+    """Marks a cached file as just used (atime), leaving its mtime alone."""
+    try:
+        os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+    except OSError:
+        pass
+
+
+def evict_lru_files(folder: str, suffixes: tuple, max_mb: float, keep=()) -> int:
+    """
+    Removes the least recently used files with the given suffixes until the
+    folder's files fit max_mb. Use is read from atime, which cache hits
+    refresh with touch_file. Paths in keep are never removed.
+    Returns:
+        number of files removed
+    """
+    entries = []
+    for entry in os.scandir(folder):
+        if entry.is_file() and entry.name.endswith(suffixes):
+            info = entry.stat()
+            entries.append((info.st_atime_ns, info.st_size, entry.path))
+
+    keep = {os.path.realpath(path) for path in keep}
+    budget = max_mb * 1024 * 1024
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    # Least recently used first
+    for _, size, path in sorted(entries):
+        if total <= budget:
+            break
+        if os.path.realpath(path) in keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            # Still open elsewhere (Windows) or already gone
+            continue
+        total -= size
+        removed += 1
+    return removed
+
 
 def load_dataset(uploaded_file):
     """
     Loads CSV or Excel into a Pandas DataFrame.
     """
-    try:
-        if uploaded_file.name.endswith(".csv"):
-            return pd.read_csv(uploaded_file)
-        elif uploaded_file.name.endswith(".xlsx") or uploaded_file.name.endswith(".xls"):
-            return pd.read_excel(uploaded_file)
-        else:
-            raise ValueError("Unsupported file format")
-    except Exception as e:
-        raise e
+    df, _ = load_dataset_with_stats(uploaded_file)
+    return df
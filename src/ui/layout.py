@@ -1,8 +1,15 @@
 import streamlit as st
 import re
-from src.tools.utils import load_dataset
-from src.pipeline.profiler import profile_dataset
-from src.agents.response_generator import handle_user_query
+import uuid
+from src.tools import dataset_store
+from src.tools.dataset_store import open_dataset
+from src.pipeline.backend import DatasetBackend
+from src.pipeline.profiler import profile_dataset, update_profile
+from src.pipeline.profile_store import get_or_create_profile
+from src.pipeline.versioning import VersionedDataset
+from src.tools.chart_cache import trim_session_charts
+from src.tools.export import EXPORT_FORMATS, export_dataset
+from src.pipeline.report_jobs import cancel_job, get_job, submit_report
 
 
 def markdown_to_html(text):
@@ -333,6 +340,63 @@ def inject_custom_css():
     """, unsafe_allow_html=True)
 
 
+def _session_id() -> str:
+    """Stable id for this browser session, used to join and leave report jobs."""
+    if "session_id" not in st.session_state:
+        st.session_state["session_id"] = uuid.uuid4().hex
+    return st.session_state["session_id"]
+
+
+@st.fragment(run_every=1.0)
+def _report_progress(job_id: str):
+    """Polls a running report job; reruns the whole page once it finishes."""
+    job = get_job(job_id)
+    if job is None or not job.active:
+        st.rerun()
+
+    if job.cancelling:
+        st.progress(job.progress, text="✖️ Cancelling after the current step...")
+        return
+    st.progress(job.progress, text=f"🔄 {job.stage or 'Queued'}...")
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        if st.button("✖️ Cancel Report", use_container_width=True):
+            job = cancel_job(job_id, _session_id())
+            # Other sessions still want this report: only this session leaves it.
+            # Otherwise keep the job to show how it really ended.
+            if job is not None and job.active and not job.cancelling:
+                del st.session_state["report_job"]
+            st.rerun()
+
+
+def _report_result(job):
+    """Outcome of the session's last report job."""
+    if job is None:
+        st.info("⌛ The last report has expired; generate it again to download it.")
+        return
+    if job.status == "failed":
+        st.error(f"❌ Report generation failed: {job.error}")
+        return
+    if job.status == "cancelled":
+        st.warning("✖️ Report generation was cancelled.")
+        return
+
+    if job.from_store:
+        st.success("✨ Report ready! Reused from an earlier run on the same data.")
+    else:
+        st.success("✨ Report generated successfully!")
+    st.markdown("<br>", unsafe_allow_html=True)
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.download_button(
+            label="📥 Download PDF Report",
+            data=job.result,
+            file_name="EDA_Report.pdf",
+            mime="application/pdf",
+            use_container_width=True
+        )
+
+
 def render_main_layout():
     """
     Main UI layout with stunning design and 4 tabs:
@@ -369,14 +433,54 @@ def render_main_layout():
                 type=["csv", "xlsx", "xls"],
                 help="Upload your dataset to begin analysis"
             )
+            local_path = ""
+            # Opening by path is only offered when the server names a data folder
+            if dataset_store.DATA_ROOT:
+                local_path = st.text_input(
+                    "...or open a large local CSV/Parquet file",
+                    placeholder="extracts/nightly.parquet",
+                    help=(
+                        f"Path inside {dataset_store.DATA_ROOT}. Files opened by path are explored "
+                        "out-of-core and never loaded fully into memory"
+                    ),
+                ).strip()
 
-        if uploaded_file is not None:
+        source = uploaded_file if uploaded_file is not None else (local_path or None)
+
+        if source is not None:
             try:
-                with st.spinner("🔄 Loading your dataset..."):
-                    df = load_dataset(uploaded_file)
-                    st.session_state["raw_dataset"] = df
+                # Reruns for the same upload reuse the frame already in the session
+                upload_id = getattr(uploaded_file, "file_id", uploaded_file.name) if uploaded_file is not None else local_path
+                if (
+                    st.session_state.get("upload_id") != upload_id
+                    or st.session_state.get("raw_dataset") is None
+                ):
+                    with st.spinner("🔄 Loading your dataset..."):
+                        df, load_stats, dataset_key, cache_hit = open_dataset(source)
+                        st.session_state["raw_dataset"] = df
+                        st.session_state["load_stats"] = load_stats
+                        st.session_state["dataset_key"] = dataset_key
+                        st.session_state["dataset_cache_hit"] = cache_hit
+                        st.session_state["upload_id"] = upload_id
+
+                df = st.session_state["raw_dataset"]
+                load_stats = st.session_state["load_stats"]
+                out_of_core = isinstance(df, DatasetBackend)
 
-                st.success("✨ File Uploaded Successfully!")
+                # Profile once per dataset, not on every rerun; reuse a stored
+                # profile when this exact dataset was profiled before
+                if st.session_state.get("profile_key") != st.session_state["dataset_key"]:
+                    with st.spinner("🔬 Analyzing your data..."):
+                        # The dedup section needs the duplicate count; other callers skip that pass
+                        stored, _ = get_or_create_profile(df, st.session_state["dataset_key"], duplicates=True)
+                    st.session_state["profile_result"] = stored
+                    st.session_state["profile_key"] = st.session_state["dataset_key"]
+                profile = st.session_state["profile_result"]
+
+                if st.session_state.get("dataset_cache_hit"):
+                    st.success("✨ File Uploaded Successfully! (loaded from cache)")
+                else:
+                    st.success("✨ File Uploaded Successfully!")
                 
                 # Metrics Row
                 st.markdown("<br>", unsafe_allow_html=True)
@@ -399,7 +503,7 @@ def render_main_layout():
                     """, unsafe_allow_html=True)
                 
                 with col3:
-                    missing_pct = (df.isnull().sum().sum() / (df.shape[0] * df.shape[1]) * 100)
+                    missing_pct = profile.missing_pct
                     st.markdown(f"""
                     <div class="metric-card">
                         <div class="metric-label">⚠️ Missing %</div>
@@ -408,11 +512,15 @@ def render_main_layout():
                     """, unsafe_allow_html=True)
                 
                 with col4:
-                    memory_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+                    if out_of_core:
+                        memory_detail = f"Out-of-core · {df.kind}"
+                    else:
+                        memory_detail = f"Est. peak {load_stats.peak_estimate_mb:.1f}MB · {load_stats.rows_per_sec:,.0f} rows/s"
                     st.markdown(f"""
                     <div class="metric-card">
                         <div class="metric-label">💾 Memory</div>
-                        <div class="metric-value">{memory_mb:.1f}MB</div>
+                        <div class="metric-value">{load_stats.memory_mb:.1f}MB</div>
+                        <div style="margin-top: 8px; font-size: 0.85rem;">{memory_detail}</div>
                     </div>
                     """, unsafe_allow_html=True)
 
@@ -422,16 +530,11 @@ def render_main_layout():
                 st.markdown('<div class="section-header">🔍 Data Preview</div>', unsafe_allow_html=True)
                 st.dataframe(df.head(10), use_container_width=True, height=400)
 
-                # Run profiling
-                with st.spinner("🔬 Analyzing your data..."):
-                    profile = profile_dataset(df)
-                    st.session_state["profile_result"] = profile
-
                 st.markdown("<br>", unsafe_allow_html=True)
 
                 # Profiling Results in Expandable Sections
                 with st.expander("📊 Column Types Analysis", expanded=True):
-                    st.dataframe(profile["column_types"], use_container_width=True)
+                    st.dataframe(profile.column_types.astype(str), use_container_width=True)
 
                 with st.expander("⚠️ Missing Values Report", expanded=True):
                     missing_df = profile["missing_values"]
@@ -440,6 +543,8 @@ def render_main_layout():
                         st.dataframe(missing_df, use_container_width=True)
                     else:
                         st.success("🎉 No missing values detected!")
+                    if profile.duplicate_rows:
+                        st.warning(f"Found {profile.duplicate_rows:,} duplicate rows")
 
                 with st.expander("📈 Statistical Summary", expanded=True):
                     if not profile["stats"].empty:
@@ -475,10 +580,21 @@ def render_main_layout():
             st.error("Profile data not found. Please reload the dataset in Tab 1.")
             st.stop()
 
-        missing_df = profile["missing_values"]
-        missing_cols = missing_df[missing_df["Missing Count"] > 0].index.tolist()
+        missing_df = profile.missing_values
+        missing_cols = profile.missing_columns
+
+        # In-memory datasets keep a cleaning history; each step stores only what it changed
+        versions = None
+        if not isinstance(df, DatasetBackend):
+            versions = st.session_state.get("dataset_versions")
+            if versions is None or st.session_state.get("versions_key") != st.session_state["dataset_key"]:
+                versions = VersionedDataset(df, profile)
+                st.session_state["dataset_versions"] = versions
+                st.session_state["versions_key"] = st.session_state["dataset_key"]
 
-        if not missing_cols:
+        duplicate_rows = profile.duplicate_rows or 0
+
+        if not missing_cols and not duplicate_rows:
             st.markdown("""
             <div style="text-align: center; padding: 60px 20px; background: linear-gradient(135deg, #10b981 0%, #059669 100%); 
                  border-radius: 16px; color: white; margin-top: 40px;">
@@ -489,50 +605,69 @@ def render_main_layout():
             """, unsafe_allow_html=True)
             
             # Store as cleaned even if no cleaning needed
-            if "cleaned_dataset" not in st.session_state:
+            if st.session_state.get("cleaned_dataset") is None:
                 st.session_state["cleaned_dataset"] = df
+                st.session_state["cleaned_profile"] = profile
             
             st.markdown("<br>", unsafe_allow_html=True)
             st.info("💡 Move to the next tab to chat with the AI agent!")
             st.stop()
 
         # Missing Data Visualization
-        st.markdown('<div class="section-header">⚠️ Missing Data Overview</div>', unsafe_allow_html=True)
-        
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            st.dataframe(missing_df.loc[missing_cols], use_container_width=True)
-        
-        with col2:
-            total_missing = missing_df.loc[missing_cols, "Missing Count"].sum()
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-label">🔍 Total Missing</div>
-                <div class="metric-value">{total_missing:,}</div>
-                <div style="margin-top: 8px; font-size: 0.85rem;">Across {len(missing_cols)} columns</div>
-            </div>
-            """, unsafe_allow_html=True)
+        if missing_cols:
+            st.markdown('<div class="section-header">⚠️ Missing Data Overview</div>', unsafe_allow_html=True)
 
-        st.markdown("<br>", unsafe_allow_html=True)
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                st.dataframe(missing_df.loc[missing_cols], use_container_width=True)
+
+            with col2:
+                total_missing = missing_df.loc[missing_cols, "Missing Count"].sum()
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-label">🔍 Total Missing</div>
+                    <div class="metric-value">{total_missing:,}</div>
+                    <div style="margin-top: 8px; font-size: 0.85rem;">Across {len(missing_cols)} columns</div>
+                </div>
+                """, unsafe_allow_html=True)
+
+            st.markdown("<br>", unsafe_allow_html=True)
 
         # Imputation Strategy Selection
-        from src.pipeline.cleaner import suggest_imputation, apply_imputation
-        suggestions = suggest_imputation(df)
+        from src.pipeline.cleaner import STRATEGIES, CleaningPlan, suggest_imputation
+        # Suggestions and new steps build on the current version of the data
+        base_df = versions.current() if versions is not None else df
+        base_profile = versions.profile if versions is not None else profile
+        suggestions = suggest_imputation(base_df, base_profile)
 
         st.markdown('<div class="section-header">🧠 AI-Suggested Fixes</div>', unsafe_allow_html=True)
         st.info("💡 Our AI recommends the best imputation method for each column. You can customize below.")
+
+        # A saved plan replaces the suggestions and, if left unchanged, its fitted fill values are reused
+        plan_file = st.file_uploader("📂 Load a saved cleaning plan (optional)", type=["json"], key="plan_upload")
+        loaded_plan = None
+        if plan_file is not None:
+            try:
+                loaded_plan = CleaningPlan.from_json(plan_file.getvalue())
+            except (ValueError, KeyError) as e:
+                st.error(f"❌ Could not read the cleaning plan: {e}")
+            else:
+                suggestions = {col: loaded_plan.strategies.get(col, default) for col, default in suggestions.items()}
+        strategy_tag = plan_file.file_id if loaded_plan is not None else "suggested"
         
         st.markdown("<br>", unsafe_allow_html=True)
 
         user_strategies = {}
+        # Columns still missing values in the current version
+        strategy_cols = list(suggestions)
         
         # Create a nice grid for strategy selection
         cols_per_row = 2
-        for i in range(0, len(missing_cols), cols_per_row):
+        for i in range(0, len(strategy_cols), cols_per_row):
             cols = st.columns(cols_per_row)
             for j, col in enumerate(cols):
-                if i + j < len(missing_cols):
-                    col_name = missing_cols[i + j]
+                if i + j < len(strategy_cols):
+                    col_name = strategy_cols[i + j]
                     default = suggestions[col_name]
                     
                     with col:
@@ -540,40 +675,149 @@ def render_main_layout():
                             st.markdown(f"**🔹 {col_name}**")
                             user_strategies[col_name] = st.selectbox(
                                 f"Strategy for {col_name}",
-                                ["Median", "Mean", "Most Frequent", "Drop"],
-                                index=["Median", "Mean", "Most Frequent", "Drop"].index(default),
-                                key=f"strategy_{col_name}",
+                                STRATEGIES,
+                                index=STRATEGIES.index(default),
+                                key=f"strategy_{col_name}_{strategy_tag}",
                                 label_visibility="collapsed"
                             )
 
         st.markdown("<br>", unsafe_allow_html=True)
 
+        # Duplicate rows: hashed row by row, optionally on a subset of key columns
+        st.markdown('<div class="section-header">🧬 Duplicate Rows</div>', unsafe_allow_html=True)
+        default_dedup = bool(duplicate_rows) if loaded_plan is None else loaded_plan.dedup is not None
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            st.metric("Duplicate Rows", f"{duplicate_rows:,}")
+            remove_duplicates = st.checkbox(
+                "Remove duplicate rows", value=default_dedup, key=f"dedup_{strategy_tag}"
+            )
+        with col2:
+            dedup_subset = st.multiselect(
+                "Compare on columns (empty = all columns)",
+                list(df.columns),
+                default=[c for c in (loaded_plan.dedup or []) if c in df.columns] if loaded_plan is not None else [],
+                key=f"dedup_subset_{strategy_tag}",
+                disabled=not remove_duplicates,
+            )
+        dedup = dedup_subset if remove_duplicates else None
+
+        st.markdown("<br>", unsafe_allow_html=True)
+
         # Apply Fixes Button
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             if st.button("🚀 Apply Cleaning Strategy", use_container_width=True):
                 with st.spinner("🔄 Cleaning your data..."):
-                    cleaned_df = apply_imputation(df, user_strategies)
+                    if (
+                        loaded_plan is not None
+                        and set(loaded_plan.strategies) <= set(df.columns)
+                        and all(loaded_plan.strategies.get(col) == method for col, method in user_strategies.items())
+                        and loaded_plan.dedup == dedup
+                    ):
+                        plan = loaded_plan
+                    else:
+                        plan = CleaningPlan.fit(base_df, user_strategies, dedup)
+                    cleaned_df, changes = plan.apply(base_df)
+                    # Refresh only what cleaning touched instead of re-profiling
+                    if changes is not None:
+                        cleaned_profile = update_profile(base_profile, cleaned_df, changes)
+                    else:
+                        cleaned_profile = profile_dataset(cleaned_df)
+                    if versions is not None:
+                        steps = [f"{col}: {method}" for col, method in user_strategies.items()]
+                        if dedup is not None:
+                            steps.insert(0, f"dedup on {', '.join(map(str, dedup))}" if dedup else "dedup")
+                        label = ", ".join(steps)
+                        versions.commit(cleaned_df, changes, label, profile=cleaned_profile)
+                    st.session_state["cleaning_plan"] = plan
                     st.session_state["cleaned_dataset"] = cleaned_df
+                    st.session_state["cleaned_profile"] = cleaned_profile
 
                 st.success("✨ Data cleaned successfully!")
+                # Out-of-core data never runs the models: every model column uses its fallback
+                fallbacks = changes.fallback_columns if changes is not None else plan.model_columns
+                if fallbacks:
+                    st.warning(
+                        "⚠️ KNN / Iterative imputation was not possible within the time or memory "
+                        "budget (or on non-numeric or out-of-core data) for: "
+                        f"{', '.join(map(str, fallbacks))}. "
+                        "These columns were filled with their simple fallback instead."
+                    )
                 # st.balloons()
 
                 st.markdown("<br>", unsafe_allow_html=True)
                 st.markdown('<div class="section-header">✅ Cleaned Data Preview</div>', unsafe_allow_html=True)
                 st.dataframe(cleaned_df.head(10), use_container_width=True, height=400)
 
-                # Download cleaned data
-                st.markdown("<br>", unsafe_allow_html=True)
-                csv_data = cleaned_df.to_csv(index=False).encode("utf-8")
-                
-                col1, col2, col3 = st.columns([1, 2, 1])
-                with col2:
+        # Cleaning history with undo / redo
+        if versions is not None and len(versions.labels) > 1:
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown('<div class="section-header">🕘 Cleaning History</div>', unsafe_allow_html=True)
+            for number, label in enumerate(versions.labels):
+                marker = "👉" if number == versions.head else "▫️"
+                st.markdown(f"{marker} **v{number}** · {label}")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                undo = st.button("↩️ Undo", disabled=not versions.can_undo, use_container_width=True)
+            with col2:
+                redo = st.button("↪️ Redo", disabled=not versions.can_redo, use_container_width=True)
+            if undo or redo:
+                if undo:
+                    versions.undo()
+                else:
+                    versions.redo()
+                st.session_state["cleaned_dataset"] = versions.current()
+                st.session_state["cleaned_profile"] = versions.profile
+                st.rerun()
+
+            with st.expander("🔍 Changes vs raw data"):
+                diff = versions.diff(0, versions.head)
+                st.write(f"Rows: {diff.rows_before:,} → {diff.rows_after:,}")
+                st.dataframe(diff.cells_changed, use_container_width=True)
+                st.caption(f"History holds {versions.memory_bytes() / 1024 / 1024:.1f}MB of changes")
+
+        # Export: streamed into a compressed temp file on request, never built in memory
+        cleaned_df = st.session_state.get("cleaned_dataset")
+        if cleaned_df is not None:
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown('<div class="section-header">📦 Export</div>', unsafe_allow_html=True)
+            export_format = st.selectbox("Export format", list(EXPORT_FORMATS), key="export_format")
+
+            export = st.session_state.get("export_result")
+            # The cached export holds its frame, so an identity check cannot match a different frame
+            is_current = export is not None and export[0] is cleaned_df and export[1] == export_format
+            if not is_current and st.button("📦 Prepare Export", use_container_width=True):
+                if export is not None:
+                    export[2].remove()
+                with st.spinner("📦 Writing export..."):
+                    result = export_dataset(cleaned_df, export_format)
+                export = (cleaned_df, export_format, result)
+                st.session_state["export_result"] = export
+                is_current = True
+
+            col1, col2 = st.columns(2)
+            with col1:
+                if is_current:
+                    result = export[2]
+                    with open(result.path, "rb") as handle:
+                        st.download_button(
+                            label=f"⬇️ Download Cleaned Dataset ({result.mb:.1f}MB)",
+                            data=handle,
+                            file_name=result.file_name,
+                            mime=result.mime,
+                            use_container_width=True
+                        )
+                    st.caption(f"{result.rows:,} rows written in {result.seconds:.2f}s")
+            with col2:
+                plan = st.session_state.get("cleaning_plan")
+                if plan is not None:
                     st.download_button(
-                        label="⬇️ Download Cleaned Dataset",
-                        data=csv_data,
-                        file_name="cleaned_dataset.csv",
-                        mime="text/csv",
+                        label="💾 Download Cleaning Plan",
+                        data=plan.to_json(),
+                        file_name="cleaning_plan.json",
+                        mime="application/json",
                         use_container_width=True
                     )
 
@@ -625,7 +869,8 @@ def render_main_layout():
 
             # Get AI response
             with st.spinner("🤔 AI is thinking..."):
-                response_text, chart_path = handle_user_query(user_msg)
+                from src.agents.response_generator import handle_user_query
+                response_text, chart_png = handle_user_query(user_msg)
 
             # Add assistant response
             st.session_state["chat_history"].append(
@@ -633,10 +878,11 @@ def render_main_layout():
             )
 
             # Add chart if available
-            if chart_path:
+            if chart_png:
                 st.session_state["chat_history"].append(
-                    {"role": "chart", "message": chart_path}
+                    {"role": "chart", "message": chart_png}
                 )
+                trim_session_charts(st.session_state["chat_history"])
 
             st.rerun()
 
@@ -670,7 +916,11 @@ def render_main_layout():
                     elif chat["role"] == "chart":
                         col1, col2, col3 = st.columns([1, 3, 1])
                         with col2:
-                            st.image(chat["message"], use_container_width=True)
+                            # PNG bytes held by this session; the oldest are dropped past its budget
+                            if chat["message"] is None:
+                                st.caption("📉 Older chart removed to save memory. Ask again to redraw it.")
+                            else:
+                                st.image(chat["message"], use_container_width=True)
 
             # Clear Chat Button
             st.markdown("<br>", unsafe_allow_html=True)
@@ -703,14 +953,15 @@ def render_main_layout():
         st.markdown('<div class="section-header">📄 Step 4: Export Professional Report</div>', unsafe_allow_html=True)
         st.markdown("<br>", unsafe_allow_html=True)
 
-        if "cleaned_dataset" not in st.session_state:
+        if st.session_state.get("cleaned_dataset") is None:
             st.warning("⚠️ Please complete previous steps first!")
             st.stop()
 
-        from src.agents.llm_client import get_llm
-        from src.pipeline.pdf_report import generate_pdf_report
-
         df = st.session_state["cleaned_dataset"]
+        profile = st.session_state.get("cleaned_profile")
+        if profile is None:
+            profile = profile_dataset(df)
+            st.session_state["cleaned_profile"] = profile
         
         st.markdown("""
         <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; 
@@ -734,45 +985,46 @@ def render_main_layout():
             - ✅ AI-Generated Insights
             - ✅ Data Quality Assessment
             """)
+            appendix = st.checkbox(
+                "Add a page per column (appendix)",
+                help="One compact page per column with a mini chart and its statistics.",
+            )
         
         with col2:
             st.markdown("### 📈 Quick Stats:")
             st.metric("Total Records", f"{df.shape[0]:,}")
             st.metric("Total Features", f"{df.shape[1]}")
-            st.metric("Data Quality", f"{((1 - df.isnull().sum().sum() / (df.shape[0] * df.shape[1])) * 100):.1f}%")
+            st.metric("Data Quality", f"{100 - profile.missing_pct:.1f}%")
 
         st.markdown("<br>", unsafe_allow_html=True)
 
         # Generate Report Button
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            if st.button("🎨 Generate PDF Report", use_container_width=True):
-                with st.spinner("🔄 Creating your professional report..."):
-                    llm = get_llm()
-
-                    prompt = (
-                        "Provide 4-6 key insights about this dataset:\n"
-                        f"Columns: {list(df.columns)}\n"
-                        f"Missing Values: {df.isnull().sum().to_dict()}\n"
-                        f"Statistics: {df.describe().to_string()}"
-                    )
-                    
-                    insights = llm.invoke(prompt).content
-                    pdf_path = generate_pdf_report(df, insights)
-
-                st.success("✨ Report generated successfully!")
-                # st.balloons()
-
-                st.markdown("<br>", unsafe_allow_html=True)
+            # Runs in the background; an identical report already in progress is joined
+            current = get_job(st.session_state.get("report_job", ""))
+            if st.button(
+                "🎨 Generate PDF Report",
+                use_container_width=True,
+                disabled=current is not None and current.active,
+            ):
+                st.session_state["report_job"] = submit_report(
+                    df, profile, appendix=appendix, session_id=_session_id()
+                ).job_id
 
-                with open(pdf_path, "rb") as f:
+        job_id = st.session_state.get("report_job")
+        if job_id is not None:
+            job = get_job(job_id)
+            if job is not None and job.active:
+                _report_progress(job_id)
+            else:
+                _report_result(job)
+                if job is not None and job.from_store:
                     col1, col2, col3 = st.columns([1, 2, 1])
                     with col2:
-                        st.download_button(
-                            label="📥 Download PDF Report",
-                            data=f,
-                            file_name="EDA_Report.pdf",
-                            mime="application/pdf",
-                            use_container_width=True
-                        )
+                        if st.button("🔄 Regenerate with Fresh Insights", use_container_width=True):
+                            st.session_state["report_job"] = submit_report(
+                                df, profile, appendix=appendix, regenerate=True, session_id=_session_id()
+                            ).job_id
+                            st.rerun()
 